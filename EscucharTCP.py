@@ -1,5 +1,6 @@
 import socket
-from datetime import datetime
+
+from gt06_logger import get_logger
 
 HOST = '200.58.98.187'
 PORT = 5003
@@ -7,11 +8,10 @@ PORT = 5003
 # Archivo donde se guardarán los datos
 FILE_PATH = 'recibidoGPS.txt'
 
+LOGGER = get_logger(FILE_PATH)
+
 def log(message):
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    with open(FILE_PATH, 'a') as f:
-        f.write(f"{timestamp} {message}\n")
-    print(f"{timestamp} {message}")
+    LOGGER.log(message)
 
 def start_server():
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
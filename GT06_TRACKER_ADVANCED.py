@@ -6,13 +6,19 @@ Servidor GT06 avanzado con comandos de configuración y manejo robusto del proto
 import socket
 import datetime
 import time
-import threading
+import select
+import collections
+
+from gt06_timers import get_timer_wheel
 
 HOST = '0.0.0.0'  # Escuchar en todas las interfaces
 PORT = 5003
 
 LOG_FILE = "datosChino_advanced.txt"
 
+# Secuencias de configuración diferidas: un único hilo para todas las conexiones
+TIMERS = get_timer_wheel()
+
 # Tabla CRC-ITU del fabricante (CRC-CCITT)
 CRC_TAB16 = [
     0x0000, 0x1189, 0x2312, 0x329B, 0x4624, 0x57AD, 0x6536, 0x74BF,
@@ -116,6 +122,25 @@ def send_server_command(conn, command, serial):
     log_sent(packet)
     return packet
 
+def queue_server_command(conn_data, command, serial):
+    """
+    Encola un comando para el hilo de la conexión y lo despierta. Lo usa la
+    rueda de temporizadores: un sendall() bloqueante desde ahí frenaría los
+    temporizadores de todas las conexiones si un equipo no lee.
+    """
+    conn_data['outbox'].append((command, serial))
+    try:
+        conn_data['wake'].send(b'\0')
+    except OSError:
+        pass  # ya hay un despertar pendiente o la conexión se cerró
+
+def send_queued_commands(conn, conn_data):
+    """Envía desde el hilo de la conexión los comandos encolados por la rueda"""
+    outbox = conn_data['outbox']
+    while outbox:
+        command, serial = outbox.popleft()
+        send_server_command(conn, command, serial)
+
 def validate_packet_crc(data):
     """Valida el CRC16 de un paquete recibido"""
     if len(data) < 6:
@@ -160,37 +185,28 @@ def handle_login(data, conn, conn_data):
         # Enviar ACK estándar
         ack = send_ack(serial, conn)
         
-        # Iniciar secuencia de configuración
-        def config_sequence():
-            time.sleep(2)  # Esperar 2 segundos después del ACK
-            
-            # Comando 1: Configurar modo de transmisión
-            log("[CONFIG] Enviando comando de configuración de modo...")
-            send_server_command(conn, "MODE,1#", serial)
-            
-            time.sleep(3)  # Esperar 3 segundos
-            
-            # Comando 2: Solicitar posición
-            log("[CONFIG] Enviando solicitud de posición...")
-            send_server_command(conn, "POSITION#", serial)
-            
-            time.sleep(3)  # Esperar 3 segundos
-            
-            # Comando 3: Configurar intervalo de reporte
-            log("[CONFIG] Configurando intervalo de reporte...")
-            send_server_command(conn, "INTERVAL,30#", serial)
-            
-            time.sleep(3)  # Esperar 3 segundos
-            
-            # Comando 4: Activar reporte automático
-            log("[CONFIG] Activando reporte automático...")
-            send_server_command(conn, "AUTO,1#", serial)
-            
-            log("[CONFIG] Secuencia de configuración completada")
+        # Secuencia de configuración: (espera en segundos, mensaje, comando)
+        config_steps = [
+            (2, "[CONFIG] Enviando comando de configuración de modo...", "MODE,1#"),  # 2 s después del ACK
+            (3, "[CONFIG] Enviando solicitud de posición...", "POSITION#"),
+            (3, "[CONFIG] Configurando intervalo de reporte...", "INTERVAL,30#"),
+            (3, "[CONFIG] Activando reporte automático...", "AUTO,1#"),
+        ]
         
-        # Iniciar secuencia de configuración en thread separado
-        config_thread = threading.Thread(target=config_sequence, daemon=True)
-        config_thread.start()
+        def config_step(index):
+            if conn_data.get('connection_closed'):
+                return
+            _, message, command = config_steps[index]
+            log(message)
+            queue_server_command(conn_data, command, serial)
+            if index + 1 < len(config_steps):
+                conn_data['config_timer'] = TIMERS.schedule(config_steps[index + 1][0], config_step, index + 1)
+            else:
+                log("[CONFIG] Secuencia de configuración completada")
+        
+        # Cada paso es un temporizador de la rueda compartida (sin hilo por conexión)
+        TIMERS.cancel(conn_data.get('config_timer'))
+        conn_data['config_timer'] = TIMERS.schedule(config_steps[0][0], config_step, 0)
         
         return ack
         
@@ -278,70 +294,93 @@ def main():
                 with conn:
                     log(f"[ADVANCED] Conexión entrante desde {addr}")
                     
+                    # Despertador para los comandos que encola la rueda de temporizadores
+                    wake_r, wake_w = socket.socketpair()
+                    wake_r.setblocking(False)
+                    wake_w.setblocking(False)
+                    
                     # Diccionario para almacenar datos de la conexión
-                    conn_data = {}
+                    conn_data = {'outbox': collections.deque(), 'wake': wake_w}
                     
-                    while True:
-                        data = conn.recv(1024)
-                        if not data:
-                            break
+                    try:
+                        while True:
+                            readable, _, _ = select.select([conn, wake_r], [], [])
+                            if wake_r in readable:
+                                try:
+                                    while wake_r.recv(4096):
+                                        pass
+                                except BlockingIOError:
+                                    pass
+                                send_queued_commands(conn, conn_data)
+                            if conn not in readable:
+                                continue
+                            
+                            data = conn.recv(1024)
+                            if not data:
+                                break
                         
-                        log(f"[ADVANCED] [RECIBIDO] {data.hex()}")
+                            log(f"[ADVANCED] [RECIBIDO] {data.hex()}")
                         
-                        if len(data) < 8:
-                            log("[ADVANCED] [ERROR] Paquete demasiado corto")
-                            continue
+                            if len(data) < 8:
+                                log("[ADVANCED] [ERROR] Paquete demasiado corto")
+                                continue
                         
-                        if data.startswith(b'\x78\x78'):
-                            if len(data) >= 4:
-                                packet_length = data[2]
-                                protocol = data[3]
+                            if data.startswith(b'\x78\x78'):
+                                if len(data) >= 4:
+                                    packet_length = data[2]
+                                    protocol = data[3]
                                 
-                                log(f"[ADVANCED] Protocol: 0x{protocol:02X}, Length: {packet_length}")
+                                    log(f"[ADVANCED] Protocol: 0x{protocol:02X}, Length: {packet_length}")
                                 
-                                if protocol == 0x01:  # Login
-                                    log("[ADVANCED] Procesando login...")
-                                    ack = handle_login(data, conn, conn_data)
-                                    if ack:
-                                        log("[ADVANCED] ✓ ACK de login enviado correctamente")
-                                    else:
-                                        log("[ADVANCED] ✗ Error enviando ACK de login")
+                                    if protocol == 0x01:  # Login
+                                        log("[ADVANCED] Procesando login...")
+                                        ack = handle_login(data, conn, conn_data)
+                                        if ack:
+                                            log("[ADVANCED] ✓ ACK de login enviado correctamente")
+                                        else:
+                                            log("[ADVANCED] ✗ Error enviando ACK de login")
                                     
-                                elif protocol == 0x12:  # Posición
-                                    log("[ADVANCED] ¡POSICIÓN RECIBIDA! ACK funcionó")
-                                    conn_data['position_received'] = True
+                                    elif protocol == 0x12:  # Posición
+                                        log("[ADVANCED] ¡POSICIÓN RECIBIDA! ACK funcionó")
+                                        conn_data['position_received'] = True
                                     
-                                    if parse_position(data):
-                                        log("[ADVANCED] ✓ Posición parseada correctamente")
+                                        if parse_position(data):
+                                            log("[ADVANCED] ✓ Posición parseada correctamente")
                                         
-                                        # Enviar ACK para posición
-                                        if len(data) >= 25:
-                                            pos_serial = data[23:25]
-                                            send_ack(pos_serial, conn)
-                                            log("[ADVANCED] ✓ ACK de posición enviado")
-                                    else:
-                                        log("[ADVANCED] ✗ Error parseando posición")
+                                            # Enviar ACK para posición
+                                            if len(data) >= 25:
+                                                pos_serial = data[23:25]
+                                                send_ack(pos_serial, conn)
+                                                log("[ADVANCED] ✓ ACK de posición enviado")
+                                        else:
+                                            log("[ADVANCED] ✗ Error parseando posición")
                                     
-                                elif protocol == 0x13:  # Estado
-                                    log("[ADVANCED] Estado recibido - ACK aún no reconocido")
-                                    # Enviar ACK para estado
-                                    if len(data) >= 8:
-                                        status_info = data[4:-4]
-                                        if len(status_info) >= 7:
-                                            status_serial = status_info[-2:]
-                                            send_ack(status_serial, conn)
-                                            log("[ADVANCED] ACK para estado enviado")
+                                    elif protocol == 0x13:  # Estado
+                                        log("[ADVANCED] Estado recibido - ACK aún no reconocido")
+                                        # Enviar ACK para estado
+                                        if len(data) >= 8:
+                                            status_info = data[4:-4]
+                                            if len(status_info) >= 7:
+                                                status_serial = status_info[-2:]
+                                                send_ack(status_serial, conn)
+                                                log("[ADVANCED] ACK para estado enviado")
                                     
-                                elif protocol == 0x23:  # Heartbeat
-                                    log("[ADVANCED] Heartbeat recibido")
+                                    elif protocol == 0x23:  # Heartbeat
+                                        log("[ADVANCED] Heartbeat recibido")
                                     
-                                elif protocol == 0x26:  # Alarma
-                                    log("[ADVANCED] Alarma recibida")
+                                    elif protocol == 0x26:  # Alarma
+                                        log("[ADVANCED] Alarma recibida")
                                     
-                                else:
-                                    log(f"[ADVANCED] Protocolo desconocido: 0x{protocol:02X}")
-                        else:
-                            log("[ADVANCED] [ERROR] Paquete no comienza con 7878")
+                                    else:
+                                        log(f"[ADVANCED] Protocolo desconocido: 0x{protocol:02X}")
+                            else:
+                                log("[ADVANCED] [ERROR] Paquete no comienza con 7878")
+                    finally:
+                        # Detener la secuencia de configuración pendiente
+                        conn_data['connection_closed'] = True
+                        TIMERS.cancel(conn_data.get('config_timer'))
+                        wake_r.close()
+                        wake_w.close()
                             
             except socket.error as e:
                 log(f"[ADVANCED] [ERROR] Error de socket: {e}")
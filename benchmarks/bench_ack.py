@@ -0,0 +1,70 @@
+"""
+Benchmark del armado de ACKs: concatenación + crc16_itu_factory por respuesta
+(como hacían los handlers) frente a la tabla precalculada de gt06_crc.
+
+Mide el costo por ACK recorriendo seriales consecutivos (como los manda un
+equipo) con la tabla fría (primera vez que se ve cada serial) y caliente, y la
+memoria de la tabla completa frente a un dict de bytes con las mismas entradas.
+
+Uso:
+    python benchmarks/bench_ack.py [-n 200000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import comun  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+import gt06_crc
+from gt06_crc import ack_packet, crc16_itu_factory_bytes_be
+
+def ack_original(serial):
+    ack_data = b'\x05\x01' + serial
+    crc_itu_be = crc16_itu_factory_bytes_be(ack_data)
+    return b'\x78\x78' + ack_data + crc_itu_be + b'\x0D\x0A'
+
+def medir(nombre, funcion, seriales):
+    inicio = time.perf_counter()
+    for serial in seriales:
+        funcion(serial)
+    t = (time.perf_counter() - inicio) / len(seriales)
+    print(f"  {nombre:40s} {t * 1e9:7.0f} ns/ACK")
+    return t
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=200000)
+    args = parser.parse_args()
+
+    seriales = [(i & 0xFFFF).to_bytes(2, 'big') for i in range(args.n)]
+    completos = [i.to_bytes(2, 'big') for i in range(65536)]
+
+    print(f"{args.n} ACKs (seriales consecutivos)")
+    antes = medir("original (concatenación + CRC)", ack_original, seriales)
+    gt06_crc._ack_tables.clear()
+    medir("ack_packet, tabla fría (65536 seriales)", ack_packet, completos)
+    despues = medir("ack_packet, tabla caliente", ack_packet, seriales)
+    print(f"  mejora: x{antes / despues:.1f}")
+
+    gt06_crc._ack_tables.clear()
+    tracemalloc.start()
+    for serial in completos:
+        ack_packet(serial, 'itu_be')
+    tabla = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    cache = {serial: ack_original(serial) for serial in completos}
+    diccionario = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del cache
+
+    print("Memoria con los 65536 seriales (un orden de CRC)")
+    print(f"  tabla gt06_crc         {tabla / 1024:7.0f} KB")
+    print(f"  dict serial -> bytes   {diccionario / 1024:7.0f} KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark de la admisión de conexiones (gt06_admission): costo de clasificar
+los primeros bytes, de RateLimiter.allow() y memoria de la tabla por IP
+(un float por IP) frente a un token bucket clásico ([tokens, último] por IP).
+Además lanza GT06_TRACKER.PY y le manda una ráfaga de ClientHello TLS para
+ver cuánto tarda en cerrarlas y cuánto log generan.
+
+Uso:
+    python benchmarks/bench_admission.py [-n 100000] [--sondas 500]
+"""
+
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import build_heartbeat, detener_servidor, lanzar_servidor, puerto_libre
+from gt06_admission import RateLimiter, classify
+
+CLIENT_HELLO = bytes.fromhex('160301020001000200') + bytes(500)
+
+def memoria(funcion):
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    resultado = funcion()
+    usada = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    return usada, resultado
+
+def sondas(n):
+    port = puerto_libre()
+    with tempfile.TemporaryDirectory() as cwd:
+        proc = lanzar_servidor(['--engine', 'selectors'], cwd, port)
+        try:
+            inicio = time.perf_counter()
+            cerradas = 0
+            for _ in range(n):
+                with socket.create_connection(('127.0.0.1', port)) as s:
+                    s.settimeout(2)
+                    s.sendall(CLIENT_HELLO)
+                    try:
+                        cerradas += s.recv(100) == b''
+                    except (socket.timeout, ConnectionResetError):
+                        pass
+            elapsed = time.perf_counter() - inicio
+        finally:
+            detener_servidor(proc)
+        log = os.path.getsize(os.path.join(cwd, 'datosChino.txt'))
+    return cerradas, elapsed, log
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=100000, help="IPs en la tabla")
+    parser.add_argument('--sondas', type=int, default=500)
+    args = parser.parse_args()
+
+    heartbeat = build_heartbeat(1)
+    for nombre, data in (("GT06", heartbeat), ("TLS", CLIENT_HELLO), ("HTTP", b'GET / HTTP/1.1\r\n')):
+        t = timeit.timeit(lambda: classify(data), number=200000) / 200000
+        print(f"classify({nombre}): {t * 1e9:5.0f} ns -> {classify(data)}")
+
+    ips = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.n)]
+    limiter = RateLimiter(5, 50, max_entries=args.n)
+    inicio = time.perf_counter()
+    for ip in ips:
+        limiter.allow(ip)
+    t = time.perf_counter() - inicio
+    print(f"RateLimiter.allow(): {t / args.n * 1e9:5.0f} ns por conexión")
+
+    usada, _ = memoria(lambda: {ip: time.monotonic() for ip in ips})
+    print(f"tabla de {args.n:,} IPs: un float por IP        {usada / 2 ** 20:5.1f} MB")
+    usada, _ = memoria(lambda: {ip: [50.0, time.monotonic()] for ip in ips})
+    print(f"tabla de {args.n:,} IPs: [tokens, último] por IP {usada / 2 ** 20:5.1f} MB")
+
+    cerradas, elapsed, log = sondas(args.sondas)
+    print(f"{args.sondas} ClientHello TLS: {cerradas} cerradas por el servidor, "
+          f"{elapsed / args.sondas * 1e3:.2f} ms por sonda, log: {log} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark del historial columnar de posiciones (gt06_archive).
+
+Simula un día de una flota que reporta cada 10 s (recorridos en la ciudad
+con paradas) y compara los bytes por posición del log de texto con los del
+archivo .gta, con bloques grandes (block_rows) y con los bloques de 5 minutos
+que deja el flush periódico del servidor. Después mide la lectura: por
+columnas (iter_blocks) y por filas (iter_fixes), con NumPy y en Python puro.
+
+Uso:
+    python benchmarks/bench_archive.py [--equipos 100] [--horas 24]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import comun  # noqa: F401  (agrega la raíz del repo a sys.path)
+import gt06_archive
+from gt06_archive import ArchiveWriter, iter_blocks, iter_fixes
+
+INTERVALO = 10   # segundos entre posiciones
+
+def recorrido(rnd, inicio, n):
+    """n posiciones (fix_time, lat_raw, lon_raw, speed, course) de un vehículo"""
+    lat = -34.6 + rnd.uniform(-0.2, 0.2)
+    lon = -58.4 + rnd.uniform(-0.2, 0.2)
+    course = rnd.randrange(360)
+    speed = 0
+    parado = 0
+    rows = []
+    for i in range(n):
+        if parado:
+            parado -= 1
+            speed = 0
+        elif rnd.random() < 0.01:
+            parado = rnd.randint(6, 180)   # semáforo, carga, estacionado
+        else:
+            speed = max(5, min(90, speed + rnd.randint(-8, 8)))
+            course = (course + rnd.choice((0, 0, 0, 2, -2, 5, -5, 90, -90))) % 360
+        metros = speed / 3.6 * INTERVALO
+        lat += metros * math.cos(math.radians(course)) / 111320
+        lon += metros * math.sin(math.radians(course)) / (111320 * math.cos(math.radians(lat)))
+        rows.append((inicio + i * INTERVALO, round(lat * 1800000), round(lon * 1800000), speed, course))
+    return rows
+
+def linea_log(row):
+    """La línea que deja parse_position() en datosChino.txt"""
+    fix_time, lat_raw, lon_raw, speed, course = row
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(fix_time))
+    return (f"{stamp} [POSICION] LAT: {lat_raw / 1800000:.6f}, LON: {lon_raw / 1800000:.6f}, "
+            f"SPEED: {speed} km/h, COURSE: {course}°\n")
+
+def escribir(root, flota, block_rows):
+    writer = ArchiveWriter(root, block_rows=block_rows)
+    total = sum(len(rows) for rows in flota.values())
+    inicio = time.perf_counter()
+    for imei, rows in flota.items():
+        for row in rows:
+            writer.add(imei, row)
+    writer.flush()
+    elapsed = time.perf_counter() - inicio
+    return writer.bytes / total, total / elapsed, writer
+
+def archivos(root):
+    for imei in sorted(os.listdir(root)):
+        for name in sorted(os.listdir(os.path.join(root, imei))):
+            yield os.path.join(root, imei, name)
+
+def leer_columnas(root):
+    count = 0
+    for path in archivos(root):
+        with open(path, 'rb') as stream:
+            for columns in iter_blocks(stream):
+                count += len(columns[0])
+    return count
+
+def leer_filas(root):
+    count = 0
+    for path in archivos(root):
+        for _ in iter_fixes(path):
+            count += 1
+    return count
+
+def medir_lectura(nombre, funcion, root, size, total):
+    inicio = time.perf_counter()
+    count = funcion(root)
+    elapsed = time.perf_counter() - inicio
+    assert count == total, (count, total)
+    print(f"  {nombre:28s} {size / elapsed / 1e6:6.1f} MB/s  {total / elapsed:12,.0f} posiciones/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--equipos', type=int, default=100)
+    parser.add_argument('--horas', type=float, default=24)
+    args = parser.parse_args()
+
+    rnd = random.Random(1)
+    inicio = 1755561600   # 2025-08-19 00:00 UTC
+    n = int(args.horas * 3600 / INTERVALO)
+    flota = {f"0869412{i:09d}": recorrido(rnd, inicio, n) for i in range(args.equipos)}
+    total = args.equipos * n
+    texto = sum(len(linea_log(row).encode()) for rows in flota.values() for row in rows)
+    print(f"{args.equipos} equipos, {args.horas:g} h cada {INTERVALO} s: {total:,} posiciones")
+    print(f"  log de texto ([POSICION] ...)  {texto / total:6.1f} bytes/posición")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bloques_5min = 300 // INTERVALO
+        root_5min = os.path.join(tmp, '5min')
+        size, rate, _ = escribir(root_5min, flota, bloques_5min)
+        print(f"  .gta, bloques de 5 min        {size:6.1f} bytes/posición  (escritura {rate:,.0f} posiciones/s)")
+        root = os.path.join(tmp, 'grande')
+        size, rate, writer = escribir(root, flota, 1024)
+        print(f"  .gta, bloques de 1024 filas   {size:6.1f} bytes/posición  (escritura {rate:,.0f} posiciones/s)")
+
+        print(f"Lectura de {writer.bytes / 1e6:.1f} MB (bloques de 1024 filas):")
+        np = gt06_archive.np
+        for nombre, modulo_np in (("NumPy", np), ("Python puro", None)):
+            if nombre == "NumPy" and np is None:
+                continue
+            gt06_archive.np = modulo_np
+            medir_lectura(f"columnas, {nombre}", leer_columnas, root, writer.bytes, total)
+            medir_lectura(f"filas, {nombre}", leer_filas, root, writer.bytes, total)
+        gt06_archive.np = np
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark de la validación de CRC: las pasadas del código original frente a
+gt06_crc.crc_variant (una sola pasada).
+
+El validate_packet_crc original calculaba el CRC dos veces (LE y BE) sobre una
+copia de data[2:-4], y handle_login lo calculaba otras dos antes de llamarlo:
+cuatro pasadas por login. Se recorre una mezcla de tramas reales (login,
+posición, heartbeat) hasta completar n tramas.
+
+Uso:
+    python benchmarks/bench_crc.py [-n 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import build_heartbeat, build_login, build_position
+from gt06_crc import crc16_itu_factory_bytes, crc16_itu_factory_bytes_be, crc_variant
+
+def validate_original(data):
+    packet_data = data[2:-4]
+    received_crc = data[-4:-2]
+    expected_crc_itu_le = crc16_itu_factory_bytes(packet_data)
+    expected_crc_itu_be = crc16_itu_factory_bytes_be(packet_data)
+    if received_crc == expected_crc_itu_le:
+        return 'itu_le'
+    elif received_crc == expected_crc_itu_be:
+        return 'itu_be'
+    return None
+
+def login_original(data):
+    packet_data = data[2:-4]
+    crc16_itu_factory_bytes(packet_data)
+    crc16_itu_factory_bytes_be(packet_data)
+    return validate_original(data)
+
+def medir(nombre, funcion, tramas):
+    inicio = time.perf_counter()
+    for trama in tramas:
+        funcion(trama)
+    t = time.perf_counter() - inicio
+    print(f"  {nombre:36s} {t:6.2f} s  {t / len(tramas) * 1e6:5.2f} µs/trama  {len(tramas) / t:9,.0f} tramas/s")
+    return t
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=1000000)
+    args = parser.parse_args()
+
+    muestra = [build_login('0359510086005478', 1), build_heartbeat(2)]
+    muestra += [build_position(-34.6 + i * 1e-4, -58.4, serial=3 + i) for i in range(8)]
+    tramas = (muestra * (args.n // len(muestra) + 1))[:args.n]
+    assert all(crc_variant(t) == validate_original(t) == 'itu_be' for t in muestra)
+
+    print(f"{args.n:,} tramas ({sum(map(len, muestra)) / len(muestra):.0f} bytes de promedio)")
+    login = medir("original, ruta de login (4 pasadas)", login_original, tramas)
+    validate = medir("original, validate (2 pasadas)", validate_original, tramas)
+    nuevo = medir("crc_variant (1 pasada)", crc_variant, tramas)
+    print(f"  mejora: x{validate / nuevo:.1f} sobre validate, x{login / nuevo:.1f} sobre el login")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark de la verificación de CRC en lote (gt06_crc.verify_batch) frente a
+crc_variant trama por trama, con y sin NumPy.
+
+Las tramas (login, heartbeat y posiciones) se empaquetan en un único buffer
+con sus offsets, como las arma verificar_capturas.py.
+
+Uso:
+    python benchmarks/bench_crc_batch.py [-n 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import build_heartbeat, build_login, build_position
+import gt06_crc
+from gt06_crc import crc_variant, verify_batch
+
+def medir(nombre, funcion, n):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    t = time.perf_counter() - inicio
+    print(f"  {nombre:32s} {t:6.2f} s  {n / t:12,.0f} tramas/s")
+    return t, resultado
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=1000000)
+    args = parser.parse_args()
+
+    muestra = [build_login('0359510086005478', 1), build_heartbeat(2)]
+    muestra += [build_position(-34.6 + i * 1e-4, -58.4, serial=3 + i) for i in range(8)]
+    tramas = (muestra * (args.n // len(muestra) + 1))[:args.n]
+    buffer = b''.join(tramas)
+    offsets = []
+    offset = 0
+    for trama in tramas:
+        offsets.append(offset)
+        offset += len(trama)
+
+    print(f"{args.n:,} tramas, {len(buffer) / 1e6:.1f} MB")
+    base, esperado = medir("crc_variant trama por trama", lambda: [crc_variant(t) for t in tramas], args.n)
+
+    numpy = gt06_crc.np
+    gt06_crc.np = None
+    t, resultado = medir("verify_batch (Python puro)", lambda: verify_batch(buffer, offsets), args.n)
+    assert resultado == esperado
+    gt06_crc.np = numpy
+
+    if numpy is None:
+        print("  NumPy no está instalado")
+        return
+    t, resultado = medir("verify_batch (NumPy)", lambda: verify_batch(buffer, offsets), args.n)
+    assert resultado == esperado
+    print(f"  mejora con NumPy: x{base / t:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Micro-benchmark de gt06_decoder.decode_frame frente a los cortes de la
+trama (data[4:10], data[11:15]...) que usaban parse_position y handle_login
+de GT06_TRACKER.PY.
+
+parse_position ya decodifica con decode_frame: como referencia de antes se
+mide campos_por_cortes(), los mismos cortes y conversiones sin el log. Se
+mide además parse_position() completo (log, última posición, índice espacial)
+y handle_login() con una sesión real de SESSIONS. log() se reemplaza por una
+función vacía (los f-strings de los mensajes se siguen armando).
+
+Uso:
+    python benchmarks/bench_decoder.py [-n 200000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import build_login, build_position, cargar_tracker
+from gt06_decoder import decode_frame
+
+def campos_por_cortes(data):
+    """Los campos que sacaba parse_position cortando la trama, sin el log"""
+    date_bytes = data[4:10]
+    quantity = data[10]
+    lat_val = int.from_bytes(data[11:15], byteorder='big')
+    lon_val = int.from_bytes(data[15:19], byteorder='big')
+    speed = data[19]
+    course = int.from_bytes(data[20:22], byteorder='big')
+    lat = (lat_val & 0x7FFFFFFF) / 1800000.0
+    lon = (lon_val & 0x7FFFFFFF) / 1800000.0
+    if lat_val & 0x80000000:
+        lat = -lat
+    if lon_val & 0x80000000:
+        lon = -lon
+    serial = int.from_bytes(data[-6:-4], byteorder='big')
+    return date_bytes, quantity, lat, lon, speed, course, serial
+
+def medir(nombre, stmt, n, namespace):
+    t = min(timeit.repeat(stmt, globals=namespace, number=n, repeat=3))
+    print(f"  {nombre:38s} {t / n * 1e6:7.2f} µs/trama")
+    return t / n
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=200000)
+    args = parser.parse_args()
+
+    tracker = cargar_tracker()
+    position = build_position(-34.6037, -58.3816, speed=42, course=180, serial=7)
+    login = build_login('0869412076668133', 1)
+
+    # Captura con muchas tramas: se decodifica una en el medio sin cortarla
+    capture = memoryview(position * 1000)
+    offset = len(position) * 500
+
+    # Sesión real: handle_login asocia el IMEI en SESSIONS (con un dict fallaba y medía la excepción)
+    session = tracker.SESSIONS.open(object())
+    session.imei = '0869412076668133'
+
+    ns = {
+        'tracker': tracker, 'decode_frame': decode_frame, 'campos_por_cortes': campos_por_cortes,
+        'session': session,
+        'position': position, 'login': login, 'capture': capture,
+        'start': offset, 'end': offset + len(position),
+    }
+
+    print("Posición 0x12:")
+    t_old = medir('cortes (parse_position de antes)', 'campos_por_cortes(position)', args.n, ns)
+    t_new = medir('decode_frame(bytes)', 'decode_frame(position)', args.n, ns)
+    medir('decode_frame(memoryview de captura)', 'decode_frame(capture, start, end)', args.n, ns)
+    print(f"  -> {t_old / t_new:.1f}x")
+    medir('parse_position completo', 'tracker.parse_position(position, session)', args.n, ns)
+
+    print("Login 0x01:")
+    t_old = medir('handle_login', 'tracker.handle_login(login, session)', args.n, ns)
+    t_new = medir('decode_frame(bytes)', 'decode_frame(login)', args.n, ns)
+    print(f"  -> {t_old / t_new:.1f}x (handle_login además arma el ACK y valida CRC)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark del despacho de tramas (gt06_dispatch.DispatchTable).
+
+Compara, con handlers vacíos, el costo por trama de elegir el handler con
+la cadena if/elif que usaba process_packet() (protocolo y string
+transmission_mode) y con la lista de handlers que la sesión resuelve una
+vez por modo. Mezcla de tramas de un equipo en modo login y de uno en modo
+directo.
+
+Uso:
+    python benchmarks/bench_dispatch.py [-n 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import comun  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+from gt06_dispatch import DispatchTable
+
+class Sesion:
+    __slots__ = ('transmission_mode', 'handlers')
+
+    def __init__(self, mode):
+        self.transmission_mode = mode
+        self.handlers = None
+
+def nada(data, conn, session):
+    pass
+
+def cadena(data, conn, session):
+    """La cadena de process_packet() antes de la tabla"""
+    tipo_paquete = data[3]
+    if tipo_paquete == 0x01:
+        nada(data, conn, session)
+    elif tipo_paquete == 0x12 and session.transmission_mode == 'direct':
+        nada(data, conn, session)
+    elif tipo_paquete == 0x23 and session.transmission_mode == 'direct':
+        nada(data, conn, session)
+    elif tipo_paquete == 0x26 and session.transmission_mode == 'direct':
+        nada(data, conn, session)
+    elif tipo_paquete == 0x12:
+        nada(data, conn, session)
+    elif tipo_paquete == 0x13:
+        nada(data, conn, session)
+    elif tipo_paquete == 0x23:
+        nada(data, conn, session)
+    elif tipo_paquete == 0x26:
+        nada(data, conn, session)
+    else:
+        nada(data, conn, session)
+
+def tabla_factory():
+    dispatch = DispatchTable(default=nada)
+    for protocol in (0x12, 0x23, 0x26):
+        dispatch.register(protocol, nada, mode='direct')
+    for protocol in (0x01, 0x12, 0x13, 0x23, 0x26):
+        dispatch.register(protocol, nada)
+
+    def tabla(data, conn, session):
+        handlers = session.handlers
+        if handlers is None:
+            handlers = session.handlers = dispatch.table(session.transmission_mode)
+        handlers[data[3]](data, conn, session)
+    return tabla
+
+def medir(funcion, tramas, n):
+    inicio = time.perf_counter()
+    for _ in range(n // len(tramas)):
+        for data, session in tramas:
+            funcion(data, None, session)
+    return (time.perf_counter() - inicio) / n
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=1000000, help="tramas")
+    args = parser.parse_args()
+
+    login, directo = Sesion('login'), Sesion('direct')
+    mezclas = {
+        "login: 12/13/23/26": [(bytes([0x78, 0x78, 0x05, p]), login) for p in (0x12, 0x13, 0x23, 0x26)],
+        "directo: 12/23/26": [(bytes([0x78, 0x78, 0x05, p]), directo) for p in (0x12, 0x23, 0x26)],
+        "desconocido (0x8A)": [(bytes([0x78, 0x78, 0x05, 0x8A]), login)],
+    }
+    tabla = tabla_factory()
+    print(f"{args.n:,} tramas por mezcla")
+    for nombre, tramas in mezclas.items():
+        t_cadena = min(medir(cadena, tramas, args.n) for _ in range(3))
+        t_tabla = min(medir(tabla, tramas, args.n) for _ in range(3))
+        print(f"  {nombre:20s} if/elif {t_cadena * 1e9:5.0f} ns   tabla {t_tabla * 1e9:5.0f} ns por trama")
+
+if __name__ == "__main__":
+    main()
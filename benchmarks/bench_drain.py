@@ -0,0 +1,77 @@
+"""
+Benchmark del cierre ordenado (SIGTERM) de GT06_TRACKER.PY.
+
+N equipos mandan cada uno una ráfaga de tramas de posición y, sin esperar
+las respuestas, el servidor recibe la señal: SIGTERM (drena: procesa lo ya
+recibido, envía los ACK encolados y cierra) o SIGKILL (como un reinicio que
+corta todo; antes SIGTERM salía con sys.exit sin esperar a nada). Cuenta las
+tramas que quedaron sin ACK: son las que los equipos retransmiten al volver.
+
+Uso:
+    python benchmarks/bench_drain.py [-n 200] [--rafaga 50] [--engines selectors,asyncio]
+"""
+
+import argparse
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import build_position, lanzar_servidor, puerto_libre
+
+ACK_SIZE = 10
+
+def reiniciar(engine, signum, n, rafaga):
+    port = puerto_libre()
+    with tempfile.TemporaryDirectory() as cwd:
+        proc = lanzar_servidor(['--engine', engine, '--conn-rate-per-ip', '0'], cwd, port)
+        try:
+            equipos = [socket.create_connection(('127.0.0.1', port)) for _ in range(n)]
+            time.sleep(0.5)
+            burst = b''.join(build_position(-34.6, -58.4, serial=i + 1) for i in range(rafaga))
+            for s in equipos:
+                s.sendall(burst)
+            inicio = time.perf_counter()
+            proc.send_signal(signum)
+            acks = 0
+            for s in equipos:
+                s.settimeout(15)
+                recibido = 0
+                try:
+                    while True:
+                        chunk = s.recv(65536)
+                        if not chunk:
+                            break
+                        recibido += len(chunk)
+                except (socket.timeout, ConnectionResetError):
+                    pass
+                acks += recibido // ACK_SIZE
+                s.close()
+            proc.wait(30)
+            elapsed = time.perf_counter() - inicio
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+    return acks, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=200, help="equipos conectados")
+    parser.add_argument('--rafaga', type=int, default=50, help="tramas por equipo")
+    parser.add_argument('--engines', default='selectors,asyncio')
+    args = parser.parse_args()
+
+    total = args.n * args.rafaga
+    print(f"{args.n} equipos x {args.rafaga} tramas = {total} tramas en vuelo")
+    for engine in args.engines.split(','):
+        for nombre, signum in (("SIGKILL", signal.SIGKILL), ("SIGTERM", signal.SIGTERM)):
+            acks, elapsed = reiniciar(engine, signum, args.n, args.rafaga)
+            print(f"  {engine:9s} {nombre}: {acks:6d} ACKs, {total - acks:6d} tramas a retransmitir, "
+                  f"proceso terminado en {elapsed * 1e3:.0f} ms")
+
+if __name__ == "__main__":
+    main()
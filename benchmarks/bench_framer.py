@@ -0,0 +1,107 @@
+"""
+Benchmark de GT06Framer sobre capturas concatenadas de varios MB.
+
+Compara el framer incremental con un reensamblado ingenuo que vuelve a
+cortar el buffer (buf = buf[n:]) en cada trama. La captura se recorre en
+trozos de recv(1024), de recv(65536) (ráfagas grandes: el corte repetido
+se vuelve cuadrático) y en trozos aleatorios pequeños.
+
+Uso:
+    python benchmarks/bench_framer.py [--mb 8]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import build_heartbeat, build_login, build_position
+from gt06_framer import GT06Framer
+
+def generar_captura(mb):
+    """
+    Ráfagas de posiciones con algún login y heartbeat, como llegan de una flota
+    """
+    frames = []
+    total = 0
+    serial = 0
+    while total < mb * 1024 * 1024:
+        serial = (serial + 1) & 0xFFFF
+        r = serial % 20
+        if r == 0:
+            frame = build_login('0869412076668133', serial)
+        elif r == 1:
+            frame = build_heartbeat(serial)
+        else:
+            frame = build_position(-34.6 - serial / 1e6, -58.4 - serial / 1e6, serial=serial)
+        frames.append(frame)
+        total += len(frame)
+    return frames, b''.join(frames)
+
+def trocear(data, modo):
+    if modo.startswith('recv'):
+        n = int(modo[4:])
+        return [data[i:i + n] for i in range(0, len(data), n)]
+    rnd = random.Random(1)
+    chunks = []
+    i = 0
+    while i < len(data):
+        n = rnd.randint(1, 200)
+        chunks.append(data[i:i + n])
+        i += n
+    return chunks
+
+def framer_ingenuo(chunks):
+    """
+    Reensamblado con slicing: copia el resto del buffer en cada trama
+    """
+    buf = b''
+    frames = []
+    for data in chunks:
+        buf += data
+        while len(buf) >= 3:
+            start = buf.find(b'\x78\x78')
+            if start < 0:
+                buf = buf[-1:]
+                break
+            buf = buf[start:]
+            if len(buf) < 3:
+                break
+            end = buf[2] + 5
+            if len(buf) < end:
+                break
+            frames.append(buf[:end])
+            buf = buf[end:]
+    return len(frames)
+
+def framer_incremental(chunks):
+    framer = GT06Framer()
+    frames = []
+    for data in chunks:
+        frames += framer.feed(data)
+    return len(frames)
+
+def medir(nombre, func, chunks, total_bytes, esperado):
+    inicio = time.perf_counter()
+    count = func(chunks)
+    elapsed = time.perf_counter() - inicio
+    assert count == esperado, (nombre, count, esperado)
+    print(f"  {nombre:12s} {total_bytes / elapsed / 1e6:8.1f} MB/s  {count / elapsed:12,.0f} tramas/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mb', type=float, default=8)
+    args = parser.parse_args()
+
+    frames, data = generar_captura(args.mb)
+    print(f"Captura: {len(data) / 1e6:.1f} MB, {len(frames):,} tramas")
+    for modo in ('recv1024', 'recv65536', 'aleatorio'):
+        chunks = trocear(data, modo)
+        print(f"Trozos {modo} ({len(chunks):,} recv):")
+        medir('ingenuo', framer_ingenuo, chunks, len(data), len(frames))
+        medir('GT06Framer', framer_incremental, chunks, len(data), len(frames))
+
+if __name__ == "__main__":
+    main()
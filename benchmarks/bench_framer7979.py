@@ -0,0 +1,98 @@
+"""
+Benchmark de las tramas 7979 (length de 2 bytes) en GT06Framer y verify_batch.
+
+Mide el framer sobre la captura de bench_framer.py (solo 7878, para ver que
+el ritmo no cambia) y sobre la misma captura con transmisiones de
+información 0x94 de 1 a 8 KB intercaladas. Después lanza GT06_TRACKER.PY,
+le manda tramas 7979 partidas en recv() chicos y cuenta en el log cuántas
+se procesaron y cuántos bytes se descartaron.
+
+Uso:
+    python benchmarks/bench_framer7979.py [--mb 8] [--envios 200]
+"""
+
+import argparse
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_framer import framer_incremental, generar_captura, medir, trocear
+from comun import build_information, build_position, detener_servidor, lanzar_servidor, puerto_libre
+from gt06_crc import verify_batch
+
+def intercalar_7979(frames, cada=50):
+    """Una transmisión de información de 1 a 8 KB cada `cada` tramas 7878"""
+    rnd = random.Random(1)
+    mezcla = []
+    for i, frame in enumerate(frames):
+        if i % cada == 0:
+            mezcla.append(build_information(rnd.randint(1024, 8192), serial=i & 0xFFFF))
+        mezcla.append(frame)
+    return mezcla, b''.join(mezcla)
+
+def offsets(frames):
+    result = []
+    pos = 0
+    for frame in frames:
+        result.append(pos)
+        pos += len(frame)
+    return result
+
+def servidor(envios, trozo=512):
+    port = puerto_libre()
+    with tempfile.TemporaryDirectory() as cwd:
+        proc = lanzar_servidor(['--engine', 'selectors'], cwd, port)
+        try:
+            inicio = time.perf_counter()
+            with socket.create_connection(('127.0.0.1', port)) as s:
+                s.settimeout(5)
+                # Equipo en modo directo: cada posición recibe su ACK
+                s.sendall(build_position(-34.6, -58.4, serial=1))
+                s.recv(100)
+                for i in range(envios):
+                    data = build_information(4096, serial=i + 2)
+                    for j in range(0, len(data), trozo):
+                        s.sendall(data[j:j + trozo])
+                # Una posición al final: su ACK confirma que se procesó todo lo anterior
+                s.sendall(build_position(-34.6, -58.4, serial=envios + 2))
+                ack = s.recv(100)
+            elapsed = time.perf_counter() - inicio
+        finally:
+            detener_servidor(proc)
+        with open(os.path.join(cwd, 'datosChino.txt'), encoding='utf-8', errors='replace') as f:
+            log = f.read()
+    return ack, log.count('[INFO_TX]'), log.count('Descartados'), elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mb', type=float, default=8)
+    parser.add_argument('--envios', type=int, default=200)
+    args = parser.parse_args()
+
+    frames, data = generar_captura(args.mb)
+    mezcla, data_mezcla = intercalar_7979(frames)
+    largas = len(mezcla) - len(frames)
+    print(f"Captura 7878: {len(data) / 1e6:.1f} MB, {len(frames):,} tramas")
+    print(f"Captura mixta: {len(data_mezcla) / 1e6:.1f} MB, {len(mezcla):,} tramas ({largas:,} 7979)")
+    for modo in ('recv1024', 'recv65536'):
+        print(f"Trozos {modo}:")
+        medir('solo 7878', framer_incremental, trocear(data, modo), len(data), len(frames))
+        medir('mixta', framer_incremental, trocear(data_mezcla, modo), len(data_mezcla), len(mezcla))
+
+    inicio = time.perf_counter()
+    variantes = verify_batch(data_mezcla, offsets(mezcla))
+    elapsed = time.perf_counter() - inicio
+    validas = len(variantes) - variantes.count(None)
+    print(f"verify_batch (mixta): {validas:,} de {len(mezcla):,} válidas, "
+          f"{len(data_mezcla) / elapsed / 1e6:.1f} MB/s")
+
+    ack, procesadas, descartes, elapsed = servidor(args.envios)
+    print(f"Servidor: {args.envios} tramas 7979 de 4 KB en trozos de 512 B -> {procesadas} procesadas, "
+          f"{descartes} descartes, ACK final: {ack.hex() or 'ninguno'} ({elapsed:.2f} s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark de las geocercas del servidor (gt06_geofence).
+
+Arma --geocercas geocercas en el AMBA (~60 x 60 km): la mitad circulares de
+50 m a 1 km y la mitad polígonos de 4 a 16 vértices de tamaño parecido, más
+unas pocas zonas grandes (partidos enteros) que van a la lista que se revisa
+siempre. Después pasa posiciones de --equipos vehículos que recorren la zona
+por GeofenceMonitor.evaluate() y mide posiciones/s, candidatas por posición
+y eventos, contra:
+- recorrer todas las geocercas con el rectángulo envolvente como primer filtro;
+- recorrer todas con la prueba exacta directamente.
+Al final mide el costo que agrega a record_fix() del servidor.
+
+Uso:
+    python benchmarks/bench_geofence.py [--geocercas 50000] [--equipos 5000] [--posiciones 200000]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import cargar_tracker
+from gt06_geofence import (DEFAULT_CELL_SIZE, RAW_PER_DEGREE, GeofenceIndex, GeofenceMonitor, circle, contains,
+                           polygon)
+from gt06_session import Session
+
+SUR, NORTE = -34.9, -34.35
+OESTE, ESTE = -58.85, -58.2
+
+def geocercas(rnd, n):
+    fences = []
+    for i in range(n):
+        lat, lon = rnd.uniform(SUR, NORTE), rnd.uniform(OESTE, ESTE)
+        metros = rnd.uniform(50, 1000)
+        if i % 2:
+            fences.append(circle(f"c{i}", lat, lon, metros))
+            continue
+        radio = metros / 111320
+        angulos = sorted(rnd.uniform(0, 2 * math.pi) for _ in range(rnd.randint(4, 16)))
+        fences.append(polygon(f"p{i}", [(lat + radio * rnd.uniform(0.5, 1) * math.sin(a),
+                                         lon + radio * rnd.uniform(0.5, 1) * math.cos(a) / math.cos(math.radians(lat)))
+                                        for a in angulos]))
+    for i in range(5):
+        lat, lon = rnd.uniform(SUR, NORTE - 1), rnd.uniform(OESTE, ESTE - 1)
+        fences.append(polygon(f"partido{i}", [(lat, lon), (lat + 1, lon), (lat + 1, lon + 1), (lat, lon + 1)]))
+    return fences
+
+def posiciones(rnd, equipos, n):
+    """n posiciones (imei, lat_raw, lon_raw) de equipos que avanzan ~100 m por reporte"""
+    estado = [[rnd.uniform(SUR, NORTE), rnd.uniform(OESTE, ESTE), rnd.uniform(0, 2 * math.pi)]
+              for _ in range(equipos)]
+    imeis = [f"0869412{i:09d}" for i in range(equipos)]
+    result = []
+    for j in range(n):
+        i = j % equipos
+        lat, lon, rumbo = estado[i]
+        rumbo += rnd.gauss(0, 0.3)
+        lat = min(NORTE, max(SUR, lat + 0.0009 * math.cos(rumbo)))
+        lon = min(ESTE, max(OESTE, lon + 0.0011 * math.sin(rumbo)))
+        estado[i] = [lat, lon, rumbo]
+        result.append((imeis[i], round(lat * RAW_PER_DEGREE), round(lon * RAW_PER_DEGREE)))
+    return result
+
+def lineal_con_rectangulo(fences, lat_raw, lon_raw):
+    found = []
+    for fence in fences:
+        south, west, north, east = fence.bbox
+        if south <= lat_raw <= north and west <= lon_raw <= east and contains(fence, lat_raw, lon_raw):
+            found.append(fence)
+    return found
+
+def lineal_exacto(fences, lat_raw, lon_raw):
+    return [fence for fence in fences if contains(fence, lat_raw, lon_raw)]
+
+def medir_lineal(nombre, funcion, fences, fixes):
+    inicio = time.perf_counter()
+    for _, lat_raw, lon_raw in fixes:
+        funcion(fences, lat_raw, lon_raw)
+    elapsed = time.perf_counter() - inicio
+    print(f"  {nombre:36s} {len(fixes) / elapsed:12,.0f} posiciones/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--geocercas', type=int, default=50000)
+    parser.add_argument('--equipos', type=int, default=5000)
+    parser.add_argument('--posiciones', type=int, default=200000)
+    parser.add_argument('--celda', type=float, default=DEFAULT_CELL_SIZE, help='lado de la celda en grados')
+    args = parser.parse_args()
+
+    rnd = random.Random(1)
+    fences = geocercas(rnd, args.geocercas)
+    inicio = time.perf_counter()
+    index = GeofenceIndex(fences, cell_size=args.celda)
+    armado = time.perf_counter() - inicio
+    entradas = sum(len(entries) for entries in index.cells.values())
+    print(f"{len(fences):,} geocercas en celdas de {args.celda}°: {len(index.cells):,} celdas, "
+          f"{entradas / len(index.cells):.1f} geocercas por celda, {len(index.large)} grandes "
+          f"(armado {armado:.2f} s)")
+
+    fixes = posiciones(rnd, args.equipos, args.posiciones)
+    candidatas = sum(len(index.candidates(lat_raw, lon_raw)) for _, lat_raw, lon_raw in fixes[:20000])
+    monitor = GeofenceMonitor(index)
+    inicio = time.perf_counter()
+    for imei, lat_raw, lon_raw in fixes:
+        monitor.evaluate(imei, lat_raw, lon_raw)
+    elapsed = time.perf_counter() - inicio
+    print(f"{len(fixes):,} posiciones de {args.equipos:,} equipos:")
+    print(f"  {'GeofenceMonitor.evaluate()':36s} {len(fixes) / elapsed:12,.0f} posiciones/s  "
+          f"({elapsed / len(fixes) * 1e6:.1f} µs, {candidatas / min(len(fixes), 20000):.1f} candidatas por rectángulo)")
+    print(f"  {monitor.events:,} eventos, {len(monitor.inside):,} equipos dentro de alguna geocerca")
+    muestra = fixes[:200]
+    medir_lineal("todas, rectángulo y prueba exacta", lineal_con_rectangulo, fences, muestra)
+    medir_lineal("todas, solo prueba exacta", lineal_exacto, fences, muestra)
+
+    # Costo en el servidor: record_fix() con y sin geocercas
+    tracker = cargar_tracker()
+    session = Session(None)
+    muestra = fixes[:50000]
+    for nombre, monitor in (("record_fix() sin geocercas", None), ("record_fix() con geocercas", GeofenceMonitor(index))):
+        tracker.GEOFENCES = monitor
+        tracker.LAST_POSITIONS = tracker.LastPositionIndex()
+        tracker.SPATIAL = tracker.GridIndex()
+        inicio = time.perf_counter()
+        for fix_time, (imei, lat_raw, lon_raw) in enumerate(muestra, 1):
+            session.imei = imei
+            tracker.record_fix(session, fix_time, lat_raw, lon_raw, 40, 90, 8, 1)
+        elapsed = time.perf_counter() - inicio
+        print(f"  {nombre:36s} {len(muestra) / elapsed:12,.0f} posiciones/s  ({elapsed / len(muestra) * 1e6:.1f} µs)")
+
+if __name__ == "__main__":
+    main()
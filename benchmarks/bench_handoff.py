@@ -0,0 +1,103 @@
+"""
+Benchmark del reinicio sin corte (--handoff, gt06_handoff).
+
+Con N equipos conectados se reemplaza el proceso del servidor de dos formas:
+SIGTERM y arrancar uno nuevo (cierre ordenado y vuelta a abrir el puerto),
+o lanzar el nuevo con --handoff para que tome el socket de escucha y las
+conexiones. Mientras tanto un hilo intenta conectarse cada 5 ms y cuenta los
+rechazos (los que hacen que un equipo espere minutos antes de reintentar).
+Al final cuenta las conexiones que siguen vivas y responden.
+
+Uso:
+    python benchmarks/bench_handoff.py [-n 500] [--engine selectors]
+"""
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import TRACKER_PATH, build_position, lanzar_servidor, puerto_libre
+
+def sondear(port, stop, resultado):
+    while not stop.is_set():
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                resultado['aceptadas'] += 1
+        except OSError:
+            resultado['rechazadas'] += 1
+        time.sleep(0.005)
+
+def vivas(equipos):
+    """Equipos que reciben el ACK de una posición después del reinicio"""
+    for i, s in enumerate(equipos):
+        try:
+            s.sendall(build_position(-34.6, -58.4, serial=i % 65535 + 1))
+        except OSError:
+            pass
+    respondieron = 0
+    for s in equipos:
+        s.settimeout(2)
+        try:
+            respondieron += len(s.recv(100)) >= 10
+        except OSError:
+            pass
+    return respondieron
+
+def reinicio(engine, n, handoff):
+    port = puerto_libre()
+    with tempfile.TemporaryDirectory() as cwd:
+        extra = ['--engine', engine, '--conn-rate-per-ip', '0']
+        if handoff:
+            extra += ['--handoff', os.path.join(cwd, 'handoff.sock')]
+        viejo = lanzar_servidor(extra, cwd, port)
+        nuevo = None
+        try:
+            equipos = [socket.create_connection(('127.0.0.1', port)) for _ in range(n)]
+            time.sleep(0.5)
+            stop = threading.Event()
+            resultado = {'aceptadas': 0, 'rechazadas': 0}
+            sonda = threading.Thread(target=sondear, args=(port, stop, resultado))
+            sonda.start()
+            time.sleep(0.2)
+            inicio = time.perf_counter()
+            if not handoff:
+                viejo.send_signal(signal.SIGTERM)
+                viejo.wait(30)
+            nuevo = subprocess.Popen([sys.executable, TRACKER_PATH, '--host', '127.0.0.1', '--port', str(port)] + extra,
+                                     cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            viejo.wait(30)
+            elapsed = time.perf_counter() - inicio
+            time.sleep(1.0)
+            stop.set()
+            sonda.join()
+            respondieron = vivas(equipos)
+            for s in equipos:
+                s.close()
+        finally:
+            for proc in (viejo, nuevo):
+                if proc is not None and proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+    return resultado['rechazadas'], respondieron, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=500, help="equipos conectados")
+    parser.add_argument('--engine', default='selectors', choices=['selectors', 'asyncio'])
+    args = parser.parse_args()
+
+    print(f"{args.n} equipos conectados, motor {args.engine}")
+    for nombre, handoff in (("SIGTERM + arranque", False), ("--handoff", True)):
+        rechazadas, respondieron, elapsed = reinicio(args.engine, args.n, handoff)
+        print(f"  {nombre:20s} conexiones rechazadas: {rechazadas:4d}, equipos que siguen conectados: "
+              f"{respondieron:5d}/{args.n}, viejo terminado en {elapsed * 1e3:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark del cierre de conexiones inactivas de GT06_TRACKER.PY.
+
+N conexiones falsas (sin red) con timeouts cortos: el 90% manda un heartbeat
+cada 0,5 s y el 10% deja de hablar (GPRS que desaparece sin FIN). Compara el
+trabajo del temporizador 'idle' de la rueda (check_idle, que solo se vuelve a
+programar al vencer) con un barrido que cada segundo revisa todas las
+conexiones, y muestra que solo se cierran las muertas.
+
+Uso:
+    python benchmarks/bench_idle.py [-n 20000] [--segundos 6]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import comun
+
+class ConexionFalsa:
+    def __init__(self, tracker):
+        self.tracker = tracker
+
+    def sendall(self, data):
+        pass
+
+    def abort(self):
+        self.tracker.close_connection_data(self)
+
+    def getpeername(self):
+        return ('127.0.0.1', 0)
+
+def barrido(sessions, timeout):
+    """Lo que haría un barrido O(todas) por segundo"""
+    now = time.monotonic()
+    return [s for s in sessions if now - s.last_seen >= timeout]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=20000)
+    parser.add_argument('--segundos', type=float, default=6.0)
+    args = parser.parse_args()
+
+    tracker = comun.cargar_tracker()
+    tracker.IDLE_TIMEOUT_DEFAULT = 3.0
+    tracker.IDLE_TIMEOUT_MIN = 2.0
+    timers = tracker.TIMERS
+
+    conns = [ConexionFalsa(tracker) for _ in range(args.n)]
+    sessions = [tracker.new_connection_data(conn) for conn in conns]
+    vivas = sessions[:args.n * 9 // 10]
+    fired = timers.fired
+
+    barridos = 0
+    t_barrido = 0.0
+    inicio = time.monotonic()
+    proximo = inicio + 1.0
+    while time.monotonic() - inicio < args.segundos:
+        for session in vivas:
+            tracker.note_heartbeat(session)
+            tracker.SESSIONS.touch(session)
+        time.sleep(0.5)
+        if time.monotonic() >= proximo:
+            t0 = time.perf_counter()
+            barrido(sessions, tracker.IDLE_TIMEOUT_MIN)
+            t_barrido += time.perf_counter() - t0
+            barridos += 1
+            proximo += 1.0
+
+    vencimientos = timers.fired - fired
+    print(f"{args.n:,} conexiones, {args.n - len(vivas):,} mudas, {args.segundos:.0f} s")
+    print(f"  cerradas por inactividad: {tracker.STATS['idle_closed']:,}, abiertas: {len(tracker.SESSIONS):,}")
+    print(f"  rueda (check_idle):     {vencimientos:8,} vencimientos revisados")
+    print(f"  barrido por segundo:    {barridos * args.n:8,} conexiones revisadas "
+          f"({t_barrido / max(barridos, 1) * 1e3:.1f} ms por barrido)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark de la última posición por IMEI (gt06_lastpos).
+
+Con una flota de 100.000 equipos mide update() y get() con percentiles de
+latencia, memoria del índice en columnas array frente a un dict de dicts,
+snapshot y carga (arranque en caliente) y, con GT06_TRACKER.PY arrancado
+desde ese snapshot con --api-port, la latencia de GET /position/<imei>
+por HTTP (conexión keep-alive, como un cliente de despacho).
+
+Uso:
+    python benchmarks/bench_lastpos.py [--equipos 100000] [--consultas 5000]
+"""
+
+import argparse
+import http.client
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import detener_servidor, lanzar_servidor, puerto_libre
+from gt06_lastpos import LastPositionIndex
+
+def percentiles(muestras_ns):
+    muestras = sorted(muestras_ns)
+    n = len(muestras)
+    return {p: muestras[min(n - 1, int(n * p / 100))] / 1000 for p in (50, 99, 99.9)}
+
+def mostrar(nombre, muestras_ns):
+    p = percentiles(muestras_ns)
+    print(f"  {nombre:32s} p50 {p[50]:7.2f} µs  p99 {p[99]:7.2f} µs  p99.9 {p[99.9]:7.2f} µs")
+
+def llenar(index, imeis, ahora):
+    for i, imei in enumerate(imeis):
+        index.update(imei, ahora, ahora, -62280000 - i, -105120000 + i, 40, 90)
+
+def memoria(funcion):
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    resultado = funcion()
+    usada = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    return usada, resultado
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--equipos', type=int, default=100000)
+    parser.add_argument('--consultas', type=int, default=5000)
+    args = parser.parse_args()
+
+    rnd = random.Random(1)
+    ahora = int(time.time())
+    imeis = [f"0869412{i:09d}" for i in range(args.equipos)]
+    print(f"Flota de {args.equipos:,} equipos")
+
+    # Los IMEI ya existen fuera del índice: se mide solo lo que agrega cada estructura
+    usada, index = memoria(lambda: (lambda index: (llenar(index, imeis, ahora), index)[1])(LastPositionIndex()))
+    print(f"  memoria, columnas array          {usada / args.equipos:6.0f} bytes/equipo")
+    usada, _ = memoria(lambda: {imei: {'fix_time': ahora, 'received_at': float(ahora), 'lat_raw': -62280000 - i,
+                                       'lon_raw': -105120000 + i, 'speed': 40, 'course': 90, 'protocol': 0x12}
+                                for i, imei in enumerate(imeis)})
+    print(f"  memoria, dict de dicts           {usada / args.equipos:6.0f} bytes/equipo")
+
+    muestras = []
+    for i in range(args.consultas * 20):
+        imei = imeis[rnd.randrange(args.equipos)]
+        t = time.perf_counter_ns()
+        index.update(imei, ahora + i, ahora + i, -62280000, -105120000, 40, 90)
+        muestras.append(time.perf_counter_ns() - t)
+    mostrar("update()", muestras)
+    muestras = []
+    for _ in range(args.consultas * 20):
+        imei = imeis[rnd.randrange(args.equipos)]
+        t = time.perf_counter_ns()
+        index.get(imei)
+        muestras.append(time.perf_counter_ns() - t)
+    mostrar("get()", muestras)
+
+    with tempfile.TemporaryDirectory() as cwd:
+        path = os.path.join(cwd, 'posiciones.snap')
+        inicio = time.perf_counter()
+        index.snapshot(path)
+        escritura = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        count = LastPositionIndex().load(path)
+        carga = time.perf_counter() - inicio
+        print(f"  snapshot: {os.path.getsize(path) / 1e6:.1f} MB, escritura {escritura * 1e3:.0f} ms, "
+              f"carga {carga * 1e3:.0f} ms ({count:,} equipos)")
+
+        port = puerto_libre()
+        api = puerto_libre()
+        proc = lanzar_servidor(['--snapshot', path, '--api-port', str(api)], cwd, port)
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', api, timeout=5)
+            muestras = []
+            encontrados = 0
+            for _ in range(args.consultas):
+                imei = imeis[rnd.randrange(args.equipos)]
+                t = time.perf_counter_ns()
+                conn.request('GET', f'/position/{imei}')
+                response = response_body = conn.getresponse()
+                response_body.read()
+                muestras.append(time.perf_counter_ns() - t)
+                encontrados += response.status == 200
+            conn.close()
+        finally:
+            detener_servidor(proc)
+        mostrar(f"GET /position ({encontrados:,} de {args.consultas:,})", muestras)
+
+if __name__ == "__main__":
+    main()
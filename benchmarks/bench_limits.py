@@ -0,0 +1,86 @@
+"""
+Benchmark de los límites de conexiones abiertas (gt06_admission.ConnectionLimiter).
+
+Lanza GT06_TRACKER.PY con --max-connections y --max-connections-per-ip bajos
+y simula una tormenta de reconexiones: N equipos que se conectan a la vez y
+no cierran. Cuenta cuántas conexiones quedan abiertas y cuántas cierra el
+servidor en seguida, y cuánto tarda en cerrar cada una de las que sobran.
+También mide acquire() + release() sin red.
+
+Uso:
+    python benchmarks/bench_limits.py [-n 600] [--max 400] [--max-ip 300]
+"""
+
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import build_login, detener_servidor, lanzar_servidor, puerto_libre
+from gt06_admission import ConnectionLimiter
+
+def tormenta(port, n, ips):
+    """n conexiones repartidas entre las IPs de 127.0.0.0/8; devuelve (abiertas, cerradas, ms por cierre)"""
+    conns = []
+    cerradas = 0
+    t_cierre = 0.0
+    try:
+        for i in range(n):
+            s = socket.socket()
+            s.bind((ips[i % len(ips)], 0))
+            inicio = time.perf_counter()
+            s.connect(('127.0.0.1', port))
+            s.settimeout(1)
+            s.sendall(build_login(f"{i:015d}"))
+            try:
+                cerrada = s.recv(100) == b''
+            except socket.timeout:
+                cerrada = False
+            except ConnectionResetError:   # abort() de asyncio manda RST
+                cerrada = True
+            if cerrada:
+                cerradas += 1
+                t_cierre += time.perf_counter() - inicio
+                s.close()
+            else:
+                conns.append(s)
+        return len(conns), cerradas, t_cierre / max(cerradas, 1) * 1e3
+    finally:
+        for s in conns:
+            s.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=600, help="conexiones de la tormenta")
+    parser.add_argument('--max', type=int, default=400, help="--max-connections del servidor")
+    parser.add_argument('--max-ip', type=int, default=300, help="--max-connections-per-ip del servidor")
+    parser.add_argument('--engines', default='selectors,asyncio')
+    args = parser.parse_args()
+
+    limiter = ConnectionLimiter(10000, 1000)
+    n = 200000
+    t = timeit.timeit(lambda: limiter.release(limiter.acquire('10.0.0.1') and '10.0.0.1'), number=n) / n
+    print(f"acquire() + release(): {t * 1e9:.0f} ns")
+
+    for engine in args.engines.split(','):
+        port = puerto_libre()
+        with tempfile.TemporaryDirectory() as cwd:
+            proc = lanzar_servidor(['--engine', engine, '--conn-rate-per-ip', '0',
+                                    '--max-connections', str(args.max),
+                                    '--max-connections-per-ip', str(args.max_ip)], cwd, port)
+            try:
+                # Una IP (todas detrás del mismo NAT) y luego varias
+                for ips in (['127.0.0.1'], ['127.0.0.1', '127.0.0.2', '127.0.0.3']):
+                    time.sleep(0.5)   # que el servidor cierre las de la vuelta anterior
+                    abiertas, cerradas, ms = tormenta(port, args.n, ips)
+                    print(f"{engine:9s} {args.n} conexiones desde {len(ips)} IP: {abiertas} abiertas, "
+                          f"{cerradas} cerradas por el servidor ({ms:.2f} ms cada una)")
+            finally:
+                detener_servidor(proc)
+
+if __name__ == "__main__":
+    main()
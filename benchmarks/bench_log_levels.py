@@ -0,0 +1,79 @@
+"""
+Benchmark de los niveles de log: costo por paquete de process_stream() con el
+log en DEBUG frente a INFO.
+
+Reproduce una captura sintética en modo directo (posiciones y heartbeats)
+sobre process_stream() con una conexión falsa (sendall no hace nada) y el log
+real de GT06_TRACKER (BufferedLogWriter a un archivo temporal, sin eco a
+consola). En INFO los volcados hex [DEBUG] no se formatean.
+
+Uso:
+    python benchmarks/bench_log_levels.py [-n 20000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import comun
+import gt06_logger
+from gt06_logger import BufferedLogWriter
+
+class ConexionFalsa:
+    def sendall(self, data):
+        pass
+
+    def getpeername(self):
+        return ('127.0.0.1', 0)
+
+def captura(n):
+    frames = []
+    for i in range(n):
+        serial = (i + 1) & 0xFFFF
+        if i % 10 == 9:
+            frames.append(comun.build_heartbeat(serial))
+        else:
+            frames.append(comun.build_position(-34.6 - i * 1e-5, -58.4 + i * 1e-5, serial=serial))
+    return frames
+
+def medir(tracker, frames, nivel):
+    gt06_logger.set_level(nivel)
+    conn = ConexionFalsa()
+    conn_data = tracker.new_connection_data(conn)
+    conn_data.first_packet = False
+    conn_data.transmission_mode = 'direct'
+    inicio = time.perf_counter()
+    for frame in frames:
+        tracker.process_stream(frame, conn, conn_data)
+    t = time.perf_counter() - inicio
+    tracker.LOGGER.flush(30)
+    return t
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=20000)
+    args = parser.parse_args()
+
+    frames = captura(args.n)
+    tracker = comun.cargar_tracker(silenciar_log=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resultados = {}
+        for nivel in ('DEBUG', 'INFO', 'DEBUG', 'INFO'):
+            tracker.LOGGER = BufferedLogWriter(os.path.join(tmp, f'{nivel}.txt'), echo=False, max_queue=10 ** 7)
+            t = medir(tracker, frames, nivel)
+            lineas = tracker.LOGGER.written
+            tracker.LOGGER.close()
+            resultados[nivel] = (min(t, resultados.get(nivel, (t,))[0]), lineas)
+
+    print(f"{len(frames)} tramas (posiciones 0x12 y heartbeats 0x23, modo directo)")
+    for nivel, (t, lineas) in resultados.items():
+        print(f"  {nivel:6} {t / len(frames) * 1e6:7.2f} µs/paquete  {lineas / len(frames):5.1f} líneas/paquete")
+    debug, info = resultados['DEBUG'][0], resultados['INFO'][0]
+    print(f"  CPU ahorrada en INFO: {(1 - info / debug) * 100:.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark de log(): abrir-escribir-cerrar por línea (original) frente a
+gt06_logger.BufferedLogWriter.
+
+Mide el costo por línea para el que llama (el hilo de red) con la consola
+redirigida a /dev/null, y la latencia del que llama con un disco lento
+simulado (cada escritura tarda 50 ms).
+
+Uso:
+    python benchmarks/bench_logger.py [-n 20000]
+"""
+
+import argparse
+import contextlib
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import comun  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+from gt06_logger import BufferedLogWriter
+
+def log_original(path):
+    def log(message):
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        line = f"{timestamp} {message}"
+        with open(path, "a") as f:
+            f.write(f"{line}\n")
+        print(line)
+    return log
+
+class DiscoLento(BufferedLogWriter):
+    def _write_batch(self, text):
+        time.sleep(0.05)
+        super()._write_batch(text)
+
+MENSAJE = "[DEBUG] Packet data: 1f120b081d112e10cc027ac7eb0c46584900148f01cc00287d001fb80003"
+
+def medir(log, n):
+    inicio = time.perf_counter()
+    for _ in range(n):
+        log(MENSAJE)
+    return time.perf_counter() - inicio
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        resultados = []
+        resultados.append(("original (open/append/close + print)",
+                           medir(log_original(os.path.join(tmp, 'a.txt')), args.n)))
+
+        writer = BufferedLogWriter(os.path.join(tmp, 'b.txt'))
+        t = medir(writer.log, args.n)
+        inicio = time.perf_counter()
+        writer.flush(30)
+        resultados.append(("BufferedLogWriter (encolar)", t))
+        resultados.append(("BufferedLogWriter (+ flush final)", t + time.perf_counter() - inicio))
+        writer.close()
+
+        lento = DiscoLento(os.path.join(tmp, 'c.txt'), echo=False)
+        resultados.append(("BufferedLogWriter, disco lento", medir(lento.log, args.n)))
+        lento.close()
+
+    print(f"{args.n:,} líneas:")
+    for nombre, elapsed in resultados:
+        print(f"  {nombre:38s} {elapsed / args.n * 1e6:8.2f} µs/línea")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark de la cola de salida (gt06_outbound.OutboundQueue): responder a una
+ráfaga de R tramas con un send() por ACK (como hacía sendall() en línea)
+frente a encolar los R ACKs y enviarlos con un solo sendmsg().
+
+Usa una conexión TCP por 127.0.0.1 no bloqueante; el otro extremo se vacía
+entre ráfagas.
+
+Uso:
+    python benchmarks/bench_outbound.py [-n 20000] [--rafaga 20]
+"""
+
+import argparse
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import comun  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+from gt06_crc import ack_packet
+from gt06_outbound import OutboundQueue
+
+def vaciar(sock):
+    try:
+        while sock.recv(1 << 20):
+            pass
+    except BlockingIOError:
+        pass
+
+def send_por_ack(a, b, acks, n):
+    inicio = time.perf_counter()
+    for _ in range(n):
+        for ack in acks:
+            a.send(ack)
+        vaciar(b)
+    return time.perf_counter() - inicio
+
+def cola(a, b, acks, n):
+    queue = OutboundQueue()
+    inicio = time.perf_counter()
+    for _ in range(n):
+        for ack in acks:
+            queue.push(ack)
+        queue.send(a)
+        vaciar(b)
+    return time.perf_counter() - inicio
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=20000, help="ráfagas")
+    parser.add_argument('--rafaga', type=int, default=20, help="tramas por ráfaga")
+    args = parser.parse_args()
+
+    acks = [ack_packet(serial, 'itu_be') for serial in range(1, args.rafaga + 1)]
+    with socket.create_server(('127.0.0.1', 0)) as server:
+        a = socket.create_connection(server.getsockname())
+        b, _ = server.accept()
+    a.setblocking(False)
+    b.setblocking(False)
+    print(f"{args.n} ráfagas de {args.rafaga} ACKs")
+    resultados = {}
+    for nombre, funcion in (("send() por ACK", send_por_ack), ("OutboundQueue + sendmsg()", cola)) * 2:
+        t = funcion(a, b, acks, args.n)
+        resultados[nombre] = min(t, resultados.get(nombre, t))
+    for nombre, t in resultados.items():
+        print(f"  {nombre:26s} {t / args.n * 1e6:7.1f} µs/ráfaga  {t / (args.n * args.rafaga) * 1e6:5.2f} µs/ACK")
+
+if __name__ == "__main__":
+    main()
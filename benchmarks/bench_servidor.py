@@ -0,0 +1,103 @@
+"""
+Benchmark de motores de red de GT06_TRACKER.PY: bucle bloqueante original, asyncio
+y el reactor selectors.
+
+1. Concurrencia: N equipos conectados a la vez envían una posición directa y
+   esperan el ACK; se cuenta cuántos reciben respuesta antes del timeout.
+2. Throughput: C equipos envían K posiciones cada uno (esperando cada ACK)
+   y se mide paquetes/s totales.
+
+Todas las conexiones salen de 127.0.0.1: el servidor se lanza con
+--conn-rate-per-ip 0 (sin límite de conexiones nuevas por IP).
+
+Uso:
+    python benchmarks/bench_servidor.py [--conexiones 2000] [--clientes 200] [--paquetes 20]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import build_position, detener_servidor, lanzar_servidor, puerto_libre
+
+ACK_LEN = 10
+
+async def _abrir(port, timeout=None):
+    return await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), timeout)
+
+async def prueba_concurrencia(port, conexiones, timeout):
+    """
+    Todas las conexiones quedan abiertas durante la prueba; una conexión que no
+    llega a establecerse (cola de escucha llena) cuenta como no atendida.
+    """
+    frame = build_position(-34.61, -58.40, serial=1)
+
+    async def conectar():
+        try:
+            return await _abrir(port, timeout)
+        except (asyncio.TimeoutError, OSError):
+            return None
+
+    async def consultar(reader, writer):
+        writer.write(frame)
+        try:
+            await asyncio.wait_for(reader.readexactly(ACK_LEN), timeout)
+            return True
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            return False
+
+    inicio = time.perf_counter()
+    streams = [s for s in await asyncio.gather(*[conectar() for _ in range(conexiones)]) if s]
+    atendidos = sum(await asyncio.gather(*[consultar(r, w) for r, w in streams]))
+    elapsed = time.perf_counter() - inicio
+    for _, writer in streams:
+        writer.close()
+    return atendidos, elapsed
+
+async def prueba_throughput(port, clientes, paquetes):
+    frames = [build_position(-34.61, -58.40, serial=i + 1) for i in range(paquetes)]
+
+    async def cliente():
+        reader, writer = await _abrir(port)
+        for frame in frames:
+            writer.write(frame)
+            await reader.readexactly(ACK_LEN)
+        writer.close()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*[cliente() for _ in range(clientes)])
+    elapsed = time.perf_counter() - inicio
+    return clientes * paquetes / elapsed, elapsed
+
+def medir_motor(engine, args):
+    port = puerto_libre()
+    with tempfile.TemporaryDirectory() as cwd:
+        proc = lanzar_servidor(['--engine', engine, '--conn-rate-per-ip', '0'] + args.extra, cwd, port)
+        try:
+            atendidos, t_conc = asyncio.run(prueba_concurrencia(port, args.conexiones, args.timeout))
+            time.sleep(0.5)
+            pps, t_thr = asyncio.run(prueba_throughput(port, args.clientes, args.paquetes))
+        finally:
+            detener_servidor(proc)
+    print(f"{engine:10s} concurrentes atendidas: {atendidos}/{args.conexiones} ({t_conc:.2f}s)   "
+          f"throughput: {pps:,.0f} paquetes/s ({args.clientes}x{args.paquetes} en {t_thr:.2f}s)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--conexiones', type=int, default=2000)
+    parser.add_argument('--clientes', type=int, default=200)
+    parser.add_argument('--paquetes', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=3.0)
+    parser.add_argument('--engines', default='blocking,asyncio,selectors')
+    parser.add_argument('extra', nargs='*', help="Argumentos extra para GT06_TRACKER.PY (tras --)")
+    args = parser.parse_args()
+
+    for engine in args.engines.split(','):
+        medir_motor(engine, args)
+
+if __name__ == "__main__":
+    main()
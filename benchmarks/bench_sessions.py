@@ -0,0 +1,107 @@
+"""
+Benchmark de las sesiones: memoria por 100.000 equipos del dict libre que
+guardaba GT06_TRACKER en connection_data[conn] frente a gt06_session.Session
+(__slots__) con sus índices por conexión y por IMEI, costo de las búsquedas y
+de una reconexión, y de evict_idle() cuando vence una parte de la flota.
+
+Uso:
+    python benchmarks/bench_sessions.py [-n 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import comun  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+from gt06_framer import GT06Framer
+from gt06_session import SessionRegistry
+
+class ConexionFalsa:
+    pass
+
+def dict_anterior():
+    # El dict que armaba new_connection_data() antes de gt06_session
+    return {
+        'login_serial': None,
+        'login_ack_type': None,
+        'login_completed': False,
+        'retry_sent': False,
+        'ack_success': False,
+        'ack_attempts': 0,
+        'current_ack_type': None,
+        'connection_closed': False,
+        'retry_thread': None,
+        'transmission_mode': None,
+        'first_packet': True,
+        'framer': GT06Framer(),
+    }
+
+def memoria(funcion):
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    resultado = funcion()
+    usada = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    return usada, resultado
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=100000)
+    args = parser.parse_args()
+    n = args.n
+    conns = [ConexionFalsa() for _ in range(n)]
+    imeis = [f"0359510{i:09d}" for i in range(n)]
+
+    def con_dicts():
+        return {conn: dict_anterior() for conn in conns}
+
+    def con_sesiones():
+        registry = SessionRegistry()
+        for conn, imei in zip(conns, imeis):
+            registry.bind_imei(registry.open(conn), imei)
+        return registry
+
+    print(f"{n:,} equipos conectados")
+    usada, _ = memoria(con_dicts)
+    print(f"  dict por conexión:            {usada / 2 ** 20:6.1f} MB  ({usada / n:5.0f} bytes/equipo)")
+    usada, registry = memoria(con_sesiones)
+    print(f"  Session + índices conn/IMEI:  {usada / 2 ** 20:6.1f} MB  ({usada / n:5.0f} bytes/equipo)")
+
+    inicio = time.perf_counter()
+    for imei in imeis:
+        registry.find(imei)
+    t = time.perf_counter() - inicio
+    print(f"  find(imei):     {t / n * 1e9:6.0f} ns")
+
+    sessions = [registry.get(conn) for conn in conns]
+    inicio = time.perf_counter()
+    for session in sessions:
+        registry.touch(session)
+    t = time.perf_counter() - inicio
+    print(f"  touch():        {t / n * 1e9:6.0f} ns")
+
+    # Reconexión de toda la flota: sesión nueva que hereda el tipo de ACK
+    for session in sessions:
+        session.login_ack_type = 'itu_be'
+    inicio = time.perf_counter()
+    for conn, imei in zip(conns, imeis):
+        registry.close(conn)
+        session = registry.open(conn)
+        registry.bind_imei(session, imei)
+    t = time.perf_counter() - inicio
+    assert registry.find(imeis[0]).login_ack_type == 'itu_be'
+    print(f"  reconexión (close + open + bind_imei): {t / n * 1e6:5.1f} µs")
+
+    # Vence el 10% más antiguo
+    vencidas = n // 10
+    limite = registry.find(imeis[vencidas - 1]).last_seen
+    inicio = time.perf_counter()
+    evicted = registry.evict_idle(now=limite + registry.idle_ttl)
+    t = time.perf_counter() - inicio
+    print(f"  evict_idle():   {evicted:,} vencidas de {n:,} en {t * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
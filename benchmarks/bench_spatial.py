@@ -0,0 +1,123 @@
+"""
+Benchmark del índice espacial de últimas posiciones (gt06_spatial.GridIndex).
+
+Con 100.000 equipos compara GridIndex con recorrer todas las posiciones en
+consultas por radio (500 m), rectángulo (~1 km²) y k vecinos más cercanos
+(k = 10), en dos flotas:
+- AMBA: equipos repartidos en ~60 x 60 km, la mitad concentrados en
+  algunos barrios;
+- emulaGPS: todos dentro del rectángulo de generar_coordenadas_buenos_aires
+  (~1,8 x 5,9 km), el caso más denso posible.
+Además mide update() con equipos que se mueven.
+
+Uso:
+    python benchmarks/bench_spatial.py [--equipos 100000] [--consultas 300] [--celda 0.0025]
+"""
+
+import argparse
+import heapq
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import comun  # noqa: F401  (agrega la raíz del repo a sys.path)
+from gt06_spatial import DEFAULT_CELL_SIZE, METERS_PER_RAW, RAW_PER_DEGREE, GridIndex
+
+def flota_amba(rnd, n):
+    barrios = [(rnd.uniform(-34.8, -34.5), rnd.uniform(-58.7, -58.35)) for _ in range(20)]
+    for _ in range(n):
+        if rnd.random() < 0.5:
+            lat, lon = rnd.choice(barrios)
+            yield lat + rnd.gauss(0, 0.01), lon + rnd.gauss(0, 0.01)
+        else:
+            yield rnd.uniform(-34.9, -34.35), rnd.uniform(-58.85, -58.2)
+
+def flota_emulagps(rnd, n):
+    # Mismo rectángulo que emulaGPS.generar_coordenadas_buenos_aires
+    for _ in range(n):
+        yield rnd.uniform(-34.6200, -34.6037), rnd.uniform(-58.4455, -58.3816)
+
+class Lineal:
+    """Recorrer todas las posiciones: lo que había antes del índice"""
+
+    def __init__(self, positions):
+        self.positions = positions
+
+    def radius(self, lat, lon, meters):
+        lat0, lon0 = lat * RAW_PER_DEGREE, lon * RAW_PER_DEGREE
+        scale = math.cos(math.radians(lat))
+        limit = (meters / METERS_PER_RAW) ** 2
+        return [imei for imei, (la, lo) in self.positions.items()
+                if (la - lat0) ** 2 + ((lo - lon0) * scale) ** 2 <= limit]
+
+    def bbox(self, south, west, north, east):
+        s, w, n, e = (v * RAW_PER_DEGREE for v in (south, west, north, east))
+        return [imei for imei, (la, lo) in self.positions.items() if s <= la <= n and w <= lo <= e]
+
+    def nearest(self, lat, lon, k):
+        lat0, lon0 = lat * RAW_PER_DEGREE, lon * RAW_PER_DEGREE
+        scale = math.cos(math.radians(lat))
+        return heapq.nsmallest(k, (((la - lat0) ** 2 + ((lo - lon0) * scale) ** 2, imei)
+                                   for imei, (la, lo) in self.positions.items()))
+
+def medir(funcion, consultas):
+    tiempos = []
+    encontrados = 0
+    for args in consultas:
+        inicio = time.perf_counter()
+        encontrados += len(funcion(*args))
+        tiempos.append(time.perf_counter() - inicio)
+    tiempos.sort()
+    return tiempos[len(tiempos) // 2] * 1e3, tiempos[int(len(tiempos) * 0.99)] * 1e3, encontrados / len(consultas)
+
+def probar(nombre, puntos, rnd, n_consultas, celda):
+    grid = GridIndex(celda)
+    positions = {}
+    for i, (lat, lon) in enumerate(puntos):
+        imei = f"0869412{i:09d}"
+        lat_raw, lon_raw = round(lat * RAW_PER_DEGREE), round(lon * RAW_PER_DEGREE)
+        positions[imei] = (lat_raw, lon_raw)
+        grid.update(imei, lat_raw, lon_raw)
+    lineal = Lineal(positions)
+    imeis = list(positions)
+
+    centros = [positions[rnd.choice(imeis)] for _ in range(n_consultas)]
+    centros = [(lat / RAW_PER_DEGREE, lon / RAW_PER_DEGREE) for lat, lon in centros]
+    pruebas = (
+        ("radio 500 m", 'radius', [(lat, lon, 500) for lat, lon in centros]),
+        ("rectángulo ~1 km²", 'bbox', [(lat - 0.0045, lon - 0.0055, lat + 0.0045, lon + 0.0055)
+                                       for lat, lon in centros]),
+        ("10 más cercanos", 'nearest', [(lat, lon, 10) for lat, lon in centros]),
+    )
+    print(f"Flota {nombre}: {len(positions):,} equipos, celdas de {celda}°, {len(grid.cells):,} pobladas")
+    for titulo, metodo, consultas in pruebas:
+        g50, g99, resultados = medir(getattr(grid, metodo), consultas)
+        l50, _, _ = medir(getattr(lineal, metodo), consultas[:max(10, n_consultas // 10)])
+        print(f"  {titulo:18s} GridIndex p50 {g50:7.3f} ms  p99 {g99:7.3f} ms | lineal p50 {l50:7.1f} ms "
+              f"| {resultados:,.0f} resultados")
+
+    # Equipos en movimiento: ~100 m por actualización, a veces cambian de celda
+    movimientos = [(rnd.choice(imeis), rnd.randint(-1800, 1800), rnd.randint(-1800, 1800)) for _ in range(100000)]
+    inicio = time.perf_counter()
+    for imei, d_lat, d_lon in movimientos:
+        lat_raw, lon_raw = positions[imei]
+        grid.update(imei, lat_raw + d_lat, lon_raw + d_lon)
+    elapsed = time.perf_counter() - inicio
+    print(f"  update() con movimiento: {elapsed / len(movimientos) * 1e6:.2f} µs")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--equipos', type=int, default=100000)
+    parser.add_argument('--consultas', type=int, default=300)
+    parser.add_argument('--celda', type=float, default=DEFAULT_CELL_SIZE, help='lado de la celda en grados')
+    args = parser.parse_args()
+
+    rnd = random.Random(1)
+    probar("AMBA", list(flota_amba(rnd, args.equipos)), rnd, args.consultas, args.celda)
+    probar("emulaGPS", list(flota_emulagps(rnd, args.equipos)), rnd, args.consultas, args.celda)
+
+if __name__ == "__main__":
+    main()
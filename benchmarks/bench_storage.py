@@ -0,0 +1,104 @@
+"""
+Benchmark del almacenamiento de posiciones en SQLite (gt06_storage).
+
+Simula una flota de 10.000 equipos reportando en ronda. Mide:
+- un INSERT con commit por fila (lo que haría un handler que escribe la
+  base directamente), sobre unas pocas miles de filas;
+- PositionStore con distintos tamaños de lote (group commit): filas/s
+  sostenidas hasta que todo queda confirmado y costo de add() para el que
+  llama;
+- el camino completo: parse_position() del tracker con --db, decodificando
+  tramas 0x12 reales de los 10.000 equipos.
+
+Uso:
+    python benchmarks/bench_storage.py [--equipos 10000] [-n 200000]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import build_position, cargar_tracker
+from gt06_session import Session
+from gt06_storage import INSERT, PositionStore, connect
+
+def filas(equipos, n):
+    """n posiciones de la flota: cada equipo reporta una vez por ronda"""
+    base = int(time.time())
+    rows = []
+    for i in range(n):
+        device = i % equipos
+        rows.append((f"0869412{device:09d}", base + i // equipos * 10, time.time(),
+                     -62280000 - device * 7, -105120000 - i, 40, 90, 9, i & 0xFFFF, 0x12))
+    return rows
+
+def commit_por_fila(path, rows):
+    db = connect(path)
+    inicio = time.perf_counter()
+    for row in rows:
+        db.execute(INSERT, row)   # autocommit: una transacción por fila
+    elapsed = time.perf_counter() - inicio
+    db.close()
+    return len(rows) / elapsed
+
+def con_store(path, rows, batch_size):
+    store = PositionStore(path, batch_size=batch_size)
+    inicio = time.perf_counter()
+    for row in rows:
+        store.add(row)
+    encolado = time.perf_counter() - inicio
+    store.flush(timeout=600)
+    elapsed = time.perf_counter() - inicio
+    store.close()
+    assert store.written == len(rows) and not store.dropped, (store.written, store.dropped)
+    return len(rows) / elapsed, encolado / len(rows), store.commits
+
+def camino_completo(path, equipos, n):
+    tracker = cargar_tracker()
+    tracker.STORE = store = PositionStore(path)
+    sesiones = []
+    tramas = []
+    for device in range(equipos):
+        session = Session(None)
+        session.imei = f"0869412{device:09d}"
+        sesiones.append(session)
+        tramas.append(build_position(-34.6 - device / 1e5, -58.4 - device / 1e5, serial=device & 0xFFFF))
+    inicio = time.perf_counter()
+    for i in range(n):
+        device = i % equipos
+        tracker.parse_position(tramas[device], sesiones[device])
+    store.flush(timeout=600)
+    elapsed = time.perf_counter() - inicio
+    store.close()
+    tracker.STORE = None
+    assert store.written == n, (store.written, n)
+    return n / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--equipos', type=int, default=10000)
+    parser.add_argument('-n', type=int, default=200000, help="posiciones por prueba")
+    parser.add_argument('--por-fila', type=int, default=3000, help="filas de la prueba de commit por fila")
+    args = parser.parse_args()
+
+    rows = filas(args.equipos, args.n)
+    print(f"Flota de {args.equipos:,} equipos, {args.n:,} posiciones por prueba (SQLite {sqlite3.sqlite_version}, WAL)")
+    with tempfile.TemporaryDirectory() as tmp:
+        rate = commit_por_fila(os.path.join(tmp, 'fila.db'), rows[:args.por_fila])
+        print(f"  commit por fila            {rate:10,.0f} filas/s")
+        for batch_size in (100, 1000, 10000):
+            path = os.path.join(tmp, f'lote{batch_size}.db')
+            rate, add, commits = con_store(path, rows, batch_size)
+            print(f"  PositionStore lote {batch_size:<6,d}  {rate:10,.0f} filas/s  "
+                  f"add(): {add * 1e9:4.0f} ns  {commits:,} commits")
+        size = os.path.getsize(path)
+        print(f"  tamaño: {size / args.n:.0f} bytes por fila (tabla + índice imei/fecha)")
+        rate = camino_completo(os.path.join(tmp, 'tracker.db'), args.equipos, args.n)
+        print(f"  parse_position() + --db    {rate:10,.0f} posiciones/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark de temporizadores: un hilo con time.sleep() por temporizador (como
+auto_retry_ack y delayed_position_request) frente a gt06_timers.TimerWheel.
+
+Simula N equipos que reconectan a la vez, con dos temporizadores por login
+(reintento de ACK a 2 s y pedido de posición a 5 s). Mide el costo de
+programarlos, la memoria residente y los hilos vivos, el costo de cancelarlos
+(conexiones que se cierran) y el retraso con el que vencen. Al final mide
+cuánto cuesta cada tick de la rueda con muchos temporizadores largos (el
+'idle' de 5 a 15 minutos de cada conexión) esperando vueltas siguientes.
+
+Uso:
+    python benchmarks/bench_timers.py [-n 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import comun  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+from gt06_timers import TimerWheel
+
+def rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+def con_hilos(n):
+    retrasos = []
+    base = rss_kb()
+    inicio = time.perf_counter()
+    for _ in range(n):
+        for delay in (2, 5):
+            def dormir(delay=delay, programado=time.monotonic()):
+                time.sleep(delay)
+                retrasos.append(time.monotonic() - programado - delay)
+            threading.Thread(target=dormir, daemon=True).start()
+    programar = time.perf_counter() - inicio
+    memoria = rss_kb() - base
+    hilos = threading.active_count()
+    while len(retrasos) < 2 * n:
+        time.sleep(0.1)
+    return programar, memoria, hilos, None, retrasos
+
+def con_rueda(n):
+    retrasos = []
+    wheel = TimerWheel()
+    base = rss_kb()
+    inicio = time.perf_counter()
+    timers = []
+    for _ in range(n):
+        for delay in (2, 5):
+            def vencer(delay=delay, programado=time.monotonic()):
+                retrasos.append(time.monotonic() - programado - delay)
+            timers.append(wheel.schedule(delay, vencer))
+    programar = time.perf_counter() - inicio
+    memoria = rss_kb() - base
+    hilos = threading.active_count()
+
+    # Cancelar todo y volver a programar: el costo de cerrar n conexiones
+    inicio = time.perf_counter()
+    for timer in timers:
+        wheel.cancel(timer)
+    cancelar = time.perf_counter() - inicio
+    for _ in range(n):
+        for delay in (2, 5):
+            def vencer(delay=delay, programado=time.monotonic()):
+                retrasos.append(time.monotonic() - programado - delay)
+            wheel.schedule(delay, vencer)
+    while len(retrasos) < 2 * n:
+        time.sleep(0.1)
+    wheel.stop()
+    return programar, memoria, hilos, cancelar, retrasos
+
+def ticks_con_largos(n):
+    """µs por tick en una vuelta completa con n temporizadores de 5-15 min (ninguno vence)"""
+    wheel = TimerWheel()
+    rnd = random.Random(1)
+    for _ in range(n):
+        wheel.schedule(rnd.uniform(300, 900), lambda: None)
+    vuelta = len(wheel.slots)
+    inicio = time.perf_counter()
+    for tick in range(wheel._current + 1, wheel._current + 1 + vuelta):
+        wheel._expire(tick)
+    elapsed = time.perf_counter() - inicio
+    wheel.stop()
+    return elapsed / vuelta * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=5000, help="equipos que reconectan a la vez")
+    args = parser.parse_args()
+
+    print(f"{args.n} logins, {2 * args.n} temporizadores")
+    for nombre, funcion in (("TimerWheel", con_rueda), ("hilo por temporizador", con_hilos)):
+        programar, memoria, hilos, cancelar, retrasos = funcion(args.n)
+        retrasos.sort()
+        p50 = retrasos[len(retrasos) // 2] * 1000
+        p99 = retrasos[int(len(retrasos) * 0.99)] * 1000
+        print(f"  {nombre}")
+        print(f"    programar: {programar / (2 * args.n) * 1e6:7.1f} µs/temporizador, "
+              f"hilos vivos: {hilos}, RSS: +{memoria / 1024:.1f} MB")
+        if cancelar is not None:
+            print(f"    cancelar:  {cancelar / (2 * args.n) * 1e6:7.1f} µs/temporizador")
+        print(f"    retraso al vencer: p50 {p50:.0f} ms, p99 {p99:.0f} ms")
+    largos = 20 * args.n
+    print(f"  tick de TimerWheel con {largos:,} temporizadores de 5-15 min esperando: "
+          f"{ticks_con_largos(largos):.2f} µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark del modo multiproceso de GT06_TRACKER.PY (--workers N, SO_REUSEPORT).
+
+Lanza el servidor con 1, 2, 4... workers y lo carga desde P procesos cliente
+(un solo proceso cliente no alcanza para saturar varios workers): cada uno
+abre C conexiones que envían K posiciones directas esperando cada ACK. Mide
+paquetes/s totales. La mejora depende de los núcleos libres: con N workers en
+N núcleos el ingreso crece casi linealmente.
+Todas las conexiones salen de 127.0.0.1, así que se lanza con
+--conn-rate-per-ip 0.
+
+Uso:
+    python benchmarks/bench_workers.py [--workers 1,2,4] [--procesos 4] [--clientes 50] [--paquetes 50]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import build_position, detener_servidor, lanzar_servidor, puerto_libre
+
+ACK_LEN = 10
+
+async def _carga(port, clientes, paquetes):
+    frames = [build_position(-34.61, -58.40, serial=i + 1) for i in range(paquetes)]
+
+    async def cliente():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for frame in frames:
+            writer.write(frame)
+            await reader.readexactly(ACK_LEN)
+        writer.close()
+
+    await asyncio.gather(*[cliente() for _ in range(clientes)])
+
+def proceso_cliente(port, clientes, paquetes):
+    asyncio.run(_carga(port, clientes, paquetes))
+
+def medir(workers, args):
+    port = puerto_libre()
+    with tempfile.TemporaryDirectory() as cwd:
+        proc = lanzar_servidor(['--workers', str(workers), '--log-level', 'WARN', '--conn-rate-per-ip', '0'] + args.extra,
+                               cwd, port)
+        try:
+            time.sleep(1.0)    # que todos los workers estén escuchando
+            procesos = [multiprocessing.Process(target=proceso_cliente, args=(port, args.clientes, args.paquetes))
+                        for _ in range(args.procesos)]
+            inicio = time.perf_counter()
+            for p in procesos:
+                p.start()
+            for p in procesos:
+                p.join()
+            elapsed = time.perf_counter() - inicio
+        finally:
+            detener_servidor(proc)
+    total = args.procesos * args.clientes * args.paquetes
+    return total / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', default='1,2,4')
+    parser.add_argument('--procesos', type=int, default=4)
+    parser.add_argument('--clientes', type=int, default=50)
+    parser.add_argument('--paquetes', type=int, default=50)
+    parser.add_argument('extra', nargs='*', help="Argumentos extra para GT06_TRACKER.PY (tras --)")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} núcleos, {args.procesos} procesos x {args.clientes} equipos x {args.paquetes} posiciones")
+    base = None
+    for workers in [int(w) for w in args.workers.split(',')]:
+        pps = medir(workers, args)
+        base = base or pps
+        print(f"  {workers:2d} workers: {pps:9,.0f} paquetes/s  (x{pps / base:.1f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Utilidades compartidas por los benchmarks del servidor GT06.
+
+GT06_TRACKER.PY tiene extensión en mayúsculas, así que en Linux no se puede
+importar con un import normal: se carga explícitamente desde su ruta.
+"""
+
+import importlib.machinery
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRACKER_PATH = os.path.join(REPO_DIR, 'GT06_TRACKER.PY')
+
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+_tracker = None
+
+def cargar_tracker(silenciar_log=True):
+    """
+    Carga GT06_TRACKER.PY como módulo 'GT06_TRACKER'
+    """
+    global _tracker
+    if _tracker is None:
+        loader = importlib.machinery.SourceFileLoader('GT06_TRACKER', TRACKER_PATH)
+        spec = importlib.util.spec_from_loader('GT06_TRACKER', loader)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['GT06_TRACKER'] = module
+        loader.exec_module(module)
+        _tracker = module
+        _tracker.log_original = module.log
+    _tracker.log = (lambda message: None) if silenciar_log else _tracker.log_original
+    return _tracker
+
+def build_frame(protocol, content, serial):
+    """
+    Arma una trama 7878 según el manual: length + protocolo + contenido + serial + CRC + 0D0A
+    """
+    tracker = cargar_tracker()
+    body = bytes([1 + len(content) + 2 + 2, protocol]) + content + serial.to_bytes(2, 'big')
+    crc = tracker.crc16_itu_factory(body)
+    return b'\x78\x78' + body + crc.to_bytes(2, 'big') + b'\x0D\x0A'
+
+def build_frame_7979(protocol, content, serial):
+    """
+    Trama 7979 (contenidos largos): como build_frame con length de 2 bytes
+    """
+    tracker = cargar_tracker()
+    body = (1 + len(content) + 2 + 2).to_bytes(2, 'big') + bytes([protocol]) + content + serial.to_bytes(2, 'big')
+    crc = tracker.crc16_itu_factory(body)
+    return b'\x79\x79' + body + crc.to_bytes(2, 'big') + b'\x0D\x0A'
+
+def build_information(size, serial=1, info_type=0x00):
+    """Transmisión de información (0x94) con size bytes de contenido"""
+    return build_frame_7979(0x94, bytes([info_type]) + bytes(i & 0xFF for i in range(size)), serial)
+
+def build_login(imei, serial=1):
+    return build_frame(0x01, bytes.fromhex(imei.rjust(16, '0')), serial)
+
+def build_position(lat, lon, speed=40, course=90, serial=1, date=(25, 8, 19, 12, 0, 0)):
+    """
+    Trama 0x12 con el bit 31 como signo de lat/lon (convención de parse_position)
+    """
+    lat_val = int(abs(lat) * 1800000) | (0x80000000 if lat < 0 else 0)
+    lon_val = int(abs(lon) * 1800000) | (0x80000000 if lon < 0 else 0)
+    content = (bytes(date) + b'\xCC' + lat_val.to_bytes(4, 'big') + lon_val.to_bytes(4, 'big') +
+               bytes([speed]) + course.to_bytes(2, 'big') +
+               b'\x02\xCA\x07\x00\x01\x00\x00\x01')  # MCC 722, MNC 7, LAC, Cell ID
+    return build_frame(0x12, content, serial)
+
+def build_heartbeat(serial=1):
+    return build_frame(0x23, b'\x44\x04\x03\x00\x02', serial)
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def lanzar_servidor(args, cwd, port, timeout=10.0):
+    """
+    Lanza GT06_TRACKER.PY en un subproceso y espera a que acepte conexiones
+    """
+    proc = subprocess.Popen([sys.executable, TRACKER_PATH, '--host', '127.0.0.1', '--port', str(port)] + list(args),
+                            cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError(f"El servidor no arrancó en el puerto {port}")
+
+def detener_servidor(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
@@ -17,10 +17,12 @@ El script:
 """
 
 import socket
-import datetime
 import time
 import threading
 
+from gt06_crc import crc_variant, packet_crc
+from gt06_logger import DEBUG, get_logger, is_enabled
+
 # Configuración del servidor
 HOST = '200.58.98.187'
 PORT = 5003  # Puerto diferente al servidor principal
@@ -82,13 +84,11 @@ def crc16_itu_factory_bytes_be(data):
     crc = crc16_itu_factory(data)
     return bytes([(crc >> 8) & 0xFF, crc & 0xFF])
 
+LOGGER = get_logger(LOG_FILE)
+
 def log(message):
-    """Función de logging con timestamp"""
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"{timestamp} {message}"
-    with open(LOG_FILE, "a", encoding='utf-8') as f:
-        f.write(f"{line}\n")
-    print(line)
+    """Función de logging con timestamp (escritura en segundo plano)"""
+    LOGGER.log(message)
 
 def log_sent(data):
     """Log de datos enviados"""
@@ -97,23 +97,21 @@ def log_sent(data):
 def validate_packet_crc(data):
     """Valida el CRC16 de un paquete recibido"""
     if len(data) < 6:
-        return False
-    
-    packet_data = data[2:-4]  # Sin 7878 y sin CRC16 + 0D0A
-    received_crc = data[-4:-2]  # CRC recibido
+        return None
     
-    expected_crc_itu_le = crc16_itu_factory_bytes(packet_data)
-    expected_crc_itu_be = crc16_itu_factory_bytes_be(packet_data)
+    crc = packet_crc(data)  # Sin 7878 y sin CRC16 + 0D0A, una sola pasada
+    variant = crc_variant(data, crc)
     
-    log(f"[DEBUG] Packet data: {packet_data.hex()}")
-    log(f"[DEBUG] Received CRC: {received_crc.hex()}")
-    log(f"[DEBUG] Expected CRC (ITU LE): {expected_crc_itu_le.hex()}")
-    log(f"[DEBUG] Expected CRC (ITU BE): {expected_crc_itu_be.hex()}")
+    if is_enabled(DEBUG):
+        log(f"[DEBUG] Packet data: {data[2:-4].hex()}")
+        log(f"[DEBUG] Received CRC: {data[-4:-2].hex()}")
+        log(f"[DEBUG] Expected CRC (ITU LE): {crc.to_bytes(2, 'little').hex()}")
+        log(f"[DEBUG] Expected CRC (ITU BE): {crc.to_bytes(2, 'big').hex()}")
     
-    if received_crc == expected_crc_itu_le:
+    if variant == 'itu_le':
         log("[DEBUG] CRC coincide con algoritmo CRC-ITU del fabricante (LE)")
         return 'itu_le'
-    elif received_crc == expected_crc_itu_be:
+    elif variant == 'itu_be':
         log("[DEBUG] CRC coincide con algoritmo CRC-ITU del fabricante (BE)")
         return 'itu_be'
     else:
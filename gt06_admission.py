@@ -0,0 +1,153 @@
+"""
+Admisión de conexiones para los servidores GT06.
+
+Al puerto 5003 llegan scanners de internet (TLS ClientHello 160301..., HTTP,
+SSH) que antes se registraban y quedaban abiertos hasta que el otro extremo
+cerraba. classify() decide con los primeros bytes de la conexión si es GT06
+(7878 o 7979): todo lo demás se cierra en seguida y solo se cuenta.
+
+RateLimiter limita las conexiones nuevas por IP de origen (GCRA, equivalente a
+un token bucket de rate conexiones/s con ráfagas de burst): por IP se guarda
+un solo float, el momento en que su balde vuelve a estar lleno. La tabla se
+limpia cuando llega a max_entries (solo se quitan las IPs con el balde lleno,
+que equivalen a no estar); si aun así está llena, las IPs nuevas pasan sin
+registrarse (nunca se rechaza a un equipo por falta de lugar en la tabla).
+
+ConnectionLimiter acota las conexiones abiertas, en total y por IP, para que
+una tormenta de reconexiones no agote los descriptores de archivo. acquire()
+se consulta apenas aceptada la conexión: si se rechaza, se cierra el socket
+sin crear sesión, buffers ni líneas de log.
+"""
+
+import time
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+HTTP_METHODS = (b'GET ', b'POST', b'HEAD', b'PUT ', b'OPTI', b'DELE', b'CONN', b'PATC', b'PRI ')
+
+DEFAULT_MAX_ENTRIES = 65536
+FD_RESERVE = 64       # descriptores para logs, sockets de escucha, pipes...
+
+
+def classify(data):
+    """
+    Tipo de tráfico según los primeros bytes de la conexión: 'gt06' (7878 o
+    7979), 'tls', 'http', 'ssh' u 'other'; None si un solo byte no alcanza
+    """
+    if not data:
+        return None
+    first = data[0]
+    if first == 0x78 or first == 0x79:
+        if len(data) < 2:
+            return None
+        if data[1] == first:
+            return 'gt06'
+        return 'other'
+    if first == 0x16:
+        return 'tls'
+    head = bytes(data[:4])
+    if head.startswith(HTTP_METHODS):
+        return 'http'
+    if head == b'SSH-':
+        return 'ssh'
+    return 'other'
+
+
+class RateLimiter:
+    """
+    Conexiones por IP: allow(ip) es True mientras la IP no supere rate
+    conexiones/s sostenidas, con ráfagas de hasta burst
+    """
+
+    __slots__ = ('interval', 'tolerance', 'max_entries', 'table', 'limited', 'untracked')
+
+    def __init__(self, rate, burst, max_entries=DEFAULT_MAX_ENTRIES):
+        self.interval = 1.0 / rate
+        self.tolerance = self.interval * (burst - 1)
+        self.max_entries = max_entries
+        self.table = {}          # ip -> momento en que el balde vuelve a estar lleno
+        self.limited = 0
+        self.untracked = 0       # admitidas sin registrar (tabla llena)
+
+    def __len__(self):
+        return len(self.table)
+
+    def allow(self, key, now=None):
+        if now is None:
+            now = time.monotonic()
+        table = self.table
+        tat = table.get(key)
+        if tat is None:
+            if len(table) >= self.max_entries:
+                self.purge(now)
+                if len(table) >= self.max_entries:
+                    self.untracked += 1
+                    return True
+            tat = now
+        elif tat < now:
+            tat = now
+        elif tat - now > self.tolerance:
+            self.limited += 1
+            return False
+        table[key] = tat + self.interval
+        return True
+
+    def purge(self, now=None):
+        """Quita las IPs con el balde lleno. O(tabla): solo cuando se llena."""
+        if now is None:
+            now = time.monotonic()
+        table = self.table
+        for key in [key for key, tat in table.items() if tat <= now]:
+            del table[key]
+
+
+def default_max_connections(fallback=10000):
+    """Límite de descriptores del proceso menos FD_RESERVE"""
+    if resource is None:
+        return fallback
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return fallback
+    return max(soft - FD_RESERVE, 1)
+
+
+class ConnectionLimiter:
+    """
+    Conexiones abiertas en total y por IP. acquire() al aceptar, release() al
+    cerrar (solo las admitidas). max_total o max_per_ip en 0: sin límite.
+    """
+
+    __slots__ = ('max_total', 'max_per_ip', 'total', 'per_ip', 'shed_total', 'shed_per_ip')
+
+    def __init__(self, max_total, max_per_ip):
+        self.max_total = max_total
+        self.max_per_ip = max_per_ip
+        self.total = 0
+        self.per_ip = {}         # solo IPs con conexiones abiertas
+        self.shed_total = 0      # rechazadas por el límite total
+        self.shed_per_ip = 0     # rechazadas por el límite de la IP
+
+    def acquire(self, key):
+        if self.max_total and self.total >= self.max_total:
+            self.shed_total += 1
+            return False
+        count = self.per_ip.get(key, 0)
+        if self.max_per_ip and count >= self.max_per_ip:
+            self.shed_per_ip += 1
+            return False
+        self.per_ip[key] = count + 1
+        self.total += 1
+        return True
+
+    def release(self, key):
+        count = self.per_ip.get(key)
+        if count is None:
+            return
+        if count <= 1:
+            del self.per_ip[key]
+        else:
+            self.per_ip[key] = count - 1
+        self.total -= 1
@@ -0,0 +1,462 @@
+"""
+Archivo histórico de posiciones GT06: columnar, por IMEI y por día.
+
+Como líneas de texto ("[POSICION] LAT: ... LON: ...") cada posición ocupa
+unos 80 bytes y leer el historial de un equipo obliga a recorrer todo el log.
+El archivo guarda las posiciones de cada equipo en root/<imei>/<AAAAMMDD>.gta
+(día UTC de la fecha del equipo), solo agregando al final, en bloques de
+columnas. Con varios procesos sobre el mismo root (--workers) cada uno escribe
+sus propios archivos, root/<imei>/<AAAAMMDD>-w<N>.gta: un equipo que reconecta
+puede caer en otro worker, y así nadie agrega ni recorta un archivo que otro
+proceso está escribiendo. read_device() junta los archivos del día.
+
+    fix_time  lat_raw  lon_raw  speed  course
+
+lat_raw y lon_raw son los enteros del equipo (1/1800000 de grado, negativos
+al sur y al oeste, como los entrega parse_position). Cada columna se guarda
+como deltas respecto de la fila anterior del bloque, en zigzag (los
+negativos chicos quedan chicos) y varint (7 bits por byte): un equipo que
+reporta cada 10 s en movimiento cuesta unos pocos bytes por posición.
+
+Bloque:
+
+    'GTA1' + filas(varint) + largo de cada columna(5 varint) + CRC32(4) + columnas
+
+Cada bloque empieza desde cero (la primera fila va completa), así se puede
+leer sin el resto del archivo, y el CRC32 detecta un bloque dañado. Un bloque
+dañado se saltea: la lectura sigue en la próxima cabecera 'GTA1' que abra un
+bloque válido, así un byte roto no se lleva los bloques que le siguen. Un
+bloque incompleto al final (corte durante la escritura) se ignora al leer, y
+el escritor lo recorta antes de volver a agregar a esa partición; nunca
+recorta bloques completos.
+
+ArchiveWriter acumula las filas en memoria por (IMEI, día). Como el logger y
+PositionStore, add() nunca toca el disco: un hilo propio escribe un bloque
+cuando una partición junta block_rows filas, cada flush_interval segundos
+(todas las particiones con filas) y en flush()/close(). Así abrir, revisar y
+recortar una partición nueva no frena al motor de red ni a la rueda de
+temporizadores. iter_fixes() lee un
+archivo bloque por bloque; read_device() recorre los días de un equipo. Con
+NumPy las columnas se decodifican vectorizadas; sin él, en Python puro.
+
+    archive = get_archive('historial')
+    archive.add(imei, (fix_time, lat_raw, lon_raw, speed, course))
+    for fix in read_device('historial', imei, start, end):
+        ...
+"""
+
+import atexit
+import collections
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él, decode_column usa Python puro
+    np = None
+
+MAGIC = b'GTA1'
+EXTENSION = '.gta'
+COLUMNS = ('fix_time', 'lat_raw', 'lon_raw', 'speed', 'course')
+DEFAULT_BLOCK_ROWS = 1024
+DEFAULT_FLUSH_INTERVAL = 5 * 60   # segundos entre bloques de una partición que no se llena
+MAX_CHECKED = 100000      # particiones revisadas que se recuerdan (ver ArchiveWriter._open)
+CRC = struct.Struct('>I')
+
+
+class ArchiveError(ValueError):
+    """Bloque dañado en un archivo de posiciones"""
+
+
+def encode_column(values, out=None):
+    """Agrega a out (bytearray) los deltas zigzag-varint de values"""
+    if out is None:
+        out = bytearray()
+    append = out.append
+    previous = 0
+    for value in values:
+        delta = value - previous
+        previous = value
+        zigzag = delta << 1 if delta >= 0 else (~delta << 1) | 1
+        while zigzag >= 0x80:
+            append((zigzag & 0x7F) | 0x80)
+            zigzag >>= 7
+        append(zigzag)
+    return out
+
+
+def decode_column(data, count):
+    """Inverso de encode_column(): lista de count enteros (array con NumPy)"""
+    if np is not None and count:
+        return _decode_column_np(data, count)
+    values = []
+    append = values.append
+    value = 0
+    zigzag = 0
+    shift = 0
+    for byte in data:
+        zigzag |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        value += (zigzag >> 1) ^ -(zigzag & 1)
+        append(value)
+        zigzag = 0
+        shift = 0
+    if len(values) != count or shift:
+        raise ArchiveError(f"Columna con {len(values)} valores, se esperaban {count}")
+    return values
+
+
+def _decode_column_np(data, count):
+    raw = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(raw < 0x80)
+    if len(ends) != count or ends[-1] != len(raw) - 1:
+        raise ArchiveError(f"Columna con {len(ends)} valores, se esperaban {count}")
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    # Posición de cada byte dentro de su varint: 7 bits por byte, el primero es el menos significativo
+    position = np.arange(len(raw), dtype=np.int64) - np.repeat(starts, ends - starts + 1)
+    parts = (raw & 0x7F).astype(np.int64) << (7 * position)
+    zigzag = np.bitwise_or.reduceat(parts, starts)
+    return np.cumsum((zigzag >> 1) ^ -(zigzag & 1))
+
+
+def _varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode_block(rows):
+    """Bloque con las filas (fix_time, lat_raw, lon_raw, speed, course)"""
+    columns = [encode_column(column) for column in zip(*rows)]
+    payload = b''.join(columns)
+    block = bytearray(MAGIC)
+    _varint(len(rows), block)
+    for column in columns:
+        _varint(len(column), block)
+    block += CRC.pack(zlib.crc32(payload))
+    block += payload
+    return block
+
+
+def _varint_at(data, offset):
+    """(valor, offset siguiente) del varint en data[offset]; None si el buffer termina antes"""
+    value = 0
+    shift = 0
+    while offset < len(data):
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+    return None
+
+
+def _parse_block(data, offset):
+    """
+    Bloque que empieza en data[offset]: (filas, largos de columna, payload, fin).
+    None si el buffer termina antes de completarlo; ArchiveError si está dañado
+    """
+    magic = data[offset:offset + len(MAGIC)]
+    if magic != MAGIC:
+        if len(magic) < len(MAGIC) and MAGIC.startswith(magic):
+            return None
+        raise ArchiveError(f"Bloque sin cabecera {MAGIC.decode()} en el byte {offset}")
+    position = offset + len(MAGIC)
+    header = []
+    for _ in range(1 + len(COLUMNS)):
+        varint = _varint_at(data, position)
+        if varint is None:
+            return None
+        value, position = varint
+        header.append(value)
+    sizes = header[1:]
+    start = position + CRC.size
+    end = start + sum(sizes)
+    if end > len(data):
+        return None
+    payload = data[start:end]
+    if zlib.crc32(payload) != CRC.unpack_from(data, position)[0]:
+        raise ArchiveError(f"CRC32 no coincide en el bloque del byte {offset}")
+    return header[0], sizes, payload, end
+
+
+def _next_block(data, offset):
+    """
+    Siguiente bloque válido desde data[offset]: (inicio, fin, (filas, largos,
+    payload)). Si lo que hay en offset está dañado, sigue en la próxima
+    cabecera que abra un bloque válido. (inicio, None, None) si desde inicio
+    solo queda un bloque incompleto; None si no queda ningún bloque.
+    """
+    torn = None
+    while offset < len(data):
+        try:
+            block = _parse_block(data, offset)
+        except ArchiveError:
+            block = False
+        if block:
+            return offset, block[3], block[:3]
+        if block is None and torn is None:
+            # Parece incompleto, pero un largo dañado también lo parece: si más
+            # adelante hay un bloque válido, no era el final
+            torn = offset
+        offset = data.find(MAGIC, offset + 1)
+        if offset < 0:
+            break
+    if torn is not None:
+        return torn, None, None
+    return None
+
+
+def _read_all(stream):
+    stream.seek(0)
+    return stream.read()
+
+
+def valid_length(stream):
+    """
+    Bytes de stream que se conservan al volver a agregar: todo menos un bloque
+    incompleto al final. Los bloques dañados del medio quedan (la lectura los
+    saltea) para no perder los válidos que les siguen.
+    """
+    data = _read_all(stream)
+    offset = 0
+    while True:
+        found = _next_block(data, offset)
+        if found is None:
+            return len(data)
+        start, end, _ = found
+        if end is None:
+            return start
+        offset = end
+
+
+def iter_blocks(stream):
+    """
+    Columnas de cada bloque válido de stream (archivo binario abierto): tuplas
+    de 5 secuencias en el orden de COLUMNS. Los bloques dañados se saltean.
+    """
+    data = _read_all(stream)
+    offset = 0
+    while True:
+        found = _next_block(data, offset)
+        if found is None or found[1] is None:
+            return
+        _, offset, (count, sizes, payload) = found
+        payload = memoryview(payload)
+        columns = []
+        position = 0
+        for size in sizes:
+            columns.append(decode_column(payload[position:position + size], count))
+            position += size
+        yield tuple(columns)
+
+
+def iter_fixes(path):
+    """Filas (fix_time, lat_raw, lon_raw, speed, course) de un archivo .gta"""
+    with open(path, 'rb') as stream:
+        for columns in iter_blocks(stream):
+            if np is not None:
+                columns = [column.tolist() for column in columns]
+            yield from zip(*columns)
+
+
+def partition_path(root, imei, day, suffix=''):
+    """Archivo del día (días desde epoch, UTC) de imei; suffix distingue al proceso que lo escribe"""
+    return os.path.join(root, imei, time.strftime('%Y%m%d', time.gmtime(day * 86400)) + suffix + EXTENSION)
+
+
+def read_device(root, imei, start=None, end=None):
+    """
+    Posiciones de imei con start <= fix_time < end (epoch; None = sin límite),
+    en orden de día y, dentro del día, de llegada a cada proceso (un archivo
+    por worker, uno después del otro)
+    """
+    directory = os.path.join(root, imei)
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith(EXTENSION))
+    except FileNotFoundError:
+        return
+    first = time.strftime('%Y%m%d', time.gmtime(start)) if start is not None else None
+    last = time.strftime('%Y%m%d', time.gmtime(end)) if end is not None else None
+    for name in names:
+        day = name[:8]
+        if (first is not None and day < first) or (last is not None and day > last):
+            continue
+        for fix in iter_fixes(os.path.join(directory, name)):
+            if (start is None or fix[0] >= start) and (end is None or fix[0] < end):
+                yield fix
+
+
+class ArchiveWriter:
+    """
+    Escritura del archivo bajo root. add() solo guarda la fila en memoria; el
+    hilo escritor graba los bloques (uno por ruta, ver get_archive).
+    """
+
+    def __init__(self, root, block_rows=DEFAULT_BLOCK_ROWS, flush_interval=DEFAULT_FLUSH_INTERVAL, suffix=''):
+        self.root = root
+        self.suffix = suffix   # '-w<N>' en los workers: archivos propios de este proceso
+        self.block_rows = block_rows
+        self.flush_interval = flush_interval
+        self.pending = {}      # (imei, día) -> filas sin escribir
+        self.queue = collections.deque()   # ((imei, día), filas) listos para escribir
+        self.rows = 0          # filas escritas
+        self.blocks = 0
+        self.bytes = 0
+        self.failed = 0        # filas perdidas por errores de disco
+        self._lock = threading.Lock()
+        self._checked = set()              # particiones ya revisadas por este proceso
+
+        self._wakeup = threading.Event()
+        self._flushed = threading.Condition()
+        self._flush_requests = 0
+        self._flush_done = 0
+        self._stopping = False
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def add(self, imei, row):
+        """row: (fix_time, lat_raw, lon_raw, speed, course), enteros"""
+        if self._thread is None:
+            self._start()
+        key = (imei, row[0] // 86400)
+        with self._lock:
+            rows = self.pending.get(key)
+            if rows is None:
+                rows = self.pending[key] = []
+            rows.append(row)
+            if len(rows) < self.block_rows:
+                return
+            del self.pending[key]
+        self.queue.append((key, rows))
+        self._wakeup.set()
+
+    def flush(self, timeout=5.0):
+        """Espera a que las filas agregadas hasta ahora queden escritas (un bloque por partición)"""
+        if self._thread is None:
+            return True
+        with self._flushed:
+            self._flush_requests += 1
+            target = self._flush_requests
+            self._wakeup.set()
+            return self._flushed.wait_for(lambda: self._flush_done >= target or not self._thread.is_alive(),
+                                          timeout)
+
+    def close(self, timeout=5.0):
+        """Escribe lo pendiente y detiene el hilo escritor"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        thread.join(timeout)
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=f"archive-writer:{self.root}", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            self._wakeup.wait(max(0.0, next_flush - time.monotonic()))
+            self._wakeup.clear()
+            with self._flushed:
+                target = self._flush_requests
+            if target > self._flush_done or self._stopping or time.monotonic() >= next_flush:
+                # Todas las particiones, también las que no llegaron a block_rows
+                with self._lock:
+                    pending, self.pending = self.pending, {}
+                self.queue.extend(pending.items())
+                next_flush = time.monotonic() + self.flush_interval
+            self._drain()
+            with self._flushed:
+                self._flush_done = target
+                self._flushed.notify_all()
+            if self._stopping:
+                return
+
+    def _drain(self):
+        queue = self.queue
+        while queue:
+            self._write(*queue.popleft())
+
+    def _write(self, key, rows):
+        path = partition_path(self.root, *key, self.suffix)
+        block = encode_block(rows)
+        try:
+            with self._open(path) as stream:
+                stream.write(block)
+        except OSError as e:
+            self.failed += len(rows)
+            sys.stderr.write(f"[ERROR] Archivo: no se pudieron escribir {len(rows)} posiciones en {path}: {e}\n")
+            return
+        self.rows += len(rows)
+        self.blocks += 1
+        self.bytes += len(block)
+
+    def _open(self, path):
+        """
+        Abre la partición para agregar. La primera vez en este proceso recorta
+        un bloque incompleto que haya dejado un corte anterior (la partición
+        es solo de este escritor, ver suffix).
+        """
+        try:
+            stream = open(path, 'r+b')
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            stream = open(path, 'w+b')
+        if path not in self._checked:
+            if len(self._checked) >= MAX_CHECKED:
+                self._checked.clear()
+            self._checked.add(path)
+            end = valid_length(stream)
+            stream.truncate(end)
+        stream.seek(0, os.SEEK_END)
+        return stream
+
+
+_archives = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(root, **kwargs):
+    """
+    Devuelve el escritor compartido para root (se crea en el primer uso y se
+    cierra, escribiendo lo pendiente, al terminar el proceso)
+    """
+    with _archives_lock:
+        archive = _archives.get(root)
+        if archive is None:
+            archive = _archives[root] = ArchiveWriter(root, **kwargs)
+        return archive
+
+
+def close_all():
+    for archive in list(_archives.values()):
+        archive.close()
+
+
+def _after_fork_in_child():
+    # Lo pendiente del padre lo escribe el padre: el hijo empieza sin escritores
+    global _archives_lock
+    _archives.clear()
+    _archives_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+atexit.register(close_all)
@@ -0,0 +1,164 @@
+"""
+Decodificación de tramas GT06 sin cortes intermedios.
+
+parse_position y handle_login cortan la trama muchas veces (data[4:10],
+data[11:15], data[2:-4]...) y cada corte es una copia. Aquí cada bloque de la
+trama se lee con un struct.Struct precompilado (unpack_from) directamente
+sobre el buffer recibido - bytes, bytearray o memoryview - y el resultado es
+un GT06Record (namedtuple) con los campos ya convertidos a enteros.
+
+decode_frame() acepta además un rango (start, end) para decodificar una trama
+dentro de un buffer más grande, por ejemplo una captura completa en memoria.
+En las tramas 7979 (length de 2 bytes) todos los bloques corren un byte.
+"""
+
+import datetime
+import struct
+from collections import namedtuple
+
+PROTOCOL_LOGIN = 0x01
+PROTOCOL_POSITION = 0x12
+PROTOCOL_STATUS = 0x13
+PROTOCOL_ALARM = 0x16
+PROTOCOL_HEARTBEAT = 0x23
+PROTOCOL_ALARM_26 = 0x26
+
+# Login: IMEI (8 bytes BCD) tras el protocolo
+LOGIN = struct.Struct('>Q')
+# Bloque GPS: fecha (4+2 bytes), satélites, lat, lon, velocidad, rumbo/estado
+GPS = struct.Struct('>IHBIIBH')
+# Bloque de estado (0x13 y alarmas): info terminal, voltaje, GSM, alarma (+ idioma, ignorado)
+STATUS = struct.Struct('>BBBBx')
+# Heartbeat 0x23: info terminal, voltaje (2 bytes), GSM
+HEARTBEAT = struct.Struct('>BHB')
+# Cola de la trama: serial + CRC + 0D0A
+TRAILER = struct.Struct('>HHH')
+# Rumbo/estado: últimos 2 bytes del bloque GPS (GT06Record.course lo trae sin los bits de estado)
+COURSE_STATUS = struct.Struct('>H')
+
+GPS_OFFSET = 4
+# En las alarmas el estado va después de GPS(18) + LBS(1 + 8)
+ALARM_STATUS_OFFSET = GPS_OFFSET + GPS.size + 9
+
+# Bits de rumbo/estado (manual 5.2.1.9)
+COURSE_MASK = 0x03FF
+STATUS_NORTH = 0x0400
+STATUS_WEST = 0x0800
+STATUS_POSITIONED = 0x1000
+
+GT06Record = namedtuple('GT06Record', [
+    'protocol', 'serial', 'crc',
+    'imei',
+    'datetime', 'satellites', 'lat_raw', 'lon_raw', 'lat', 'lon', 'speed', 'course',
+    'terminal_info', 'voltage', 'gsm', 'alarm',
+], defaults=[None] * 13)
+GT06Record.__doc__ = """
+Trama GT06 decodificada. Los campos que no aplican al protocolo quedan en None.
+
+imei: entero cuyo hex son los dígitos BCD (ver format_imei)
+datetime: fecha/hora empaquetada 0xYYMMDDhhmmss (ver record_datetime)
+lat_raw/lon_raw: valores crudos en 1/1800000 de grado (con bit de signo)
+"""
+
+
+def format_imei(imei):
+    """IMEI como lo muestra handle_login (hex de los 8 bytes BCD)"""
+    return f"{imei:016x}"
+
+
+def record_datetime(record):
+    """Convierte el campo datetime empaquetado a datetime.datetime (UTC)"""
+    value = record.datetime
+    return datetime.datetime(
+        2000 + (value >> 40), (value >> 32) & 0xFF, (value >> 24) & 0xFF,
+        (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
+
+
+# Construcción directa de la tupla (evita el __new__ con defaults de namedtuple)
+_new_record = tuple.__new__
+_NO_GPS = (None,) * 8
+_NO_STATUS = (None,) * 4
+
+
+def _decode_gps(buffer, offset):
+    """
+    Bloque GPS como tupla (datetime, satellites, lat_raw, lon_raw, lat, lon, speed, course)
+    """
+    date_hi, date_lo, satellites, lat_raw, lon_raw, speed, course_status = GPS.unpack_from(buffer, offset)
+    # Signo: bit 31 (convención de parse_position y emulaGPS) o, si el equipo
+    # tiene posición, los bits Norte/Oeste de rumbo/estado según el manual
+    lat = (lat_raw & 0x7FFFFFFF) / 1800000.0
+    lon = (lon_raw & 0x7FFFFFFF) / 1800000.0
+    if lat_raw & 0x80000000 or (course_status & STATUS_POSITIONED and not course_status & STATUS_NORTH):
+        lat = -lat
+    if lon_raw & 0x80000000 or (course_status & STATUS_POSITIONED and course_status & STATUS_WEST):
+        lon = -lon
+    return ((date_hi << 16) | date_lo, satellites & 0x0F, lat_raw, lon_raw,
+            lat, lon, speed, course_status & COURSE_MASK)
+
+
+def is_positioned(buffer, start=0):
+    """
+    True si el rumbo/estado del bloque GPS de la trama buffer[start:] (0x12,
+    0x16, 0x26) trae el bit 'GPS posicionado' (manual 5.2.1.9)
+    """
+    if buffer[start] == 0x79:
+        start += 1
+    course_status, = COURSE_STATUS.unpack_from(buffer, start + GPS_OFFSET + GPS.size - COURSE_STATUS.size)
+    return bool(course_status & STATUS_POSITIONED)
+
+
+def decode_frame(buffer, start=0, end=None):
+    """
+    Decodifica la trama buffer[start:end] (sin copiarla).
+    Devuelve un GT06Record, o None si la trama es demasiado corta o el
+    protocolo no está soportado (0x01, 0x12, 0x13, 0x16, 0x23, 0x26).
+    """
+    if end is None:
+        end = len(buffer)
+    size = end - start
+    if size < 10:
+        return None
+
+    serial, crc, _ = TRAILER.unpack_from(buffer, end - 6)
+    if buffer[start] == 0x79:
+        # 7979: length de 2 bytes; el resto de la trama corre un byte
+        start += 1
+        size -= 1
+    protocol = buffer[start + 3]
+
+    if protocol == PROTOCOL_POSITION:
+        if size < GPS_OFFSET + GPS.size + 6:
+            return None
+        return _new_record(GT06Record, (protocol, serial, crc, None)
+                           + _decode_gps(buffer, start + GPS_OFFSET) + _NO_STATUS)
+
+    if protocol == PROTOCOL_LOGIN:
+        if size < 18:
+            return None
+        imei, = LOGIN.unpack_from(buffer, start + 4)
+        return _new_record(GT06Record, (protocol, serial, crc, imei) + _NO_GPS + _NO_STATUS)
+
+    if protocol == PROTOCOL_ALARM or protocol == PROTOCOL_ALARM_26:
+        if size < GPS_OFFSET + GPS.size + 6:
+            return None
+        gps = _decode_gps(buffer, start + GPS_OFFSET)
+        if size >= ALARM_STATUS_OFFSET + STATUS.size + 6:
+            status = STATUS.unpack_from(buffer, start + ALARM_STATUS_OFFSET)
+        else:
+            status = _NO_STATUS
+        return _new_record(GT06Record, (protocol, serial, crc, None) + gps + status)
+
+    if protocol == PROTOCOL_STATUS:
+        if size < 4 + STATUS.size + 6:
+            return None
+        status = STATUS.unpack_from(buffer, start + 4)
+        return _new_record(GT06Record, (protocol, serial, crc, None) + _NO_GPS + status)
+
+    if protocol == PROTOCOL_HEARTBEAT:
+        if size < 4 + HEARTBEAT.size + 6:
+            return _new_record(GT06Record, (protocol, serial, crc, None) + _NO_GPS + _NO_STATUS)
+        return _new_record(GT06Record, (protocol, serial, crc, None) + _NO_GPS
+                           + HEARTBEAT.unpack_from(buffer, start + 4) + (None,))
+
+    return None
@@ -0,0 +1,97 @@
+"""
+Despacho de tramas GT06 por (número de protocolo, modo de la sesión).
+
+process_packet() elegía el handler con una cadena de if/elif que comparaba
+el protocolo y, para las tramas de modo directo, el string
+transmission_mode de la sesión: hasta nueve comparaciones por trama para
+llegar a las de estado o alarma. DispatchTable guarda los handlers por
+(protocolo, modo) y compila para cada modo una lista de 256 handlers
+indexada por protocolo: la sesión la resuelve una vez, cuando cambia su
+modo, y cada trama cuesta una indexación.
+
+    dispatch = get_dispatch_table()
+
+    @dispatch.register(0x8A)                 # cualquier modo
+    def on_time_request(data, conn, session):
+        ...
+
+    dispatch.register(0x12, on_position, mode='direct')
+
+Un handler registrado para un modo tiene prioridad sobre el registrado para
+cualquier modo (mode=None); lo que no tiene handler va a default. Registrar
+otra vez la misma clave reemplaza el handler anterior, también en las
+listas ya compiladas que tienen las sesiones abiertas.
+"""
+
+import threading
+
+PROTOCOLS = 256
+
+
+class DispatchTable:
+    """Handlers handler(data, conn, session) por (protocolo, modo)"""
+
+    def __init__(self, default=None):
+        self.handlers = {}     # (protocolo, modo o None) -> handler
+        self.default = default or (lambda data, conn, session: None)
+        self._compiled = {}    # modo -> lista de PROTOCOLS handlers
+        self._lock = threading.Lock()
+
+    def register(self, protocol, handler=None, mode=None):
+        """
+        Registra handler para protocol (0-255) en mode (None = cualquier
+        modo). Sin handler devuelve un decorador.
+        """
+        if not 0 <= protocol < PROTOCOLS:
+            raise ValueError(f"Número de protocolo fuera de rango: {protocol}")
+        if handler is None:
+            return lambda function: self.register(protocol, function, mode)
+        with self._lock:
+            self.handlers[(protocol, mode)] = handler
+            self._recompile()
+        return handler
+
+    def unregister(self, protocol, mode=None):
+        with self._lock:
+            self.handlers.pop((protocol, mode), None)
+            self._recompile()
+
+    def set_default(self, handler):
+        with self._lock:
+            self.default = handler
+            self._recompile()
+
+    def lookup(self, protocol, mode=None):
+        handlers = self.handlers
+        return handlers.get((protocol, mode)) or handlers.get((protocol, None)) or self.default
+
+    def table(self, mode=None):
+        """Lista de handlers indexada por protocolo para las sesiones en mode"""
+        compiled = self._compiled.get(mode)
+        if compiled is None:
+            with self._lock:
+                compiled = self._compiled.get(mode)
+                if compiled is None:
+                    compiled = self._compiled[mode] = self._compile(mode)
+        return compiled
+
+    def _compile(self, mode):
+        return [self.lookup(protocol, mode) for protocol in range(PROTOCOLS)]
+
+    def _recompile(self):
+        # En el lugar: las sesiones guardan la lista, no una copia
+        for mode, compiled in self._compiled.items():
+            compiled[:] = self._compile(mode)
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def get_dispatch_table():
+    """Tabla compartida por todo el proceso (se crea en el primer uso)"""
+    global _table
+    with _table_lock:
+        if _table is None:
+            _table = DispatchTable()
+        return _table
@@ -0,0 +1,176 @@
+"""
+Reensamblado de tramas GT06 sobre el flujo TCP.
+
+TCP no respeta los límites de los paquetes: un recv() puede traer media trama
+o varias tramas juntas (ráfagas de posiciones). GT06Framer acumula los datos
+de una conexión y devuelve cada trama completa usando el campo de longitud:
+
+    7878 + length(1) + protocolo + contenido + serial(2) + CRC(2) + 0D0A
+    longitud total = length + 5
+
+    7979 + length(2) + protocolo + contenido + serial(2) + CRC(2) + 0D0A
+    longitud total = length + 6
+
+Las tramas 7979 (longitud de 2 bytes, big endian) llevan contenidos largos,
+como la transmisión de información o los datos en lote. Se cortan igual que
+las 7878, con una sola copia por trama. El CRC va en ambas desde length hasta
+el serial (data[2:-4]), y el protocolo está en protocol_offset(data).
+
+El terminador 0D0A confirma el límite de la trama; si no coincide, se
+descarta la cabecera y se resincroniza buscando el siguiente 7878 o 7979.
+Un length de 7979 mayor que MAX_7979_LENGTH se trata igual. Si una cabecera
+anuncia más bytes de los recibidos pero después de ella ya hay otra cabecera
+con una trama completa (0D0A y CRC válido), la primera es basura (un 78 suelto
+pegado a un 7878 real, un 7979 cortado) y se resincroniza en la segunda en
+vez de esperar datos que quizás nunca lleguen.
+"""
+
+from gt06_crc import crc_variant
+
+START_7878 = b'\x78\x78'
+START_7979 = b'\x79\x79'
+STOP = b'\x0D\x0A'
+
+# length mínimo válido: protocolo(1) + serial(2) + CRC(2)
+MIN_PACKET_LENGTH = 5
+# length máximo aceptado en 7979 (el campo admite 65535): los lotes e información
+# transmitida reales son de pocos KB
+MAX_7979_LENGTH = 16 * 1024
+
+
+def protocol_offset(frame):
+    """Posición del número de protocolo: 3 en las tramas 7878, 4 en las 7979"""
+    return 4 if frame[0] == 0x79 else 3
+
+
+class GT06Framer:
+    """
+    Framer incremental por conexión.
+
+    feed() recibe los bytes de cada recv() y devuelve la lista de tramas
+    completas (bytes). La única copia es la de cada trama entregada: el buffer
+    nunca se vuelve a cortar, solo se le agrega el resto incompleto para el
+    siguiente recv(). En el caso habitual (recv con tramas enteras) el buffer
+    interno ni siquiera se usa.
+    """
+
+    __slots__ = ('buffer', 'frames', 'discarded')
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.frames = 0      # tramas entregadas
+        self.discarded = 0   # bytes descartados al resincronizar
+
+    def pending(self):
+        """Bytes recibidos que todavía no forman una trama completa"""
+        return len(self.buffer)
+
+    def feed(self, data):
+        buffer = self.buffer
+        if buffer:
+            buffer += data
+            frames, pos = self._scan(buffer, memoryview(buffer))
+            if pos:
+                # bytearray descarta el prefijo sin mover el resto
+                del buffer[:pos]
+        else:
+            # Caso habitual: se recorre el recv() directamente, sin copiarlo
+            if not isinstance(data, bytes):
+                data = bytes(data)
+            frames, pos = self._scan(data, data)
+            if pos < len(data):
+                buffer += memoryview(data)[pos:]
+        self.frames += len(frames)
+        return frames
+
+    def _scan(self, source, view):
+        """
+        Extrae las tramas completas de source. view es de donde se cortan las
+        tramas: el propio bytes (el corte es la única copia) o un memoryview
+        del bytearray (tobytes() copia una sola vez, sin bytearray intermedio).
+        Devuelve (tramas, bytes consumidos).
+        """
+        frames = []
+        size = len(source)
+        pos = 0
+        while size - pos >= 3:
+            first = source[pos]
+            if first == 0x78 and source[pos + 1] == 0x78:
+                packet_length = source[pos + 2]
+                end = pos + packet_length + 5
+            elif first == 0x79 and source[pos + 1] == 0x79:
+                if size - pos < 4:
+                    break  # falta el segundo byte de length
+                packet_length = (source[pos + 2] << 8) | source[pos + 3]
+                end = pos + packet_length + 6
+                if packet_length > MAX_7979_LENGTH:
+                    pos = self._resync(source, pos, size)
+                    continue
+            else:
+                pos = self._resync(source, pos, size)
+                continue
+
+            if packet_length < MIN_PACKET_LENGTH:
+                pos = self._resync(source, pos, size)
+                continue
+            if end > size:
+                # Sin un 0D0A más adelante no puede haber otra trama completa (caso habitual)
+                found = self._complete_after(source, pos, size) if source.find(STOP, pos + 4, size) >= 0 else -1
+                if found < 0:
+                    break  # trama incompleta, esperar más datos
+                # Cabecera falsa: ya hay una trama completa más adelante
+                self.discarded += found - pos
+                pos = found
+                continue
+            if source[end - 1] != 0x0A or source[end - 2] != 0x0D:
+                # Longitud corrupta o falso 7878: buscar la siguiente cabecera
+                pos = self._resync(source, pos, size)
+                continue
+
+            if view is source:
+                frames.append(source[pos:end])
+            else:
+                frames.append(view[pos:end].tobytes())
+            pos = end
+
+        if 0 < size - pos < 3 and not (source.startswith(START_7878[:size - pos], pos)
+                                       or source.startswith(START_7979[:size - pos], pos)):
+            pos = self._resync(source, pos, size)
+        if view is not source:
+            view.release()
+        return frames, pos
+
+    def _complete_after(self, source, pos, size):
+        """
+        Posición de la primera cabecera después de pos que abre una trama
+        completa en source (0D0A en su lugar y CRC válido), o -1 si no hay
+        """
+        found = _find_header(source, pos + 1, size)
+        while 0 <= found and size - found >= 4:
+            if source[found] == 0x78:
+                end = found + source[found + 2] + 5
+            else:
+                end = found + ((source[found + 2] << 8) | source[found + 3]) + 6
+            if (end <= size and end - found >= MIN_PACKET_LENGTH + 5 and source[end - 2] == 0x0D
+                    and source[end - 1] == 0x0A and crc_variant(source[found:end]) is not None):
+                return found
+            found = _find_header(source, found + 1, size)
+        return -1
+
+    def _resync(self, source, pos, size):
+        """
+        Descarta desde pos hasta la próxima cabecera 7878 o 7979 (o hasta el
+        último byte si podría ser el comienzo de una) y lo contabiliza.
+        """
+        found = _find_header(source, pos + 1, size)
+        if found < 0:
+            found = size - 1 if source[size - 1] in (0x78, 0x79) else size
+        self.discarded += found - pos
+        return found
+
+
+def _find_header(source, start, size):
+    """Primera cabecera 7878 o 7979 en source[start:size], o -1"""
+    found = source.find(START_7878, start, size)
+    found_7979 = source.find(START_7979, start, found if found >= 0 else size)
+    return found_7979 if found_7979 >= 0 else found
@@ -0,0 +1,239 @@
+"""
+Geocercas evaluadas en el servidor con cada posición decodificada.
+
+El equipo avisa "Geocerca" (alarma 0x04) solo para las zonas que tiene
+programadas, y son pocas. GeofenceIndex guarda en el servidor geocercas
+circulares y poligonales y, con cada posición, dice en cuáles está el
+equipo; GeofenceMonitor recuerda en cuáles estaba cada IMEI y devuelve los
+eventos de entrada y salida.
+
+Para no probar cada posición contra todas las geocercas, el rectángulo
+envolvente de cada una se registra en las celdas de una grilla (cell_size
+grados, por defecto 0,01°, ~1,1 km). Una posición solo mira las geocercas de
+su celda: primero descarta por rectángulo envolvente y recién después hace
+la prueba exacta (distancia al centro o punto en polígono por cruce de
+rayos). Las geocercas que tocarían más de MAX_FENCE_CELLS celdas (una
+provincia entera) van a una lista aparte que se revisa siempre, solo con
+el rectángulo como primer filtro.
+
+Las coordenadas se manejan como los enteros del equipo (1/1800000 de grado,
+con signo), igual que gt06_spatial. El archivo de geocercas es JSON: una
+lista de objetos
+
+    {"id": "deposito", "name": "Depósito", "lat": -34.61, "lon": -58.40, "radius": 150}
+    {"id": "zona-1", "points": [[-34.60, -58.41], [-34.60, -58.39], [-34.62, -58.40]]}
+
+(points en [lat, lon]) o un FeatureCollection GeoJSON con Polygon (anillo
+exterior) y Point con la propiedad "radius" en metros.
+
+    monitor = GeofenceMonitor(GeofenceIndex(load_fences('geocercas.json')))
+    for event in monitor.evaluate(imei, lat_raw, lon_raw, fix_time):
+        ...
+"""
+
+import json
+import math
+import threading
+from collections import namedtuple
+
+RAW_PER_DEGREE = 1800000
+METERS_PER_DEGREE = 111320.0
+METERS_PER_RAW = METERS_PER_DEGREE / RAW_PER_DEGREE
+DEFAULT_CELL_SIZE = 0.01        # grados
+MAX_FENCE_CELLS = 4096          # más celdas que esto: la geocerca va a la lista de grandes
+
+# kind: 'circle' -> shape = (lat, lon, radio², escala de longitud), en unidades del equipo
+#       'polygon' -> shape = ((lat, lon), ...) vértices en unidades del equipo
+Fence = namedtuple('Fence', ['id', 'name', 'kind', 'bbox', 'shape'])
+
+GeofenceEvent = namedtuple('GeofenceEvent', ['imei', 'fence_id', 'name', 'kind', 'fix_time',
+                                             'lat_raw', 'lon_raw'])
+
+ENTER = 'enter'
+EXIT = 'exit'
+
+_NONE = frozenset()
+
+
+def _raw(degrees):
+    return round(degrees * RAW_PER_DEGREE)
+
+
+def circle(fence_id, lat, lon, meters, name=None):
+    """Geocerca circular de meters metros alrededor de (lat, lon) en grados"""
+    if meters <= 0:
+        raise ValueError(f"Geocerca {fence_id}: radio inválido {meters}")
+    lat0, lon0 = _raw(lat), _raw(lon)
+    scale = math.cos(math.radians(lat))
+    reach = meters / METERS_PER_RAW
+    reach_lon = reach / max(scale, 1e-6)
+    bbox = (int(lat0 - reach), int(lon0 - reach_lon), int(lat0 + reach) + 1, int(lon0 + reach_lon) + 1)
+    return Fence(fence_id, name or fence_id, 'circle', bbox, (lat0, lon0, reach * reach, scale))
+
+
+def polygon(fence_id, points, name=None):
+    """Geocerca poligonal; points: [(lat, lon), ...] en grados, sin repetir el primero al final"""
+    vertices = tuple((_raw(lat), _raw(lon)) for lat, lon in points)
+    if len(vertices) > 1 and vertices[0] == vertices[-1]:
+        vertices = vertices[:-1]
+    if len(vertices) < 3:
+        raise ValueError(f"Geocerca {fence_id}: un polígono necesita al menos 3 vértices")
+    lats = [lat for lat, _ in vertices]
+    lons = [lon for _, lon in vertices]
+    return Fence(fence_id, name or fence_id, 'polygon', (min(lats), min(lons), max(lats), max(lons)), vertices)
+
+
+def _inside_polygon(vertices, lat, lon):
+    """Cruce de rayos hacia el este: dentro si cruza una cantidad impar de lados"""
+    inside = False
+    lat1, lon1 = vertices[-1]
+    for lat2, lon2 in vertices:
+        if (lat1 > lat) != (lat2 > lat):
+            if lon < lon1 + (lat - lat1) * (lon2 - lon1) / (lat2 - lat1):
+                inside = not inside
+        lat1, lon1 = lat2, lon2
+    return inside
+
+
+def contains(fence, lat_raw, lon_raw):
+    """Prueba exacta (sin el rectángulo envolvente) de fence con la posición"""
+    if fence.kind == 'circle':
+        lat0, lon0, limit, scale = fence.shape
+        d_lat = lat_raw - lat0
+        d_lon = (lon_raw - lon0) * scale
+        return d_lat * d_lat + d_lon * d_lon <= limit
+    return _inside_polygon(fence.shape, lat_raw, lon_raw)
+
+
+def parse_fences(data):
+    """Fences de un JSON ya cargado: lista de objetos o FeatureCollection GeoJSON"""
+    if isinstance(data, dict) and data.get('type') == 'FeatureCollection':
+        return [_parse_feature(feature, number) for number, feature in enumerate(data['features'], 1)]
+    fences = []
+    for number, item in enumerate(data, 1):
+        fence_id = str(item.get('id', number))
+        if 'points' in item:
+            fences.append(polygon(fence_id, item['points'], item.get('name')))
+        else:
+            fences.append(circle(fence_id, float(item['lat']), float(item['lon']),
+                                 float(item['radius']), item.get('name')))
+    return fences
+
+
+def _parse_feature(feature, number):
+    properties = feature.get('properties') or {}
+    fence_id = str(feature.get('id', properties.get('id', number)))
+    geometry = feature['geometry']
+    if geometry['type'] == 'Polygon':
+        # GeoJSON va en [lon, lat]; los huecos (anillos interiores) no se usan
+        return polygon(fence_id, [(lat, lon) for lon, lat, *_ in geometry['coordinates'][0]], properties.get('name'))
+    if geometry['type'] == 'Point':
+        lon, lat = geometry['coordinates'][:2]
+        return circle(fence_id, lat, lon, float(properties['radius']), properties.get('name'))
+    raise ValueError(f"Geocerca {fence_id}: geometría {geometry['type']} no soportada")
+
+
+def load_fences(path):
+    """Fences del archivo JSON path (ver el docstring del módulo)"""
+    with open(path, encoding='utf-8') as stream:
+        return parse_fences(json.load(stream))
+
+
+class GeofenceIndex:
+    """Geocercas por celda de la grilla según su rectángulo envolvente (solo lectura tras crearlo)"""
+
+    def __init__(self, fences=(), cell_size=DEFAULT_CELL_SIZE):
+        self.cell = max(1, _raw(cell_size))   # lado de la celda en unidades del equipo
+        self.fences = {}                       # id -> Fence
+        self.cells = {}                        # (fila, columna) -> [(sur, oeste, norte, este, Fence)]
+        self.large = []                        # geocercas con demasiadas celdas, mismo formato
+        for fence in fences:
+            self.add(fence)
+
+    def __len__(self):
+        return len(self.fences)
+
+    def add(self, fence):
+        if fence.id in self.fences:
+            raise ValueError(f"Geocerca repetida: {fence.id}")
+        self.fences[fence.id] = fence
+        south, west, north, east = fence.bbox
+        entry = (south, west, north, east, fence)
+        cell = self.cell
+        rows = range(south // cell, north // cell + 1)
+        columns = range(west // cell, east // cell + 1)
+        if len(rows) * len(columns) > MAX_FENCE_CELLS:
+            self.large.append(entry)
+            return
+        cells = self.cells
+        for ix in rows:
+            for iy in columns:
+                key = (ix, iy)
+                entries = cells.get(key)
+                if entries is None:
+                    cells[key] = [entry]
+                else:
+                    entries.append(entry)
+
+    def candidates(self, lat_raw, lon_raw):
+        """Geocercas cuyo rectángulo envolvente contiene la posición (sin la prueba exacta)"""
+        cell = self.cell
+        found = []
+        for entries in (self.cells.get((lat_raw // cell, lon_raw // cell), ()), self.large):
+            for south, west, north, east, fence in entries:
+                if south <= lat_raw <= north and west <= lon_raw <= east:
+                    found.append(fence)
+        return found
+
+    def containing(self, lat_raw, lon_raw):
+        """Geocercas que contienen la posición (lat/lon en unidades del equipo)"""
+        return [fence for fence in self.candidates(lat_raw, lon_raw) if contains(fence, lat_raw, lon_raw)]
+
+
+class GeofenceMonitor:
+    """
+    Geocercas en las que está cada IMEI; evaluate() devuelve las entradas y
+    salidas respecto de la posición anterior. Solo se guardan los equipos
+    que están dentro de alguna.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.inside = {}       # imei -> frozenset de ids de geocerca
+        self.events = 0
+        self._lock = threading.Lock()
+
+    def evaluate(self, imei, lat_raw, lon_raw, fix_time=None):
+        """Lista de GeofenceEvent (primero las salidas); vacía si no cambió nada"""
+        found = self.index.containing(lat_raw, lon_raw)
+        with self._lock:
+            previous = self.inside.get(imei, _NONE)
+            if not found and not previous:
+                return []
+            current = frozenset(fence.id for fence in found)
+            if current == previous:
+                return []
+            if current:
+                self.inside[imei] = current
+            else:
+                del self.inside[imei]
+        fences = self.index.fences
+        events = []
+        for fence_id in previous - current:
+            fence = fences.get(fence_id)
+            events.append(GeofenceEvent(imei, fence_id, fence.name if fence else fence_id, EXIT,
+                                        fix_time, lat_raw, lon_raw))
+        for fence in found:
+            if fence.id not in previous:
+                events.append(GeofenceEvent(imei, fence.id, fence.name, ENTER, fix_time, lat_raw, lon_raw))
+        self.events += len(events)
+        return events
+
+    def prime(self, imei, lat_raw, lon_raw):
+        """Fija dónde está imei sin generar eventos (posiciones recuperadas al arrancar)"""
+        current = frozenset(fence.id for fence in self.index.containing(lat_raw, lon_raw))
+        with self._lock:
+            if current:
+                self.inside[imei] = current
+            else:
+                self.inside.pop(imei, None)
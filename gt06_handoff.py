@@ -0,0 +1,209 @@
+"""
+Reinicio sin corte de los servidores GT06 (SCM_RIGHTS).
+
+Al reiniciar para actualizar el código, el puerto queda cerrado un momento:
+los equipos que intentan conectarse reciben RST y esperan varios minutos
+antes de reintentar. Con --handoff RUTA el servidor escucha en un socket Unix
+y un proceso nuevo lanzado con la misma opción le pide:
+
+1. el socket de escucha: desde ese momento acepta el proceso nuevo, el
+   puerto nunca se cierra;
+2. las conexiones abiertas, cada una con el estado de su sesión
+   (Session.export_state) y en un límite de trama: el proceso viejo
+   procesa lo que ya recibió, envía sus ACK y pasa el socket; lo que llegue
+   después lo lee el proceso nuevo.
+
+Después el proceso viejo termina y el nuevo queda escuchando en RUTA para el
+siguiente reinicio. Los descriptores viajan como datos auxiliares
+SCM_RIGHTS por un socket SOCK_SEQPACKET (un mensaje JSON por envío):
+
+    nuevo -> viejo  {"connections": true}                 pedido
+    viejo -> nuevo  {"listener": true}          + [fd]    socket de escucha
+    viejo -> nuevo  {"connections": [estado]}   + [fd...] hasta MAX_FDS por mensaje
+    viejo -> nuevo  {"done": true}
+
+    server = HandoffServer(path, on_request)   # proceso viejo
+    listener, connections = takeover(path)     # proceso nuevo
+
+Solo Unix (socket.send_fds, Python 3.9+).
+"""
+
+import json
+import os
+import socket
+import threading
+
+MAX_FDS = 200                 # descriptores por mensaje (el kernel admite 253)
+MAX_MESSAGE = 1 << 20
+DEFAULT_TIMEOUT = 30.0        # espera del proceso nuevo hasta recibir "done"
+
+
+class HandoffError(OSError):
+    """No se pudo tomar el relevo del proceso anterior"""
+
+
+def supported():
+    """True si el sistema permite pasar descriptores entre procesos"""
+    return hasattr(socket, 'AF_UNIX') and hasattr(socket, 'SOCK_SEQPACKET') and hasattr(socket, 'send_fds')
+
+
+def _send(sock, message, fds=()):
+    data = json.dumps(message).encode()
+    if fds:
+        socket.send_fds(sock, [data], list(fds))
+    else:
+        sock.sendall(data)
+
+
+def _recv(sock):
+    data, fds, _, _ = socket.recv_fds(sock, MAX_MESSAGE, MAX_FDS)
+    if not data:
+        for fd in fds:
+            os.close(fd)
+        raise HandoffError("El proceso anterior cerró el relevo")
+    return json.loads(data), fds
+
+
+class HandoffChannel:
+    """
+    Lado del proceso viejo de un relevo: send_listener() y después
+    send_connection() por cada conexión; close() envía lo pendiente y "done".
+    Los sockets se duplican al encolarlos: el que llama puede cerrar el suyo.
+    """
+
+    def __init__(self, sock, connections=True):
+        self.sock = sock
+        self.connections = connections   # el proceso nuevo acepta conexiones abiertas
+        self.sent = 0
+        self._states = []
+        self._fds = []
+        self._lock = threading.Lock()
+
+    def send_listener(self, listener):
+        _send(self.sock, {'listener': True}, [listener.fileno()])
+
+    def send_connection(self, sock, state):
+        with self._lock:
+            self._fds.append(os.dup(sock.fileno()))
+            self._states.append(state)
+            if len(self._fds) >= MAX_FDS:
+                self._flush()
+
+    def close(self):
+        with self._lock:
+            try:
+                self._flush()
+                _send(self.sock, {'done': True})
+            except OSError:
+                pass
+            finally:
+                self.sock.close()
+
+    def _flush(self):
+        if not self._fds:
+            return
+        fds, self._fds = self._fds, []
+        states, self._states = self._states, []
+        try:
+            _send(self.sock, {'connections': states}, fds)
+            self.sent += len(fds)
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+
+class HandoffServer:
+    """
+    Escucha pedidos de relevo en un socket Unix (hilo propio). Con el primer
+    pedido deja de escuchar, borra la ruta para que la use el proceso nuevo y
+    llama a on_request(channel) desde el hilo del relevo.
+    """
+
+    def __init__(self, path, on_request, log=None):
+        self.path = path
+        self.on_request = on_request
+        self.log = log or (lambda message: None)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        self.sock.bind(path)
+        self.sock.listen(1)
+        self._thread = threading.Thread(target=self._run, name=f"handoff:{path}", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        sock, self.sock = self.sock, None
+        if sock is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            sock.close()
+
+    def _run(self):
+        sock = self.sock
+        while True:
+            try:
+                peer, _ = sock.accept()
+            except OSError:
+                return   # close()
+            try:
+                peer.settimeout(DEFAULT_TIMEOUT)
+                request, fds = _recv(peer)
+                for fd in fds:
+                    os.close(fd)
+            except (OSError, ValueError) as e:
+                self.log(f"[WARNING] Pedido de relevo inválido: {e}")
+                peer.close()
+                continue
+            self.close()
+            self.on_request(HandoffChannel(peer, connections=bool(request.get('connections'))))
+            return
+
+
+def takeover(path, connections=True, timeout=DEFAULT_TIMEOUT):
+    """
+    Pide el relevo al proceso que escucha en path. Devuelve (listener,
+    [(sock, estado), ...]); lanza HandoffError si no hay a quién relevar.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    listener = None
+    adopted = []
+    try:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise HandoffError(f"No hay un servidor escuchando en {path}") from e
+        _send(sock, {'connections': connections})
+        while True:
+            message, fds = _recv(sock)
+            if message.get('listener') and fds:
+                listener = socket.socket(fileno=fds[0])
+                for fd in fds[1:]:
+                    os.close(fd)
+            elif 'connections' in message:
+                for fd, state in zip(fds, message['connections']):
+                    adopted.append((socket.socket(fileno=fd), state))
+                for fd in fds[len(message['connections']):]:
+                    os.close(fd)
+            elif message.get('done'):
+                break
+            else:
+                for fd in fds:
+                    os.close(fd)
+    except BaseException:
+        if listener is not None:
+            listener.close()
+        for conn, _ in adopted:
+            conn.close()
+        raise
+    finally:
+        sock.close()
+    if listener is None:
+        for conn, _ in adopted:
+            conn.close()
+        raise HandoffError("El proceso anterior no envió el socket de escucha")
+    return listener, adopted
@@ -0,0 +1,236 @@
+"""
+Última posición conocida de cada equipo, en memoria, por IMEI.
+
+Despacho pregunta "dónde está el equipo X ahora" miles de veces por segundo y
+el log no sirve para eso. LastPositionIndex guarda la última posición de cada
+IMEI en columnas array (un slot por equipo, sin un dict ni un objeto por
+posición): fecha del equipo, recepción, lat/lon en enteros de 1/1800000 de
+grado, velocidad, rumbo y protocolo (0x12 o 0x16). update() y get() son O(1):
+un dict IMEI -> slot y una indexación por columna.
+
+snapshot() vuelca las columnas a un archivo (reemplazo atómico) y load() las
+recupera al arrancar: tras un reinicio se responde con las posiciones previas
+sin esperar a que cada equipo vuelva a reportar. El formato usa el orden de
+bytes de la máquina: es para el mismo servidor, no para intercambio.
+
+LastPositionServer expone el índice por HTTP en una dirección local:
+
+    GET /position/<imei>     {"imei": ..., "lat": ..., "lon": ..., ...} o 404
+    GET /positions           todas, como lista JSON
+
+y, si recibe también un índice espacial (gt06_spatial.GridIndex), consultas
+por zona que devuelven listas de posiciones:
+
+    GET /radius?lat=..&lon=..&meters=..
+    GET /bbox?south=..&west=..&north=..&east=..
+    GET /nearest?lat=..&lon=..&k=..          (con "meters" de cada una)
+"""
+
+import array
+import http.server
+import json
+import os
+import struct
+import threading
+import urllib.parse
+from collections import namedtuple
+
+MAGIC = b'GTLP'
+HEADER = struct.Struct('<4sI')     # magic + cantidad de slots
+
+# (nombre, código de array) en el orden del snapshot
+COLUMNS = (
+    ('fix_time', 'q'),      # fecha del equipo, epoch UTC
+    ('received_at', 'd'),   # recepción en el servidor, epoch
+    ('lat_raw', 'i'),       # 1/1800000 de grado, negativa al sur
+    ('lon_raw', 'i'),       # 1/1800000 de grado, negativa al oeste
+    ('speed', 'H'),
+    ('course', 'H'),
+    ('protocol', 'B'),
+)
+
+LastPosition = namedtuple('LastPosition', ['imei', 'fix_time', 'received_at', 'lat', 'lon',
+                                           'speed', 'course', 'protocol', 'lat_raw', 'lon_raw'])
+
+# Construcción directa de la tupla (como gt06_decoder: evita el __new__ de namedtuple)
+_new_position = lambda values: tuple.__new__(LastPosition, values)
+
+
+class LastPositionIndex:
+    """Última posición por IMEI en columnas array, con lock para lectores de otros hilos"""
+
+    def __init__(self):
+        self.slots = {}      # imei -> slot
+        self.imeis = []      # slot -> imei
+        self.columns = [array.array(code) for _, code in COLUMNS]
+        self.updates = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.imeis)
+
+    def update(self, imei, fix_time, received_at, lat_raw, lon_raw, speed, course, protocol=0x12):
+        """
+        Registra una posición; se ignora si es más vieja que la guardada
+        (datos en lote o reenvíos del equipo). Devuelve True si la guardó.
+        """
+        with self._lock:
+            slot = self.slots.get(imei)
+            if slot is None:
+                slot = self.slots[imei] = len(self.imeis)
+                self.imeis.append(imei)
+                for column, value in zip(self.columns, (fix_time, received_at, lat_raw, lon_raw,
+                                                        speed, course, protocol)):
+                    column.append(value)
+                self.updates += 1
+                return True
+            fix_times, received, lats, lons, speeds, courses, protocols = self.columns
+            if fix_time < fix_times[slot]:
+                return False
+            fix_times[slot] = fix_time
+            received[slot] = received_at
+            lats[slot] = lat_raw
+            lons[slot] = lon_raw
+            speeds[slot] = speed
+            courses[slot] = course
+            protocols[slot] = protocol
+            self.updates += 1
+            return True
+
+    def get(self, imei):
+        """LastPosition de imei, o None si nunca reportó"""
+        with self._lock:
+            slot = self.slots.get(imei)
+            if slot is None:
+                return None
+            return self._position(slot)
+
+    def all(self):
+        with self._lock:
+            return [self._position(slot) for slot in range(len(self.imeis))]
+
+    def _position(self, slot):
+        fix_times, received, lats, lons, speeds, courses, protocols = self.columns
+        lat_raw = lats[slot]
+        lon_raw = lons[slot]
+        return _new_position((self.imeis[slot], fix_times[slot], received[slot], lat_raw / 1800000.0,
+                              lon_raw / 1800000.0, speeds[slot], courses[slot], protocols[slot], lat_raw, lon_raw))
+
+    def snapshot(self, path):
+        """Vuelca el índice a path (se escribe aparte y se reemplaza de una vez)"""
+        with self._lock:
+            columns = [column.tobytes() for column in self.columns]
+            imeis = '\n'.join(self.imeis).encode('ascii')
+            count = len(self.imeis)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as stream:
+            stream.write(HEADER.pack(MAGIC, count))
+            for data in columns:
+                stream.write(data)
+            stream.write(imeis)
+        os.replace(tmp, path)
+        return count
+
+    def load(self, path):
+        """Reemplaza el contenido por el snapshot de path; devuelve la cantidad de equipos"""
+        with open(path, 'rb') as stream:
+            data = stream.read()
+        magic, count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} no es un snapshot de posiciones")
+        offset = HEADER.size
+        columns = []
+        for _, code in COLUMNS:
+            column = array.array(code)
+            size = count * column.itemsize
+            column.frombytes(data[offset:offset + size])
+            offset += size
+            columns.append(column)
+        imeis = data[offset:].decode('ascii').split('\n') if count else []
+        if len(imeis) != count or any(len(column) != count for column in columns):
+            raise ValueError(f"Snapshot de posiciones incompleto: {path}")
+        with self._lock:
+            self.columns = columns
+            self.imeis = imeis
+            self.slots = {imei: slot for slot, imei in enumerate(imeis)}
+        return count
+
+
+def position_json(position):
+    return {'imei': position.imei, 'fix_time': position.fix_time, 'received_at': position.received_at,
+            'lat': round(position.lat, 6), 'lon': round(position.lon, 6), 'speed': position.speed,
+            'course': position.course, 'protocol': position.protocol}
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'     # keep-alive: un cliente de despacho reutiliza la conexión
+    # Cabeceras y cuerpo en un solo envío (handle_one_request hace flush al terminar): sin
+    # buffer salían en dos y el ACK diferido del cliente demoraba cada respuesta ~40 ms
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        index = self.server.index
+        path, _, query = self.path.partition('?')
+        path = path.rstrip('/')
+        if path in ('/radius', '/bbox', '/nearest') and self.server.spatial is not None:
+            try:
+                self._reply(200, self._area(path, urllib.parse.parse_qs(query)))
+            except (KeyError, ValueError) as e:
+                self._reply(400, {'error': f"Parámetro faltante o inválido: {e}"})
+        elif path.startswith('/position/'):
+            position = index.get(path[len('/position/'):])
+            if position is None:
+                self._reply(404, {'error': 'IMEI sin posiciones'})
+            else:
+                self._reply(200, position_json(position))
+        elif path == '/positions':
+            self._reply(200, [position_json(position) for position in index.all()])
+        else:
+            self._reply(404, {'error': 'Ruta desconocida'})
+
+    def _area(self, path, params):
+        index = self.server.index
+        spatial = self.server.spatial
+        arg = lambda name: float(params[name][0])
+        if path == '/nearest':
+            found = spatial.nearest(arg('lat'), arg('lon'), int(params.get('k', ['1'])[0]))
+            result = []
+            for meters, imei in found:
+                position = index.get(imei)
+                if position is not None:
+                    result.append(dict(position_json(position), meters=round(meters, 1)))
+            return result
+        if path == '/radius':
+            imeis = spatial.radius(arg('lat'), arg('lon'), arg('meters'))
+        else:
+            imeis = spatial.bbox(arg('south'), arg('west'), arg('north'), arg('east'))
+        return [position_json(position) for position in map(index.get, imeis) if position is not None]
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass   # sin una línea por consulta en stderr
+
+
+class LastPositionServer(http.server.ThreadingHTTPServer):
+    """Consultas HTTP sobre index (y spatial, si está) en (host, port), desde hilos propios"""
+
+    daemon_threads = True
+
+    def __init__(self, index, host='127.0.0.1', port=0, spatial=None):
+        self.index = index
+        self.spatial = spatial
+        super().__init__((host, port), _Handler)
+        self._thread = threading.Thread(target=self.serve_forever, name=f"lastpos-http:{port}", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
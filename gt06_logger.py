@@ -0,0 +1,272 @@
+"""
+Logger con escritura en segundo plano para los servidores GT06.
+
+El log() original abre el archivo, escribe una línea, lo cierra e imprime en
+consola en cada llamada: con ~15 líneas por login las syscalls de archivo se
+llevan la mayor parte del costo por paquete, y un disco lento frena la red.
+
+BufferedLogWriter solo encola la línea (deque, O(1), sin bloquear). Un hilo
+escritor junta las líneas y las escribe en lotes, cuando se acumulan
+max_batch_lines o cada flush_interval segundos, rota el archivo al superar
+max_bytes y también hace el eco a consola. Si el disco no da abasto y la cola
+llega a max_queue, las líneas nuevas se descartan y se cuentan (nunca se
+bloquea al que llama).
+
+Niveles (ERROR/WARN/INFO/DEBUG): el nivel es global del proceso, se toma de la
+variable de entorno GT06_LOG_LEVEL (INFO por defecto) y se cambia en caliente
+con set_level(). log() deduce el nivel de la etiqueta del mensaje ([DEBUG],
+[WARNING], [ERROR]; el resto es INFO) y descarta lo deshabilitado sin encolarlo.
+Para que un volcado hex deshabilitado no cueste nada, el que llama lo protege:
+
+    if is_enabled(DEBUG):
+        log(f"[DEBUG] Paquete completo: {data.hex()}")
+"""
+
+import atexit
+import collections
+import datetime
+import os
+import sys
+import threading
+import time
+
+DEFAULT_MAX_BATCH_LINES = 512
+DEFAULT_FLUSH_INTERVAL = 0.5      # segundos
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+DEFAULT_MAX_QUEUE = 100000
+
+ERROR = 40
+WARN = 30
+INFO = 20
+DEBUG = 10
+
+LEVEL_NAMES = {'ERROR': ERROR, 'WARN': WARN, 'WARNING': WARN, 'INFO': INFO, 'DEBUG': DEBUG}
+
+
+def parse_level(level):
+    """Nivel a partir de su nombre ('debug', 'INFO'...) o de su valor numérico"""
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVEL_NAMES[str(level).strip().upper()]
+    except KeyError:
+        raise ValueError(f"Nivel de log desconocido: {level}") from None
+
+
+_level = parse_level(os.environ.get('GT06_LOG_LEVEL', 'INFO'))
+
+
+def set_level(level):
+    global _level
+    _level = parse_level(level)
+
+
+def get_level():
+    return _level
+
+
+def is_enabled(level):
+    return level >= _level
+
+
+def level_of(message):
+    """Nivel según la etiqueta con la que empieza el mensaje"""
+    if message.startswith('[DEBUG]'):
+        return DEBUG
+    if message.startswith('[ERROR]'):
+        return ERROR
+    if message.startswith('[WARNING]') or message.startswith('[WARN]'):
+        return WARN
+    return INFO
+
+
+class BufferedLogWriter:
+    """
+    Escritor de log asíncrono para un archivo (uno por ruta, ver get_logger)
+    """
+
+    def __init__(self, path, echo=True, max_batch_lines=DEFAULT_MAX_BATCH_LINES,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, max_bytes=DEFAULT_MAX_BYTES,
+                 backup_count=DEFAULT_BACKUP_COUNT, max_queue=DEFAULT_MAX_QUEUE):
+        self.path = path
+        self.echo = echo
+        self.max_batch_lines = max_batch_lines
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.max_queue = max_queue
+
+        self.queue = collections.deque()
+        self.dropped = 0
+        self.written = 0
+
+        self._wakeup = threading.Event()
+        self._flushed = threading.Condition()
+        self._flush_requests = 0
+        self._flush_done = 0
+        self._stopping = False
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._file = None
+
+        # Marca de tiempo cacheada por segundo (strftime en cada línea es caro)
+        self._ts_second = None
+        self._ts_text = ""
+
+    def _timestamp(self):
+        now = int(time.time())
+        if now != self._ts_second:
+            self._ts_text = datetime.datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")
+            self._ts_second = now
+        return self._ts_text
+
+    def log(self, message, level=None):
+        """
+        Encola "<timestamp> <message>" sin bloquear, si el nivel (explícito o
+        deducido de la etiqueta) está habilitado
+        """
+        if (level_of(message) if level is None else level) < _level:
+            return
+        self.write(f"{self._timestamp()} {message}")
+
+    def write(self, line):
+        """Encola una línea ya formateada sin bloquear"""
+        if self._thread is None:
+            self._start()
+        if len(self.queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self.queue.append(line)
+        if len(self.queue) >= self.max_batch_lines:
+            self._wakeup.set()
+
+    def flush(self, timeout=5.0):
+        """Espera a que todo lo encolado hasta ahora quede escrito"""
+        if self._thread is None:
+            return True
+        with self._flushed:
+            self._flush_requests += 1
+            target = self._flush_requests
+            self._wakeup.set()
+            return self._flushed.wait_for(lambda: self._flush_done >= target or not self._thread.is_alive(),
+                                          timeout)
+
+    def close(self, timeout=5.0):
+        """Escribe lo pendiente y detiene el hilo escritor"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        thread.join(timeout)
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=f"log-writer:{self.path}", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            with self._flushed:
+                target = self._flush_requests
+            self._drain()
+            with self._flushed:
+                self._flush_done = target
+                self._flushed.notify_all()
+            if self._stopping:
+                self._drain()
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _drain(self):
+        queue = self.queue
+        while queue:
+            batch = []
+            try:
+                for _ in range(self.max_batch_lines * 8):
+                    batch.append(queue.popleft())
+            except IndexError:
+                pass
+            if self.dropped:
+                dropped, self.dropped = self.dropped, 0
+                batch.append(f"{self._timestamp()} [WARNING] Logger: {dropped} líneas descartadas (disco lento)")
+            self._write_batch("\n".join(batch) + "\n")
+            self.written += len(batch)
+
+    def _write_batch(self, text):
+        try:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(text)
+            self._file.flush()
+            if self.max_bytes and self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            sys.stderr.write(f"[ERROR] Logger: no se pudo escribir {self.path}: {e}\n")
+            self._file = None
+        if self.echo:
+            try:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+            except (OSError, ValueError):
+                pass
+
+    def _rotate(self):
+        """datosChino.txt -> datosChino.txt.1 -> ... -> .<backup_count>"""
+        self._file.close()
+        self._file = None
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_logger(path, **kwargs):
+    """
+    Devuelve el escritor compartido para path (se crea en el primer uso y se
+    cierra, escribiendo lo pendiente, al terminar el proceso)
+    """
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            writer = _writers[path] = BufferedLogWriter(path, **kwargs)
+        return writer
+
+
+def _after_fork_in_child():
+    # Los hilos escritores no sobreviven al fork: el hijo empieza sin escritores
+    global _writers_lock
+    _writers.clear()
+    _writers_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def flush_all(timeout=5.0):
+    for writer in list(_writers.values()):
+        writer.flush(timeout)
+
+
+def close_all(timeout=5.0):
+    for writer in list(_writers.values()):
+        writer.close(timeout)
+
+
+atexit.register(close_all)
@@ -0,0 +1,153 @@
+"""
+Cola de salida por conexión para los servidores GT06.
+
+Los handlers llamaban conn.sendall() en línea desde el bucle de recepción y
+desde la rueda de temporizadores (reintentos de ACK, comandos diferidos) sin
+coordinarse: un equipo que no lee frena al servidor y dos hilos pueden
+intercalar bytes dentro de una trama. Ahora conn.sendall() solo encola la
+trama en un OutboundQueue (bajo lock, nunca bloquea) y el motor la envía:
+
+- Las respuestas a una ráfaga se envían juntas en una sola llamada, cuando
+  termina de procesarse el recv() que las generó: sendmsg() de hasta IOV_MAX
+  tramas sin concatenarlas, o un send() si suman menos de JOIN_MAX bytes
+  (para ACKs de 10 bytes copiar es más barato que armar el iovec).
+- Marcas de agua: con más de high bytes pendientes la cola queda en pausa y
+  el motor deja de leer de ese equipo (su propia ventana TCP lo frena) hasta
+  que lo pendiente baje de low.
+- Si lo pendiente superaría limit, el equipo no está leyendo: con la política
+  'drop' la trama nueva se descarta (y se cuenta); con 'disconnect' push()
+  lanza OutboundOverflow y el motor cierra la conexión.
+
+    queue = OutboundQueue(policy='disconnect')
+    queue.push(ack)                 # cualquier hilo
+    done = queue.send(sock)         # un solo hilo por conexión
+"""
+
+import collections
+import itertools
+import threading
+
+DEFAULT_HIGH_WATER = 64 * 1024
+DEFAULT_LOW_WATER = 16 * 1024
+DEFAULT_LIMIT = 256 * 1024
+IOV_MAX = 64                      # tramas por sendmsg()
+JOIN_MAX = 4096                   # hasta acá copiar a un solo buffer es más barato que armar el iovec
+
+POLICIES = ('drop', 'disconnect')
+
+
+def _frozen(data):
+    """
+    data sin copiar si nadie puede modificarlo: bytes o memoryview de solo
+    lectura (los ACKs de gt06_crc.ack_packet). Un buffer modificable se copia
+    porque el que llama puede reutilizarlo antes de que salga la trama.
+    """
+    if data.__class__ is bytes or (data.__class__ is memoryview and data.readonly):
+        return data
+    return bytes(data)
+
+
+class OutboundOverflow(ConnectionError):
+    """El equipo no lee: la cola de salida superó su límite (política 'disconnect')"""
+
+
+class OutboundQueue:
+    """
+    Tramas pendientes de una conexión. push() es seguro desde cualquier hilo;
+    send() lo llama un solo hilo a la vez (el del motor de la conexión).
+    """
+
+    __slots__ = ('frames', 'size', 'high', 'low', 'limit', 'policy', 'paused', 'dropped', '_lock')
+
+    def __init__(self, high=DEFAULT_HIGH_WATER, low=DEFAULT_LOW_WATER, limit=DEFAULT_LIMIT, policy='disconnect'):
+        if policy not in POLICIES:
+            raise ValueError(f"Política de cola de salida desconocida: {policy}")
+        self.frames = collections.deque()
+        self.size = 0              # bytes pendientes
+        self.high = high
+        self.low = low
+        self.limit = limit
+        self.policy = policy
+        self.paused = False        # True desde que size supera high hasta que baja de low
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.frames)
+
+    def push(self, data, backlog=0):
+        """
+        Encola una trama. backlog son bytes ya entregados a otro buffer (el
+        transporte de asyncio) que cuentan para el límite. Devuelve False si
+        se descartó (política 'drop'); lanza OutboundOverflow con 'disconnect'.
+        """
+        size = len(data)
+        with self._lock:
+            pending = self.size + backlog
+            if pending + size > self.limit:
+                if self.policy == 'drop':
+                    self.dropped += 1
+                    return False
+                raise OutboundOverflow(f"Cola de salida llena ({pending} bytes sin leer)")
+            self.frames.append(_frozen(data))
+            self.size += size
+            if self.size >= self.high:
+                self.paused = True
+            return True
+
+    def take(self):
+        """Saca todas las tramas pendientes (para un transporte con buffer propio)"""
+        with self._lock:
+            frames = list(self.frames)
+            self.frames.clear()
+            self.size = 0
+            self.paused = False
+            return frames
+
+    def send(self, sock):
+        """
+        Envía lo pendiente, hasta IOV_MAX tramas por llamada. Devuelve True
+        si la cola quedó vacía y False si el socket (no bloqueante) se llenó.
+        Los errores de socket distintos de BlockingIOError se propagan.
+        """
+        sendmsg = getattr(sock, 'sendmsg', None)   # no existe en Windows
+        frames = self.frames
+        while True:
+            with self._lock:
+                if not frames:
+                    self.paused = False
+                    return True
+                if len(frames) <= IOV_MAX:
+                    batch = list(frames)
+                    total = self.size
+                else:
+                    batch = list(itertools.islice(frames, IOV_MAX))
+                    total = sum(map(len, batch))
+            try:
+                if len(batch) == 1:
+                    sent = sock.send(batch[0])
+                elif total <= JOIN_MAX or sendmsg is None:
+                    sent = sock.send(b''.join(batch))
+                else:
+                    sent = sendmsg(batch)
+            except (BlockingIOError, InterruptedError):
+                return False
+            with self._lock:
+                self.size -= sent
+                if sent == total:
+                    for _ in batch:
+                        frames.popleft()
+                else:
+                    remaining = sent
+                    while remaining:
+                        first = frames[0]
+                        if remaining >= len(first):
+                            frames.popleft()
+                            remaining -= len(first)
+                        else:
+                            frames[0] = first[remaining:]
+                            remaining = 0
+                if self.paused and self.size <= self.low:
+                    self.paused = False
+            if sent < total:
+                return False
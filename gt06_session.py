@@ -0,0 +1,186 @@
+"""
+Sesiones de los equipos GT06.
+
+El estado de cada conexión era un dict libre de ~10 claves guardado en
+connection_data[conn]: se perdía en cada reconexión y ocupaba varios KB.
+Session es un objeto con __slots__ (sin __dict__ por instancia) y
+SessionRegistry lo indexa por conexión y, cuando el login trae el IMEI,
+también por IMEI. Cuando un equipo reconecta, su nueva sesión hereda lo que
+ya se sabe del equipo (login_ack_type), así no hay que volver a adivinar el
+orden del CRC.
+
+Las sesiones quedan indexadas por IMEI después de cerrar la conexión y se
+eliminan al pasar idle_ttl segundos sin actividad: el índice por IMEI está
+ordenado por última actividad, así evict_idle() solo recorre las vencidas.
+"""
+
+import collections
+import threading
+import time
+
+from gt06_framer import GT06Framer
+
+DEFAULT_IDLE_TTL = 30 * 60    # segundos sin actividad antes de olvidar un equipo
+
+# Lo que pasa al proceso nuevo en un reinicio sin corte (gt06_handoff); los
+# temporizadores y reintentos en curso no
+HANDOFF_FIELDS = (
+    'imei', 'login_serial', 'login_ack_type', 'login_completed',
+    'ack_success', 'current_ack_type', 'verified',
+    'transmission_mode', 'first_packet',
+    'direct_cfg_sent', 'position_request_sent', 'heartbeat_interval',
+)
+
+
+class Session:
+    """Estado de un equipo conectado (antes, el dict de connection_data[conn])"""
+
+    __slots__ = (
+        'conn', 'imei', 'last_seen',
+        'login_serial', 'login_ack_type', 'login_completed',
+        'retry_sent', 'ack_success', 'ack_attempts', 'current_ack_type',
+        'connection_closed', 'verified', 'timers',
+        'transmission_mode', 'handlers', 'first_packet',
+        'direct_cfg_sent', 'position_request_sent',
+        'heartbeat_at', 'heartbeat_interval',
+        'framer',
+    )
+
+    def __init__(self, conn=None):
+        self.conn = conn
+        self.imei = None
+        self.last_seen = time.monotonic()
+        self.login_serial = None
+        self.login_ack_type = None       # 'itu_le' o 'itu_be', se conserva entre reconexiones
+        self.login_completed = False
+        self.retry_sent = False
+        self.ack_success = False
+        self.ack_attempts = 0
+        self.current_ack_type = None
+        self.connection_closed = False
+        self.verified = False            # los primeros bytes fueron 7878/7979
+        self.timers = None               # temporizadores por nombre (se crea al primer uso)
+        self.transmission_mode = None    # 'login' o 'direct'
+        self.handlers = None             # handlers de su modo (gt06_dispatch), se resuelven al cambiar
+        self.first_packet = True
+        self.direct_cfg_sent = False
+        self.position_request_sent = False
+        self.heartbeat_at = None         # último heartbeat 0x23 (time.monotonic)
+        self.heartbeat_interval = None   # cadencia observada entre los dos últimos
+        self.framer = GT06Framer()       # Reensamblado de tramas del flujo TCP
+
+    def __repr__(self):
+        return f"<Session imei={self.imei} mode={self.transmission_mode} closed={self.connection_closed}>"
+
+    def export_state(self):
+        """Estado serializable (JSON) para pasar la conexión a otro proceso"""
+        state = {}
+        for name in HANDOFF_FIELDS:
+            value = getattr(self, name)
+            # bytes (login_serial) viajan en hex
+            state[name] = {'hex': value.hex()} if isinstance(value, bytes) else value
+        state['buffer'] = bytes(self.framer.buffer).hex() if self.framer is not None else ''
+        return state
+
+    def restore_state(self, state):
+        """Inverso de export_state(), sobre una sesión recién abierta"""
+        for name in HANDOFF_FIELDS:
+            if name in state:
+                value = state[name]
+                setattr(self, name, bytes.fromhex(value['hex']) if isinstance(value, dict) else value)
+        if state.get('buffer'):
+            self.framer.buffer += bytes.fromhex(state['buffer'])
+
+
+class SessionRegistry:
+    """
+    Sesiones indexadas por conexión (las abiertas) y por IMEI (las que
+    hicieron login, abiertas o cerradas hace menos de idle_ttl)
+    """
+
+    def __init__(self, idle_ttl=DEFAULT_IDLE_TTL):
+        self.idle_ttl = idle_ttl
+        self.by_conn = {}
+        self.by_imei = collections.OrderedDict()   # de la menos a la más recientemente activa
+        self.evicted = 0
+        self.resumed = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.by_conn)
+
+    def open(self, conn):
+        """Sesión nueva para una conexión entrante"""
+        session = Session(conn)
+        with self._lock:
+            self.by_conn[conn] = session
+        return session
+
+    def get(self, conn):
+        return self.by_conn.get(conn)
+
+    def find(self, imei):
+        return self.by_imei.get(imei)
+
+    def bind_imei(self, session, imei):
+        """
+        Asocia la sesión al IMEI del login. Si el equipo ya tenía una sesión
+        (reconexión), la nueva hereda lo que se sabía de él y la reemplaza en
+        el índice. Devuelve la sesión anterior o None.
+        """
+        with self._lock:
+            previous = self.by_imei.get(imei)
+            if previous is not None and previous is not session:
+                if session.login_ack_type is None:
+                    session.login_ack_type = previous.login_ack_type
+                self.resumed += 1
+            elif previous is session:
+                previous = None
+            session.imei = imei
+            session.last_seen = time.monotonic()
+            self.by_imei[imei] = session
+            self.by_imei.move_to_end(imei)
+            return previous
+
+    def touch(self, session):
+        """Marca actividad (una vez por recv)"""
+        session.last_seen = time.monotonic()
+        imei = session.imei
+        if imei is not None:
+            with self._lock:
+                current = self.by_imei.get(imei)
+                if current is session:
+                    self.by_imei.move_to_end(imei)
+                elif current is None and not session.connection_closed:
+                    # Conexión abierta que se había olvidado por inactividad
+                    self.by_imei[imei] = session
+
+    def close(self, conn):
+        """
+        Quita la conexión del índice y marca la sesión cerrada. Si hizo login
+        sigue en el índice por IMEI hasta que venza idle_ttl.
+        """
+        with self._lock:
+            session = self.by_conn.pop(conn, None)
+        if session is not None:
+            session.connection_closed = True
+            session.conn = None
+            session.framer = None
+        return session
+
+    def evict_idle(self, now=None):
+        """Olvida los equipos sin actividad hace más de idle_ttl. O(vencidos)."""
+        if now is None:
+            now = time.monotonic()
+        limit = now - self.idle_ttl
+        evicted = 0
+        with self._lock:
+            by_imei = self.by_imei
+            while by_imei:
+                imei, session = next(iter(by_imei.items()))
+                if session.last_seen > limit:
+                    break
+                del by_imei[imei]
+                evicted += 1
+            self.evicted += evicted
+        return evicted
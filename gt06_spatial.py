@@ -0,0 +1,209 @@
+"""
+Índice espacial de las últimas posiciones de los equipos (grilla uniforme).
+
+"Qué unidades están a menos de 500 m de este punto" obligaba a recorrer todas
+las posiciones. GridIndex reparte los equipos en celdas de cell_size grados
+(por defecto 0,0025°, ~280 m de latitud) y se actualiza con cada posición:
+si el equipo no cambió de celda solo se reemplazan sus coordenadas; si
+cambió, pasa de un set al otro. Las consultas solo miran las celdas que
+pueden tener resultados:
+
+    bbox(sur, oeste, norte, este)       IMEIs dentro del rectángulo
+    radius(lat, lon, metros)            IMEIs a esa distancia o menos
+    nearest(lat, lon, k)                [(metros, imei)] de los k más cercanos
+
+Las celdas enteras dentro de la consulta se agregan sin mirar cada equipo.
+nearest() recorre anillos de celdas alrededor del punto hasta que el anillo
+siguiente ya no puede tener a nadie más cerca que el k-ésimo encontrado.
+
+Las coordenadas se guardan como los enteros del equipo (1/1800000 de grado,
+con signo). Las distancias usan la aproximación equirectangular: a escala de
+ciudad el error es despreciable frente al del GPS.
+"""
+
+import heapq
+import math
+import threading
+
+RAW_PER_DEGREE = 1800000
+METERS_PER_DEGREE = 111320.0
+METERS_PER_RAW = METERS_PER_DEGREE / RAW_PER_DEGREE
+DEFAULT_CELL_SIZE = 0.0025      # grados
+
+
+def _key(ix, iy):
+    return (ix << 32) | (iy & 0xFFFFFFFF)
+
+
+def _unkey(key):
+    iy = key & 0xFFFFFFFF
+    if iy >= 0x80000000:
+        iy -= 0x100000000
+    return key >> 32, iy
+
+
+def _raw(degrees):
+    return round(degrees * RAW_PER_DEGREE)
+
+
+class GridIndex:
+    """Equipos por celda de la grilla, con lock para consultas desde otros hilos"""
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell = max(1, _raw(cell_size))   # lado de la celda en unidades del equipo
+        self.cells = {}                        # clave de celda -> set de IMEIs
+        self.positions = {}                    # imei -> (lat_raw, lon_raw, clave de celda)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.positions)
+
+    def update(self, imei, lat_raw, lon_raw):
+        cell = self.cell
+        key = _key(lat_raw // cell, lon_raw // cell)
+        with self._lock:
+            previous = self.positions.get(imei)
+            self.positions[imei] = (lat_raw, lon_raw, key)
+            if previous is not None:
+                if previous[2] == key:
+                    return
+                self._leave(imei, previous[2])
+            members = self.cells.get(key)
+            if members is None:
+                members = self.cells[key] = set()
+            members.add(imei)
+
+    def remove(self, imei):
+        with self._lock:
+            previous = self.positions.pop(imei, None)
+            if previous is not None:
+                self._leave(imei, previous[2])
+
+    def _leave(self, imei, key):
+        members = self.cells[key]
+        members.discard(imei)
+        if not members:
+            del self.cells[key]
+
+    def _cell_range(self, low, high):
+        return range(low // self.cell, high // self.cell + 1)
+
+    def _candidate_cells(self, south, west, north, east):
+        """(ix, iy, set) de las celdas pobladas que tocan el rectángulo (unidades del equipo)"""
+        rows = self._cell_range(south, north)
+        columns = self._cell_range(west, east)
+        cells = self.cells
+        if len(rows) * len(columns) > len(cells):
+            # Rectángulo más grande que la parte poblada: más barato recorrer las celdas con equipos
+            for key, members in cells.items():
+                ix, iy = _unkey(key)
+                if ix in rows and iy in columns:
+                    yield ix, iy, members
+            return
+        for ix in rows:
+            for iy in columns:
+                members = cells.get(_key(ix, iy))
+                if members:
+                    yield ix, iy, members
+
+    def bbox(self, south, west, north, east):
+        """IMEIs con south <= lat <= north y west <= lon <= east (grados)"""
+        south, west, north, east = _raw(south), _raw(west), _raw(north), _raw(east)
+        cell = self.cell
+        result = []
+        with self._lock:
+            positions = self.positions
+            for ix, iy, members in self._candidate_cells(south, west, north, east):
+                if (south <= ix * cell and (ix + 1) * cell - 1 <= north
+                        and west <= iy * cell and (iy + 1) * cell - 1 <= east):
+                    result.extend(members)
+                    continue
+                for imei in members:
+                    lat, lon, _ = positions[imei]
+                    if south <= lat <= north and west <= lon <= east:
+                        result.append(imei)
+        return result
+
+    def radius(self, lat, lon, meters):
+        """IMEIs a meters metros o menos de (lat, lon)"""
+        lat0, lon0 = _raw(lat), _raw(lon)
+        scale = math.cos(math.radians(lat))          # metros de longitud por metro de latitud
+        reach = meters / METERS_PER_RAW               # radio en unidades de latitud
+        reach_lon = reach / max(scale, 1e-6)
+        limit = reach * reach
+        cell = self.cell
+        result = []
+        with self._lock:
+            positions = self.positions
+            for ix, iy, members in self._candidate_cells(int(lat0 - reach), int(lon0 - reach_lon),
+                                                         int(lat0 + reach) + 1, int(lon0 + reach_lon) + 1):
+                # Celda entera dentro del círculo: su esquina más lejana lo está
+                far_lat = max(abs(ix * cell - lat0), abs((ix + 1) * cell - lat0))
+                far_lon = max(abs(iy * cell - lon0), abs((iy + 1) * cell - lon0)) * scale
+                if far_lat * far_lat + far_lon * far_lon <= limit:
+                    result.extend(members)
+                    continue
+                for imei in members:
+                    lat_raw, lon_raw, _ = positions[imei]
+                    d_lat = lat_raw - lat0
+                    d_lon = (lon_raw - lon0) * scale
+                    if d_lat * d_lat + d_lon * d_lon <= limit:
+                        result.append(imei)
+        return result
+
+    def nearest(self, lat, lon, k=1, max_meters=None):
+        """[(metros, imei)] de los k equipos más cercanos a (lat, lon), del más cercano al más lejano"""
+        lat0, lon0 = _raw(lat), _raw(lon)
+        scale = math.cos(math.radians(lat))
+        cell = self.cell
+        cx, cy = lat0 // cell, lon0 // cell
+        limit = (max_meters / METERS_PER_RAW) ** 2 if max_meters is not None else math.inf
+        heap = []          # (-distancia², imei): los k mejores, el peor arriba
+        with self._lock:
+            positions = self.positions
+            cells = self.cells
+
+            def visit(members):
+                for imei in members:
+                    lat_raw, lon_raw, _ = positions[imei]
+                    d_lat = lat_raw - lat0
+                    d_lon = (lon_raw - lon0) * scale
+                    distance = d_lat * d_lat + d_lon * d_lon
+                    if distance > limit:
+                        continue
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-distance, imei))
+                    elif distance < -heap[0][0]:
+                        heapq.heapreplace(heap, (-distance, imei))
+
+            ring = 0
+            visited = 0
+            while visited < len(positions) and k > 0:
+                if (2 * ring + 1) ** 2 > 4 * len(cells):
+                    # Anillos más grandes que la parte poblada: se revisan las celdas que faltan
+                    for key, members in cells.items():
+                        ix, iy = _unkey(key)
+                        if max(abs(ix - cx), abs(iy - cy)) >= ring:
+                            visit(members)
+                    break
+                # Lo más cerca que puede estar un equipo del anillo: (ring - 1) celdas, en el eje más corto
+                bound = max(ring - 1, 0) * cell * min(scale, 1.0)
+                if (len(heap) == k and bound * bound > -heap[0][0]) or bound * bound > limit:
+                    break
+                for ix in range(cx - ring, cx + ring + 1):
+                    step = 1 if abs(ix - cx) == ring else 2 * ring
+                    for iy in range(cy - ring, cy + ring + 1, max(step, 1)):
+                        members = cells.get(_key(ix, iy))
+                        if members:
+                            visited += len(members)
+                            visit(members)
+                ring += 1
+        return sorted((math.sqrt(-distance) * METERS_PER_RAW, imei) for distance, imei in heap)
+
+    def rebuild(self, positions):
+        """Reemplaza el contenido por positions: iterable de (imei, lat_raw, lon_raw)"""
+        with self._lock:
+            self.cells = {}
+            self.positions = {}
+        for imei, lat_raw, lon_raw in positions:
+            self.update(imei, lat_raw, lon_raw)
@@ -0,0 +1,225 @@
+"""
+Almacenamiento de posiciones en SQLite para los servidores GT06.
+
+parse_position() solo dejaba la posición decodificada en datosChino.txt y
+cada consumidor tenía que volver a parsear el log. PositionStore recibe las
+posiciones ya decodificadas (0x12 y las alarmas 0x16 con GPS posicionado,
+distinguidas por la columna protocol) y las escribe en la tabla positions de
+una base SQLite en modo WAL (los lectores no bloquean al escritor ni al revés).
+
+Como el logger, add() solo encola la fila (deque, O(1), sin bloquear) y un
+hilo propio las escribe: una transacción por lote de batch_size filas o cada
+flush_interval segundos, lo que llegue primero (group commit). Cada lote es
+un executemany() del mismo INSERT, que sqlite3 compila una vez y reutiliza
+desde su caché de sentencias. Si la base no da abasto y la cola llega a
+max_queue, las filas nuevas se descartan y se cuentan.
+
+Las coordenadas se guardan como los enteros del equipo (1/1800000 de grado,
+negativos al sur y al oeste): lat = lat_raw / 1800000.0.
+
+    store = get_position_store('posiciones.db')
+    store.add((imei, fix_time, received_at, lat_raw, lon_raw, speed, course, satellites, serial, protocol))
+"""
+
+import atexit
+import collections
+import os
+import sqlite3
+import sys
+import threading
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_FLUSH_INTERVAL = 0.5      # segundos
+DEFAULT_MAX_QUEUE = 200000
+BUSY_TIMEOUT = 30.0               # espera por el lock de escritura (varios workers, misma base)
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS positions (
+        id INTEGER PRIMARY KEY,
+        imei TEXT,                  -- NULL en modo directo sin login
+        fix_time INTEGER,           -- fecha del equipo (epoch UTC), NULL si es inválida
+        received_at REAL NOT NULL,  -- recepción en el servidor (epoch)
+        lat_raw INTEGER NOT NULL,   -- 1/1800000 de grado, negativa al sur
+        lon_raw INTEGER NOT NULL,   -- 1/1800000 de grado, negativa al oeste
+        speed INTEGER,              -- km/h
+        course INTEGER,             -- grados
+        satellites INTEGER,
+        serial INTEGER,
+        protocol INTEGER            -- 0x12 posición, 0x16 alarma; NULL en bases anteriores a la columna
+    )""",
+    "CREATE INDEX IF NOT EXISTS positions_imei_time ON positions (imei, fix_time)",
+)
+
+INSERT = ("INSERT INTO positions (imei, fix_time, received_at, lat_raw, lon_raw, speed, course, satellites, serial, "
+          "protocol) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+
+def connect(path, timeout=BUSY_TIMEOUT):
+    """Conexión a la base en modo WAL con el esquema creado"""
+    db = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    # En WAL, NORMAL no sincroniza en cada commit: un corte de luz puede perder
+    # los últimos lotes, nunca corromper la base
+    db.execute("PRAGMA synchronous=NORMAL")
+    for statement in SCHEMA:
+        db.execute(statement)
+    if 'protocol' not in {row[1] for row in db.execute("PRAGMA table_info(positions)")}:
+        # Base creada antes de la columna protocol
+        try:
+            db.execute("ALTER TABLE positions ADD COLUMN protocol INTEGER")
+        except sqlite3.OperationalError:
+            pass   # otro worker la agregó primero
+    return db
+
+
+class PositionStore:
+    """
+    Escritor de posiciones en segundo plano para una base (una por ruta, ver
+    get_position_store)
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 max_queue=DEFAULT_MAX_QUEUE):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+
+        self.queue = collections.deque()
+        self.dropped = 0       # descartadas con la cola llena
+        self.failed = 0        # perdidas por errores de SQLite
+        self.written = 0
+        self.commits = 0
+
+        self._wakeup = threading.Event()
+        self._flushed = threading.Condition()
+        self._flush_requests = 0
+        self._flush_done = 0
+        self._stopping = False
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def add(self, row):
+        """Encola una fila (en el orden de INSERT) sin bloquear"""
+        if self._thread is None:
+            self._start()
+        if len(self.queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self.queue.append(row)
+        if len(self.queue) >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self, timeout=5.0):
+        """Espera a que todo lo encolado hasta ahora quede confirmado en la base"""
+        if self._thread is None:
+            return True
+        with self._flushed:
+            self._flush_requests += 1
+            target = self._flush_requests
+            self._wakeup.set()
+            return self._flushed.wait_for(lambda: self._flush_done >= target or not self._thread.is_alive(),
+                                          timeout)
+
+    def close(self, timeout=5.0):
+        """Escribe lo pendiente y detiene el hilo"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        thread.join(timeout)
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=f"position-store:{self.path}", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        db = None
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            with self._flushed:
+                target = self._flush_requests
+            if self.queue:
+                if db is None:
+                    db = self._connect()
+                self._drain(db)
+            with self._flushed:
+                self._flush_done = target
+                self._flushed.notify_all()
+            if self._stopping:
+                if self.queue and db is not None:
+                    self._drain(db)
+                if db is not None:
+                    db.close()
+                return
+
+    def _connect(self):
+        try:
+            return connect(self.path)
+        except sqlite3.Error as e:
+            sys.stderr.write(f"[ERROR] Posiciones: no se pudo abrir {self.path}: {e}\n")
+            return None
+
+    def _drain(self, db):
+        queue = self.queue
+        while queue:
+            batch = []
+            try:
+                for _ in range(self.batch_size):
+                    batch.append(queue.popleft())
+            except IndexError:
+                pass
+            if db is None:
+                self.failed += len(batch)
+                continue
+            try:
+                db.execute("BEGIN")
+                db.executemany(INSERT, batch)
+                db.execute("COMMIT")
+            except sqlite3.Error as e:
+                if db.in_transaction:
+                    db.execute("ROLLBACK")
+                self.failed += len(batch)
+                sys.stderr.write(f"[ERROR] Posiciones: no se pudieron escribir {len(batch)} filas: {e}\n")
+                continue
+            self.written += len(batch)
+            self.commits += 1
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_position_store(path, **kwargs):
+    """
+    Devuelve el escritor compartido para path (se crea en el primer uso y se
+    cierra, escribiendo lo pendiente, al terminar el proceso)
+    """
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = PositionStore(path, **kwargs)
+        return store
+
+
+def close_all(timeout=5.0):
+    for store in list(_stores.values()):
+        store.close(timeout)
+
+
+def _after_fork_in_child():
+    # El hilo no sobrevive al fork: el hijo empieza sin escritores
+    global _stores_lock
+    _stores.clear()
+    _stores_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+atexit.register(close_all)
@@ -0,0 +1,292 @@
+"""
+Modo multiproceso de los servidores GT06.
+
+Un proceso Python usa un solo núcleo. Supervisor hace fork de N workers y
+cada uno abre su propio socket de escucha en el mismo puerto con
+SO_REUSEPORT: el kernel reparte las conexiones entrantes entre ellos. El
+supervisor no atiende equipos: reinicia los workers que terminan (con espera
+creciente si se caen en seguida de arrancar), recibe las estadísticas que
+cada uno le manda por un pipe y las registra sumadas.
+
+    supervisor = Supervisor(4, run_worker, log=log)
+    supervisor.run()
+
+target(index, report) corre en el proceso hijo: index va de 0 a N-1 y se
+conserva al reiniciar; report(stats) manda al supervisor un dict de
+contadores (una línea JSON por el pipe, se descarta si el pipe está lleno).
+Los contadores acumulados de un worker que terminó se conservan en el total;
+los de GAUGES (valores instantáneos) no.
+
+Solo Unix (os.fork y SO_REUSEPORT). create_listener() sirve también para el
+modo de un proceso: SO_REUSEADDR evita el EADDRINUSE al reiniciar el servidor
+mientras quedan sockets en TIME_WAIT. set_keepalive() ajusta el TCP keepalive
+de los sockets aceptados.
+"""
+
+import atexit
+import json
+import os
+import selectors
+import signal
+import socket
+import sys
+import time
+import traceback
+
+DEFAULT_REPORT_INTERVAL = 60.0    # segundos entre líneas [STATS] del supervisor
+RESTART_DELAY_MIN = 1.0           # espera antes de reiniciar un worker que se cayó al arrancar
+RESTART_DELAY_MAX = 30.0
+STABLE_AFTER = 10.0               # un worker que vivió esto se reinicia sin espera
+SHUTDOWN_TIMEOUT = 10.0           # SIGTERM a los workers; SIGKILL a los que sigan vivos después
+
+GAUGES = ('open', 'sessions', 'positions')
+
+
+def supported():
+    """True si el sistema permite el modo multiproceso"""
+    return hasattr(os, 'fork') and hasattr(socket, 'SO_REUSEPORT')
+
+
+def create_listener(host, port, backlog=socket.SOMAXCONN, reuse_port=False):
+    """
+    Socket TCP de escucha con SO_REUSEADDR y, si reuse_port, SO_REUSEPORT
+    (varios procesos escuchando en el mismo puerto)
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        if os.name != 'nt':
+            # En Windows SO_REUSEADDR permite que otro proceso robe el puerto
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((host, port))
+        sock.listen(backlog)
+    except BaseException:
+        sock.close()
+        raise
+    return sock
+
+
+def set_keepalive(sock, idle, interval, count):
+    """
+    TCP keepalive en un socket aceptado: tras idle s sin tráfico el kernel
+    sondea cada interval s y corta la conexión después de count sondeos sin
+    respuesta (equipos GPRS que desaparecen sin FIN)
+    """
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle)
+    elif hasattr(socket, 'TCP_KEEPALIVE'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle)   # macOS
+    if hasattr(socket, 'TCP_KEEPINTVL'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval)
+    if hasattr(socket, 'TCP_KEEPCNT'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count)
+
+
+class Worker:
+    """Proceso hijo del supervisor (uno por índice, se reutiliza al reiniciar)"""
+
+    __slots__ = ('index', 'pid', 'pipe', 'buffer', 'started', 'failures', 'restart_at', 'stats')
+
+    def __init__(self, index):
+        self.index = index
+        self.pid = None
+        self.pipe = None
+        self.buffer = b''
+        self.started = 0.0
+        self.failures = 0          # caídas seguidas antes de STABLE_AFTER
+        self.restart_at = None     # momento del próximo reinicio (None si está vivo)
+        self.stats = {}            # último reporte recibido
+
+
+class Supervisor:
+    """
+    Lanza y vigila N workers. run() bloquea hasta recibir SIGTERM o SIGINT y
+    entonces detiene los workers.
+    """
+
+    def __init__(self, workers, target, log=None, report_interval=DEFAULT_REPORT_INTERVAL,
+                 shutdown_timeout=SHUTDOWN_TIMEOUT):
+        self.workers = [Worker(index) for index in range(workers)]
+        self.target = target
+        self.log = log or (lambda message: sys.stderr.write(message + "\n"))
+        self.report_interval = report_interval
+        self.shutdown_timeout = shutdown_timeout
+        self.restarts = 0
+        self.retired = {}          # contadores de los workers que ya terminaron
+        self._selector = selectors.DefaultSelector()
+        self._stopping = False
+
+    def run(self):
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._on_signal)
+        self.log(f"[INFO] Supervisor (pid {os.getpid()}): lanzando {len(self.workers)} workers")
+        for worker in self.workers:
+            self._spawn(worker)
+
+        next_report = time.monotonic() + self.report_interval
+        while not self._stopping:
+            self._poll(0.5)
+            self._reap()
+            now = time.monotonic()
+            for worker in self.workers:
+                if worker.restart_at is not None and now >= worker.restart_at and not self._stopping:
+                    self.restarts += 1
+                    self._spawn(worker)
+            if now >= next_report:
+                self.log(f"[STATS] {self.summary()}")
+                next_report = now + self.report_interval
+        self._shutdown()
+        self.log(f"[STATS] {self.summary()}")
+
+    def totals(self):
+        """Suma de las estadísticas de todos los workers (vivos y terminados)"""
+        totals = dict(self.retired)
+        for worker in self.workers:
+            for key, value in worker.stats.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def summary(self):
+        alive = sum(1 for worker in self.workers if worker.pid is not None)
+        counters = " ".join(f"{key}={value}" for key, value in sorted(self.totals().items()))
+        return f"workers {alive}/{len(self.workers)}, reinicios {self.restarts}: {counters}"
+
+    def _on_signal(self, signum, frame):
+        self._stopping = True
+
+    def _spawn(self, worker):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            self._run_child(worker, read_fd, write_fd)
+        os.close(write_fd)
+        os.set_blocking(read_fd, False)
+        worker.pid = pid
+        worker.pipe = read_fd
+        worker.buffer = b''
+        worker.started = time.monotonic()
+        worker.restart_at = None
+        worker.stats = {}
+        self._selector.register(read_fd, selectors.EVENT_READ, worker)
+        self.log(f"[INFO] Worker {worker.index} iniciado (pid {pid})")
+
+    def _run_child(self, worker, read_fd, write_fd):
+        """Proceso hijo: nunca vuelve al bucle del supervisor"""
+        status = 0
+        try:
+            os.close(read_fd)
+            for other in self.workers:
+                if other.pipe is not None:
+                    os.close(other.pipe)
+            self._selector.close()
+            # Ctrl+C llega a todo el grupo: el que decide el apagado es el supervisor
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.set_blocking(write_fd, False)
+
+            def report(stats):
+                try:
+                    os.write(write_fd, (json.dumps(stats) + "\n").encode())
+                except BlockingIOError:
+                    pass
+
+            self.target(worker.index, report)
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except BaseException:
+            traceback.print_exc()
+            status = 1
+        finally:
+            # os._exit no corre atexit: escribir el log pendiente antes de salir
+            try:
+                atexit._run_exitfuncs()
+            finally:
+                os._exit(status)
+
+    def _poll(self, timeout):
+        for key, _ in self._selector.select(timeout):
+            self._read(key.data)
+
+    def _read(self, worker):
+        while worker.pipe is not None:
+            try:
+                chunk = os.read(worker.pipe, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                self._selector.unregister(worker.pipe)
+                os.close(worker.pipe)
+                worker.pipe = None
+                break
+            lines = (worker.buffer + chunk).split(b"\n")
+            worker.buffer = lines.pop()
+            for line in reversed(lines):
+                try:
+                    worker.stats = json.loads(line)
+                    break
+                except ValueError:
+                    continue
+
+    def _reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                # Sin hijos: los que figuraban vivos ya no existen
+                for worker in self.workers:
+                    if worker.pid is not None:
+                        self._exited(worker, 0)
+                return
+            if pid == 0:
+                return
+            worker = next((w for w in self.workers if w.pid == pid), None)
+            if worker is not None:
+                self._exited(worker, os.waitstatus_to_exitcode(status))
+
+    def _exited(self, worker, code):
+        if worker.pipe is not None:
+            os.set_blocking(worker.pipe, True)
+            self._read(worker)
+        for key, value in worker.stats.items():
+            if key not in GAUGES:
+                self.retired[key] = self.retired.get(key, 0) + value
+        worker.stats = {}
+        pid, worker.pid = worker.pid, None
+        if self._stopping:
+            return
+
+        now = time.monotonic()
+        if now - worker.started >= STABLE_AFTER:
+            worker.failures = 0
+            delay = 0.0
+        else:
+            worker.failures += 1
+            delay = min(RESTART_DELAY_MIN * 2 ** (worker.failures - 1), RESTART_DELAY_MAX)
+        worker.restart_at = now + delay
+        reason = f"señal {-code}" if code < 0 else f"código {code}"
+        self.log(f"[WARNING] Worker {worker.index} (pid {pid}) terminó ({reason}), reinicio en {delay:.0f} s")
+
+    def _shutdown(self):
+        self.log("[INFO] Supervisor: deteniendo workers")
+        for worker in self.workers:
+            if worker.pid is not None:
+                try:
+                    os.kill(worker.pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+        deadline = time.monotonic() + self.shutdown_timeout
+        while any(worker.pid is not None for worker in self.workers):
+            if time.monotonic() >= deadline:
+                for worker in self.workers:
+                    if worker.pid is not None:
+                        self.log(f"[WARNING] Worker {worker.index} (pid {worker.pid}) no terminó, SIGKILL")
+                        try:
+                            os.kill(worker.pid, signal.SIGKILL)
+                        except ProcessLookupError:
+                            pass
+                deadline = float('inf')
+            self._poll(0.1)
+            self._reap()
+        self._selector.close()
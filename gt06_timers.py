@@ -0,0 +1,190 @@
+"""
+Temporizadores compartidos para los servidores GT06.
+
+auto_retry_ack, el pedido de posición diferido y la secuencia de configuración
+de GT06_TRACKER_ADVANCED usaban un hilo con time.sleep() por conexión: con
+miles de equipos reconectando a la vez (caída de una antena) son miles de
+hilos dormidos. TimerWheel es una rueda de tiempo hasheada atendida por un
+único hilo: cada temporizador cae en la ranura de su tick, schedule() y
+cancel() son O(1) y en cada tick solo se revisa una ranura. Dentro de la
+ranura los temporizadores se agrupan por tick de vencimiento (un set por
+vuelta), así que un tick solo toca los que vencen en él: los de vueltas
+siguientes, como el 'idle' de 10 minutos de cada conexión, no se revisan en
+cada pasada de la rueda.
+
+    timers = get_timer_wheel()
+    timer = timers.schedule(2.0, send_alternative_ack, serial, conn, 'itu_be')
+    timers.cancel(timer)
+
+Los callbacks corren en el hilo de la rueda: tienen que ser cortos (mandar un
+paquete, programar el paso siguiente) y no bloquear. Una excepción en un
+callback se informa por stderr y no detiene la rueda.
+"""
+
+import os
+import sys
+import threading
+import time
+import traceback
+
+DEFAULT_TICK = 0.1        # segundos por ranura
+DEFAULT_SLOTS = 512       # una vuelta = 51,2 s; los plazos mayores esperan vueltas
+
+
+class Timer:
+    """Temporizador programado (lo devuelve TimerWheel.schedule)"""
+
+    __slots__ = ('deadline', 'callback', 'args', 'bucket')
+
+    def __init__(self, deadline, callback, args):
+        self.deadline = deadline   # tick absoluto en el que vence
+        self.callback = callback
+        self.args = args
+        self.bucket = None         # set de su tick donde espera; None si ya se ejecutó o se canceló
+
+    def active(self):
+        return self.bucket is not None
+
+
+class TimerWheel:
+    """
+    Rueda de tiempo hasheada con un hilo propio (se inicia en el primer
+    schedule). Resolución: un temporizador vence entre delay y delay + tick
+    (más lo que tarden los callbacks del mismo tick).
+    """
+
+    def __init__(self, tick=DEFAULT_TICK, slots=DEFAULT_SLOTS):
+        self.tick = tick
+        self.slots = [{} for _ in range(slots)]   # por ranura: tick de vencimiento -> set de Timer
+        self.pending = 0     # temporizadores programados
+        self.fired = 0
+        self.cancelled = 0
+
+        self._origin = time.monotonic()
+        self._current = 0    # último tick procesado
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def _now_tick(self):
+        return int((time.monotonic() - self._origin) / self.tick)
+
+    def schedule(self, delay, callback, *args):
+        """Ejecuta callback(*args) dentro de delay segundos. O(1)."""
+        if self._thread is None:
+            self._start()
+        with self._lock:
+            elapsed = time.monotonic() - self._origin
+            now = int(elapsed / self.tick)
+            if self.pending == 0 and now > self._current:
+                # Rueda vacía: los ticks transcurridos no tienen nada que revisar
+                self._current = now
+            # Primer tick que empieza después del plazo (nunca antes de tiempo)
+            deadline = max(self._current + 1, -int(-(elapsed + delay) // self.tick))
+            timer = Timer(deadline, callback, args)
+            slot = self.slots[deadline % len(self.slots)]
+            bucket = slot.get(deadline)
+            if bucket is None:
+                bucket = slot[deadline] = set()
+            bucket.add(timer)
+            timer.bucket = bucket
+            self.pending += 1
+        self._wakeup.set()
+        return timer
+
+    def cancel(self, timer):
+        """Cancela el temporizador si todavía no se ejecutó. O(1)."""
+        if timer is None:
+            return False
+        with self._lock:
+            bucket = timer.bucket
+            if bucket is None:
+                return False
+            bucket.discard(timer)
+            if not bucket:
+                del self.slots[timer.deadline % len(self.slots)][timer.deadline]
+            timer.bucket = None
+            self.pending -= 1
+            self.cancelled += 1
+            return True
+
+    def stop(self, timeout=5.0):
+        """Detiene el hilo; lo que quede programado no se ejecuta"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        thread.join(timeout)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="gt06-timers", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            with self._lock:
+                idle = self.pending == 0
+                if idle:
+                    self._wakeup.clear()
+            if idle:
+                # Sin temporizadores no hay ranuras que revisar: dormir hasta el próximo schedule
+                self._wakeup.wait()
+                continue
+
+            next_time = self._origin + (self._current + 1) * self.tick
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                self._wakeup.clear()
+                self._wakeup.wait(delay)
+                continue
+
+            now = self._now_tick()
+            while self._current < now and not self._stopping:
+                self._current += 1
+                self._expire(self._current)
+
+    def _expire(self, tick):
+        with self._lock:
+            # schedule() nunca programa en un tick ya procesado: los que vencen
+            # en tick están todos en su set, y los de otras vueltas ni se miran
+            due = self.slots[tick % len(self.slots)].pop(tick, None)
+            if not due:
+                return
+            for timer in due:
+                timer.bucket = None
+            self.pending -= len(due)
+            self.fired += len(due)
+        for timer in due:
+            try:
+                timer.callback(*timer.args)
+            except Exception:
+                sys.stderr.write(f"[ERROR] Temporizador {timer.callback!r}: {traceback.format_exc()}\n")
+
+
+_wheel = None
+_wheel_lock = threading.Lock()
+
+
+def get_timer_wheel():
+    """Rueda compartida por todo el proceso (se crea en el primer uso)"""
+    global _wheel
+    with _wheel_lock:
+        if _wheel is None:
+            _wheel = TimerWheel()
+        return _wheel
+
+
+def _after_fork_in_child():
+    # El hilo de la rueda no sobrevive al fork: el hijo crea la suya al primer uso
+    global _wheel, _wheel_lock
+    _wheel = None
+    _wheel_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,48 @@
+"""
+Pruebas de gt06_framer.GT06Framer con basura entre tramas.
+"""
+
+from gt06_crc import crc16_itu_factory
+from gt06_framer import MAX_7979_LENGTH, GT06Framer
+
+
+def frame(protocol, content, serial):
+    body = bytes([1 + len(content) + 2 + 2, protocol]) + content + serial.to_bytes(2, 'big')
+    return b'\x78\x78' + body + crc16_itu_factory(body).to_bytes(2, 'big') + b'\x0D\x0A'
+
+
+LOGIN = frame(0x01, bytes.fromhex('0869412076668133'), 1)
+POSITION = frame(0x12, bytes.fromhex('19081312000000c8') + bytes(8) + bytes.fromhex('28005a02ca070001000001'), 2)
+GARBAGE = b'\x16\x03\x01hello\x78'    # un saludo TLS con un 78 suelto al final
+FRAGMENT = b'\x79\x79\x00'            # 7979 cortado
+
+
+def test_basura_antes_de_tramas_reales_no_las_retiene():
+    framer = GT06Framer()
+    frames = []
+    for data in (GARBAGE, LOGIN, FRAGMENT, POSITION):
+        frames += framer.feed(data)
+    assert frames == [LOGIN, POSITION]
+    assert framer.pending() == 0
+    assert framer.discarded == len(GARBAGE) + len(FRAGMENT)
+
+
+def test_basura_y_tramas_en_un_solo_recv():
+    framer = GT06Framer()
+    assert framer.feed(GARBAGE + LOGIN + FRAGMENT + POSITION) == [LOGIN, POSITION]
+    assert framer.pending() == 0
+
+
+def test_trama_partida_sigue_esperando():
+    framer = GT06Framer()
+    assert framer.feed(POSITION[:10]) == []
+    assert framer.feed(POSITION[10:]) == [POSITION]
+    assert framer.discarded == 0
+
+
+def test_length_7979_imposible_se_descarta():
+    framer = GT06Framer()
+    bogus = b'\x79\x79' + (MAX_7979_LENGTH + 1).to_bytes(2, 'big') + b'\x12'
+    assert framer.feed(bogus) == []
+    assert framer.pending() == 0
+    assert framer.feed(LOGIN) == [LOGIN]
@@ -0,0 +1,68 @@
+"""
+Pruebas de los handlers de GT06_TRACKER.PY sin red (conexión falsa).
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+from comun import build_frame, cargar_tracker
+from gt06_decoder import STATUS_NORTH, STATUS_POSITIONED, STATUS_WEST
+from gt06_geofence import GeofenceIndex, GeofenceMonitor, circle
+
+IMEI = '0869412076668133'
+LAT, LON = -34.6037, -58.3816
+
+
+class ConexionFalsa:
+    def __init__(self):
+        self.sent = []
+
+    def sendall(self, data):
+        self.sent.append(bytes(data))
+
+    def getpeername(self):
+        return ('127.0.0.1', 0)
+
+
+def build_alarm(lat, lon, course_status, serial):
+    """Alarma 0x16: GPS(18) + LBS(1 + 8) + estado(5), coordenadas sin signo como el manual"""
+    gps = (bytes((25, 8, 19, 12, 0, 0, 0xC8)) + round(abs(lat) * 1800000).to_bytes(4, 'big')
+           + round(abs(lon) * 1800000).to_bytes(4, 'big') + bytes([40]) + course_status.to_bytes(2, 'big'))
+    lbs = b'\x09\x02\xCA\x07\x00\x01\x00\x00\x01'
+    status = bytes((0x45, 0x06, 0x04, 0x02, 0x02))
+    return build_frame(0x16, gps + lbs + status, serial)
+
+
+def test_alarma_sin_posicion_no_toca_la_ultima_posicion():
+    tracker = cargar_tracker()
+    tracker.LAST_POSITIONS = tracker.LastPositionIndex()
+    tracker.SPATIAL = tracker.GridIndex()
+    tracker.GEOFENCES = GeofenceMonitor(GeofenceIndex([circle('obelisco', LAT, LON, 500)]))
+    tracker.STORE = tracker.ARCHIVE = None
+    conn = ConexionFalsa()
+    session = tracker.SESSIONS.open(conn)
+    session.imei = IMEI
+    try:
+        posicionada = STATUS_POSITIONED | STATUS_WEST | 90   # sur (sin STATUS_NORTH) y oeste
+        tracker.process_gps_alarm(build_alarm(LAT, LON, posicionada, 1), conn, session)
+        before = tracker.LAST_POSITIONS.get(IMEI)
+        assert before is not None and before.protocol == 0x16
+        spatial = dict(tracker.SPATIAL.positions)
+        inside = dict(tracker.GEOFENCES.inside)
+        assert inside == {IMEI: frozenset({'obelisco'})}
+
+        # Sin posición: coordenadas en cero y bit de posicionado apagado
+        tracker.process_gps_alarm(build_alarm(0, 0, STATUS_NORTH, 2), conn, session)
+        # Con coordenadas pero sin el bit de posicionado (última posición conocida del equipo)
+        tracker.process_gps_alarm(build_alarm(LAT + 1, LON + 1, STATUS_NORTH | 90, 3), conn, session)
+
+        assert tracker.LAST_POSITIONS.get(IMEI) == before
+        assert tracker.SPATIAL.positions == spatial
+        assert tracker.GEOFENCES.inside == inside
+        assert tracker.GEOFENCES.events == 1
+        # El ACK 0x16 sale siempre
+        assert [frame[3] for frame in conn.sent] == [0x16, 0x16, 0x16]
+    finally:
+        tracker.SESSIONS.close(conn)
+        tracker.GEOFENCES = None
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Re-verificación del CRC de las tramas capturadas en los logs del servidor
+=========================================================================
+
+Lee las líneas "[RECIBIDO] <hex>" de uno o más logs (datosChino.txt y sus
+rotaciones), separa las tramas 7878 y 7979 con GT06Framer, las junta en un único
+buffer y valida todos los CRC de una vez con gt06_crc.verify_batch (NumPy si
+está instalado, Python puro si no).
+
+Uso:
+    python verificar_capturas.py [datosChino.txt ...]
+"""
+
+import collections
+import re
+import sys
+import time
+
+from gt06_crc import np, verify_batch
+from gt06_framer import GT06Framer, protocol_offset
+
+RECIBIDO = re.compile(r"\[RECIBIDO\] ([0-9a-fA-F]+)")
+
+
+def leer_tramas(paths):
+    """Devuelve (buffer con todas las tramas, offsets, bytes descartados)"""
+    buffer = bytearray()
+    offsets = []
+    descartados = 0
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                match = RECIBIDO.search(line)
+                if not match:
+                    continue
+                try:
+                    data = bytes.fromhex(match.group(1))
+                except ValueError:
+                    continue
+                # Cada recv se registra entero: un framer por línea
+                framer = GT06Framer()
+                for frame in framer.feed(data):
+                    offsets.append(len(buffer))
+                    buffer += frame
+                descartados += framer.discarded + framer.pending()
+    return buffer, offsets, descartados
+
+
+def main():
+    paths = sys.argv[1:] or ["datosChino.txt"]
+
+    inicio = time.perf_counter()
+    buffer, offsets, descartados = leer_tramas(paths)
+    lectura = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    variantes = verify_batch(buffer, offsets)
+    verificacion = time.perf_counter() - inicio
+
+    por_protocolo = collections.defaultdict(collections.Counter)
+    for offset, variante in zip(offsets, variantes):
+        por_protocolo[buffer[offset + protocol_offset(buffer[offset:offset + 1])]][variante] += 1
+    total = collections.Counter(variantes)
+
+    print(f"Tramas: {len(offsets)} ({len(buffer)} bytes), bytes fuera de trama: {descartados}")
+    print(f"CRC-ITU LE: {total['itu_le']}  BE: {total['itu_be']}  sin coincidencia: {total[None]}")
+    for protocolo in sorted(por_protocolo):
+        c = por_protocolo[protocolo]
+        print(f"  0x{protocolo:02X}: LE {c['itu_le']}, BE {c['itu_be']}, sin coincidencia {c[None]}")
+    motor = "NumPy" if np is not None else "Python puro"
+    print(f"Lectura {lectura:.2f} s, verificación {verificacion:.2f} s ({motor})")
+
+
+if __name__ == "__main__":
+    main()